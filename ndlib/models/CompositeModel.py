@@ -1,4 +1,7 @@
 from ndlib.models.DiffusionModel import DiffusionModel
+from ndlib.models.NeighborCounts import NeighborCounts
+from ndlib.models.compartments.Compartment import Compartiment
+import numpy as np
 import future.utils
 
 __author__ = "Giulio Rossetti"
@@ -17,6 +20,7 @@ class CompositeModel(DiffusionModel):
         self.compartment = {}
         self.compartment_progressive = 0
         self.status_progressive = 0
+        self.plan = None
 
     def add_status(self, status_name):
         if status_name not in self.available_statuses:
@@ -26,6 +30,25 @@ class CompositeModel(DiffusionModel):
     def add_rule(self, status_from, status_to, rule):
         self.compartment[self.compartment_progressive] = (status_from, status_to, rule)
         self.compartment_progressive += 1
+        self.plan = None
+
+    def compile_plan(self):
+        """
+        Compile the rule table into an evaluation plan: the list, in rule priority order, of the
+        (status_from code, status_to code, compartment) triples
+
+        :return: the plan
+        """
+        if self.plan is None:
+            self.plan = [
+                (
+                    self.available_statuses[self.compartment[i][0]],
+                    self.available_statuses[self.compartment[i][1]],
+                    self.compartment[i][2],
+                )
+                for i in range(0, self.compartment_progressive)
+            ]
+        return self.plan
 
     def iteration(self, node_status=True):
         """
@@ -34,6 +57,10 @@ class CompositeModel(DiffusionModel):
         :return: Iteration_id, Incremental node status (dictionary node->status)
         """
         self.clean_initial_status(self.available_statuses.values())
+
+        if self.node_index is not None:
+            return self.__vectorized_iteration(node_status)
+
         actual_status = {
             node: nstatus for node, nstatus in future.utils.iteritems(self.status)
         }
@@ -56,6 +83,17 @@ class CompositeModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
+        # the model is passed only to the compartments able to receive it
+        extra = [
+            (
+                {"model": self}
+                if Compartiment.accepts_model(self.compartment[i][2])
+                else {}
+            )
+            for i in range(0, self.compartment_progressive)
+        ]
+
+        changed = set()
         for u in self.graph.nodes:
             u_status = self.status[u]
             for i in range(0, self.compartment_progressive):
@@ -68,14 +106,16 @@ class CompositeModel(DiffusionModel):
                         status=self.status,
                         status_map=self.available_statuses,
                         params=self.params,
+                        **extra[i]
                     )
                     if test:
                         actual_status[u] = self.available_statuses[
                             self.compartment[i][1]
                         ]
+                        changed.add(u)
                         break
 
-        delta, node_count, status_delta = self.status_delta(actual_status)
+        delta, node_count, status_delta = self.status_delta(actual_status, changed)
         self.status = actual_status
         self.actual_iteration += 1
 
@@ -93,3 +133,37 @@ class CompositeModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def __vectorized_iteration(self, node_status):
+        """
+        Array backend iteration: following the compiled plan, each compartment is evaluated at once for all
+        the nodes in its source status not yet claimed by a rule with higher priority.
+        """
+        actual_status = self.status_array.copy()
+        changed = None
+
+        if self.actual_iteration > 0:
+            pending = np.ones(len(actual_status), dtype=bool)
+            neighbor_counts = NeighborCounts(self.node_index, self.status_array)
+            for status_from, status_to, rule in self.compile_plan():
+                nodes = np.flatnonzero(pending & (self.status_array == status_from))
+                if len(nodes) == 0:
+                    continue
+
+                test = rule.execute_batch(
+                    nodes,
+                    graph=self.graph,
+                    status=self.status_array,
+                    status_map=self.available_statuses,
+                    params=self.params,
+                    index=self.node_index,
+                    neighbor_counts=neighbor_counts,
+                    model=self,
+                )
+                nodes = nodes[test]
+                actual_status[nodes] = status_to
+                pending[nodes] = False
+
+            changed = np.flatnonzero(~pending)
+
+        return self.commit_iteration(actual_status, node_status, changed)
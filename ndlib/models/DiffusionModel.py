@@ -1,11 +1,16 @@
 import abc
 import warnings
+from collections import Counter
 import numpy as np
 import past.builtins
 import future.utils
 import six
 from netdispatch import AGraph
 import tqdm
+from ndlib.models.GraphIndex import GraphIndex
+from ndlib.models.EdgeAttributeIndex import EdgeAttributeIndex
+from ndlib.models.NodeAttributeIndex import NodeAttributeIndex
+from ndlib.models.StatusView import StatusView
 
 __author__ = "Giulio Rossetti"
 __license__ = "BSD-2-Clause"
@@ -24,6 +29,30 @@ class DiffusionModel(object):
 
     # __metaclass__ = abc.ABCMeta
 
+    # array backend (see set_backend)
+    node_index = None
+    status_array = None
+    initial_status_array = None
+
+    # node/edge parameters and attributes as arrays (see node_attribute_index, edge_attribute_index)
+    node_attributes = None
+    edge_attributes = None
+
+    # per-status node counters, maintained incrementally by status_delta (see status_delta)
+    __status_count = None
+    __pending_status_count = None
+    __node_order = None
+
+    # compact iteration bunches on the array backend: rows receiving the counts of the running iteration and
+    # per-status counters aligned with the status codes (see __compact_iteration_bunch, commit_iteration)
+    __compact_rows = None
+    __compact_count = None
+
+    # per-node timers of the model compartments (see timer), aligned with node_order
+    __timers = None
+    __active_neighbors = None
+    __sampling = None
+
     def __init__(self, graph, seed=None):
         """
         Model Constructor
@@ -53,6 +82,139 @@ class DiffusionModel(object):
         self.status = {n: 0 for n in self.graph.nodes}
         self.initial_status = {}
 
+    @property
+    def status(self):
+        """
+        Actual node statuses (dictionary node->status, or a view over the status array)
+        """
+        if self.node_index is None:
+            return self._status
+        return StatusView(self.node_index, self.status_array)
+
+    @status.setter
+    def status(self, node_to_status):
+        self.__adopt_status_count(node_to_status)
+        if self.node_index is None:
+            self._status = node_to_status
+        elif (
+            not isinstance(node_to_status, StatusView)
+            or node_to_status.array is not self.status_array
+        ):
+            self.status_array = self.__status_to_array(node_to_status)
+
+    @property
+    def initial_status(self):
+        """
+        Initial node statuses (dictionary node->status, or a view over the initial status array)
+        """
+        if self.node_index is None:
+            return self._initial_status
+        return StatusView(self.node_index, self.initial_status_array)
+
+    @initial_status.setter
+    def initial_status(self, node_to_status):
+        if self.node_index is None:
+            self._initial_status = node_to_status
+        else:
+            self.initial_status_array = self.__status_to_array(node_to_status)
+
+    def __adopt_status_count(self, actual_status):
+        """
+        Keep the node counters computed by status_delta if the configuration they describe becomes the
+        actual one, discard them otherwise.
+        """
+        pending = self.__pending_status_count
+        if pending is not None and pending[0] is actual_status:
+            self.__status_count = pending[1]
+        else:
+            self.__status_count = None
+        self.__pending_status_count = None
+
+    def __status_to_array(self, node_to_status):
+        if (
+            isinstance(node_to_status, StatusView)
+            and node_to_status.index is self.node_index
+        ):
+            return node_to_status.array.copy()
+        return self.node_index.to_array(node_to_status, self.status_array.dtype)
+
+    def set_backend(self, backend="array"):
+        """
+        Select the data structure used to store node statuses
+
+        :param backend: "dict" (default) keeps a dictionary node->status; "array" maps nodes once to contiguous
+                        integers and stores their statuses in a NumPy int8/int16 array. With the array backend
+                        ``status`` and ``initial_status`` are exposed as dictionary-like views, and models
+                        providing a vectorized kernel (e.g., SI, SIS, SIR, SEIR) run their iterations as
+                        batched array operations over a CSR adjacency.
+        :return: the model itself
+        """
+        if backend == "dict":
+            if self.node_index is not None:
+                status, initial_status = self.status.copy(), self.initial_status.copy()
+                self.node_index = None
+                self.status, self.initial_status = status, initial_status
+                self.__timers, self.__active_neighbors = None, None
+            return self
+
+        if backend != "array":
+            raise ConfigurationException(
+                {"message": "Unknown status backend", "backend": backend}
+            )
+
+        if not self.discrete_state:
+            raise ConfigurationException(
+                {"message": "The array backend requires discrete node statuses"}
+            )
+
+        if self.node_index is None:
+            codes = list(self.available_statuses.values()) + [0]
+            for dtype in (np.int8, np.int16):
+                if (
+                    np.iinfo(dtype).min <= min(codes)
+                    and max(codes) <= np.iinfo(dtype).max
+                ):
+                    break
+            else:
+                raise ConfigurationException(
+                    {
+                        "message": "Status codes do not fit the array backend (int16)",
+                        "statuses": self.available_statuses,
+                    }
+                )
+
+            index = self.__graph_index()
+            status = index.to_array(self.status, dtype)
+            initial_status = self.initial_status
+            self.node_index = index
+            self.status_array = status
+            if len(initial_status) == 0:
+                # no initial configuration set yet: it starts as the (all-zero) actual status
+                self.initial_status_array = status.copy()
+            else:
+                self.initial_status = initial_status
+            # the dictionaries are superseded by the arrays
+            self._status, self._initial_status = None, None
+            self.__timers, self.__active_neighbors = None, None
+
+        return self
+
+    def __clear_status(self):
+        self.__status_count = None
+        if self.node_index is not None:
+            self.status_array[:] = 0
+            return
+        for n in self.status:
+            self.status[n] = 0
+
+    def __nodes_in_status(self, status):
+        if self.node_index is not None:
+            return [
+                self.node_index.nodes[i]
+                for i in np.flatnonzero(self.status_array == status)
+            ]
+        return [n for n in self.status if self.status[n] == status]
+
     def __validate_configuration(self, configuration):
         """
         Validate the consistency of a Configuration object for the specific model
@@ -233,41 +395,134 @@ class DiffusionModel(object):
                     )
                     number_of_initial_infected = 1
 
-                available_nodes = [n for n in self.status if self.status[n] == 0]
+                available_nodes = self.__nodes_in_status(0)
                 sampled_nodes = np.random.choice(
                     available_nodes, int(number_of_initial_infected), replace=False
                 )
                 for k in sampled_nodes:
                     self.status[k] = self.available_statuses["Infected"]
 
+        self.__status_count = None
+        self.__timers, self.__active_neighbors = None, None
         self.initial_status = self.status
 
+        self.node_attributes, self.edge_attributes = None, None
+        for param in self.params["edges"]:
+            self.edge_attribute_index().parameter(param)
+
     def clean_initial_status(self, valid_status=None):
         """
         Check the consistency of initial status
         :param valid_status: valid node configurations
         """
+        if self.node_index is not None:
+            invalid = ~np.isin(self.status_array, list(valid_status))
+            if invalid.any():
+                self.status_array[invalid] = 0
+                self.__status_count = None
+            return
+
         for n, s in future.utils.iteritems(self.status):
             if s not in valid_status:
                 self.status[n] = 0
+                self.__status_count = None
 
-    def iteration_bunch(self, bunch_size, node_status=True, progress_bar=False):
+    def iteration_bunch(
+        self, bunch_size, node_status=True, progress_bar=False, compact=False
+    ):
         """
         Execute a bunch of model iterations
 
         :param bunch_size: the number of iterations to execute
         :param node_status: if the incremental node status has to be returned.
         :param progress_bar: whether to display a progress bar, default False
+        :param compact: if True only the trends are kept: node counts and deltas are written, iteration by
+                        iteration, into two preallocated NumPy arrays of shape (bunch_size, statuses). Default False.
+                        On the array backend the iterations closed by commit_iteration (e.g., SI, SIS, SIR, SEIR)
+                        write their counts into the arrays directly, without building any per-iteration
+                        dictionary; the other ones run as with node_status=False and their count/delta
+                        dictionaries are copied into the arrays.
 
         :return: a list containing for each iteration a dictionary {"iteration": iteration_id, "status": dictionary_node_to_status}
+                 (if compact, a dictionary {"statuses": status codes, "node_count": array, "status_delta": array}
+                 whose array columns follow the order of the status codes)
         """
-        system_status = []
-        for it in tqdm.tqdm(
-            past.builtins.xrange(0, bunch_size), disable=not progress_bar
-        ):
+        if compact:
+            return self.__compact_iteration_bunch(bunch_size, progress_bar)
+
+        return list(
+            tqdm.tqdm(
+                self.iterate(bunch_size, node_status),
+                total=bunch_size,
+                disable=not progress_bar,
+            )
+        )
+
+    def iterate(self, bunch_size=None, node_status=True, stop=None):
+        """
+        Lazily execute model iterations
+
+        :param bunch_size: the maximum number of iterations to execute (None for no limit)
+        :param node_status: if the incremental node status has to be returned.
+        :param stop: (optional) a predicate over the iteration description (e.g., lambda it: it["node_count"][1] == 0);
+                     the iterations end after the first one satisfying it
+        :return: an iterator over the iteration descriptions (as returned by iteration())
+        """
+        executed = 0
+        while bunch_size is None or executed < bunch_size:
             its = self.iteration(node_status)
-            system_status.append(its)
-        return system_status
+            executed += 1
+            yield its
+            if stop is not None and stop(its):
+                break
+
+    def __compact_iteration_bunch(self, bunch_size, progress_bar):
+        """
+        Execute a bunch of model iterations keeping only their trends
+
+        Each iteration is executed by iteration(False) with the rows of the preallocated arrays exposed to
+        commit_iteration, which fills them in place (and returns no description). The iterations closed
+        otherwise return their description, whose count/delta dictionaries are copied into the rows.
+        """
+        statuses = list(self.available_statuses.values())
+        node_count = np.zeros((bunch_size, len(statuses)), dtype=np.int64)
+        status_delta = np.zeros((bunch_size, len(statuses)), dtype=np.int64)
+
+        keys = None
+        self.__compact_count = None
+        try:
+            for it in tqdm.tqdm(
+                past.builtins.xrange(0, bunch_size), disable=not progress_bar
+            ):
+                if self.node_index is not None:
+                    self.__compact_rows = (node_count[it], status_delta[it])
+                its = self.iteration(False)
+                self.__compact_rows = None
+                if its is None:
+                    continue
+
+                # the counters kept in compact form may no longer describe the actual status
+                self.__compact_count = None
+                if keys is None:
+                    keys = [
+                        st if st in its["node_count"] else str(st) for st in statuses
+                    ]
+                node_count[it] = [its["node_count"][k] for k in keys]
+                status_delta[it] = [its["status_delta"][k] for k in keys]
+        finally:
+            self.__compact_rows = None
+            if self.__compact_count is not None:
+                # hand the counters over to status_delta
+                self.__status_count = Counter(
+                    {st: int(c) for st, c in zip(statuses, self.__compact_count)}
+                )
+                self.__compact_count = None
+
+        return {
+            "statuses": statuses,
+            "node_count": node_count,
+            "status_delta": status_delta,
+        }
 
     def get_info(self):
         """
@@ -289,12 +544,13 @@ class DiffusionModel(object):
         Reset the simulation setting the actual status to the initial configuration.
         """
         self.actual_iteration = 0
+        self.__timers = None
 
         if infected_nodes is not None:
-            for n in self.status:
-                self.status[n] = 0
+            self.__clear_status()
             for n in infected_nodes:
                 self.status[n] = self.available_statuses["Infected"]
+            self.__status_count = None
             self.initial_status = self.status
 
         else:
@@ -303,12 +559,11 @@ class DiffusionModel(object):
                     "percentage_infected"
                 ]
             if "fraction_infected" in self.params["model"]:
-                for n in self.status:
-                    self.status[n] = 0
+                self.__clear_status()
                 number_of_initial_infected = self.graph.number_of_nodes() * float(
                     self.params["model"]["fraction_infected"]
                 )
-                available_nodes = [n for n in self.status if self.status[n] == 0]
+                available_nodes = self.__nodes_in_status(0)
                 sampled_nodes = np.random.choice(
                     available_nodes, int(number_of_initial_infected), replace=False
                 )
@@ -316,6 +571,7 @@ class DiffusionModel(object):
                 for k in sampled_nodes:
                     self.status[k] = self.available_statuses["Infected"]
 
+                self.__status_count = None
                 self.initial_status = self.status
             else:
                 self.status = self.initial_status
@@ -366,34 +622,433 @@ class DiffusionModel(object):
                 return False
         return True
 
-    def status_delta(self, actual_status):
+    def status_delta(self, actual_status, changed=None):
         """
         Compute the point-to-point variations for each status w.r.t. the previous system configuration
 
         :param actual_status: the actual simulation status
+        :param changed: (optional) the nodes (node positions if actual_status is a status array) whose status
+                        may have changed during the step. When provided, variations and node counts are computed
+                        incrementally in O(len(changed)) from per-status counters kept across iterations.
+                        Statuses modified in place outside the iteration (without reset) are not tracked.
         :return: node that have changed their statuses (dictionary status->nodes),
                  count of actual nodes per status (dictionary status->node count),
                  delta of nodes per status w.r.t the previous configuration (dictionary status->delta)
         """
-        actual_status_count = {}
-        old_status_count = {}
+        if isinstance(actual_status, np.ndarray):
+            return self.__status_array_delta(actual_status, changed)
+
+        if changed is None or self.__status_count is None:
+            old_status_count = Counter(self.status.values())
+        else:
+            old_status_count = self.__status_count
+
+        if changed is None:
+            delta = {}
+            for n, v in future.utils.iteritems(self.status):
+                if v != actual_status[n]:
+                    delta[n] = actual_status[n]
+            actual_status_count = Counter(actual_status.values())
+        else:
+            status = self.status
+            delta = {}
+            actual_status_count = old_status_count.copy()
+            for n in changed:
+                if status[n] != actual_status[n]:
+                    delta[n] = actual_status[n]
+                    actual_status_count[status[n]] -= 1
+                    actual_status_count[actual_status[n]] += 1
+
+        self.__status_count = old_status_count
+        self.__pending_status_count = (actual_status, actual_status_count)
+
+        return self.__count_delta(delta, old_status_count, actual_status_count)
+
+    def __status_array_delta(self, actual_status, changed, node_status=True):
+        if changed is None or self.__status_count is None:
+            old_status_count = self.__count_array(self.status_array)
+        else:
+            old_status_count = self.__status_count
+
+        if changed is None:
+            changed = np.flatnonzero(actual_status != self.status_array)
+            actual_status_count = self.__count_array(actual_status)
+        else:
+            changed = np.asarray(changed, dtype=np.int64)
+            changed = changed[actual_status[changed] != self.status_array[changed]]
+            actual_status_count = old_status_count.copy()
+            actual_status_count.subtract(self.__count_array(self.status_array[changed]))
+            actual_status_count.update(self.__count_array(actual_status[changed]))
+
         delta = {}
-        for n, v in future.utils.iteritems(self.status):
-            if v != actual_status[n]:
-                delta[n] = actual_status[n]
+        if node_status:
+            nodes = self.node_index.nodes
+            delta = {nodes[i]: int(actual_status[i]) for i in changed}
+
+        self.__status_count = old_status_count
+        self.__pending_status_count = (actual_status, actual_status_count)
+
+        return self.__count_delta(delta, old_status_count, actual_status_count)
+
+    @staticmethod
+    def __count_array(status_array):
+        if len(status_array) == 0:
+            return Counter()
+        lowest = int(status_array.min())
+        counts = np.bincount(status_array.astype(np.int64) - lowest)
+        return Counter(
+            {int(st) + lowest: int(c) for st, c in enumerate(counts) if c > 0}
+        )
 
+    def __count_delta(self, delta, old_status_count, actual_status_count):
+        node_count = {}
+        status_delta = {}
         for st in list(self.available_statuses.values()):
-            actual_status_count[st] = len(
-                [x for x in actual_status if actual_status[x] == st]
+            node_count[st] = actual_status_count[st]
+            status_delta[st] = actual_status_count[st] - old_status_count[st]
+
+        return delta, node_count, status_delta
+
+    def neighbors_in_status(self, status):
+        """
+        Count, for every node, the neighbors (predecessors for directed graphs) having a given status.
+
+        Requires the array backend.
+
+        :param status: the numeric status code
+        :return: a NumPy array aligned with the node index
+        """
+        adjacency = self.node_index.adjacency(incoming=True)
+        return adjacency.dot((self.status_array == status).astype(np.int32))
+
+    def active_neighbors(self, status=1):
+        """
+        Count, for every node, the neighbors (predecessors for directed graphs) having a given status.
+
+        Counts are maintained incrementally across calls: only the successors of the nodes that entered or
+        left the status since the previous call are updated, instead of visiting every edge.
+
+        :param status: the numeric status code, default 1
+        :return: a NumPy array aligned with the graph index (see node_attribute_index), not to be modified
+        """
+        index = self.node_attribute_index().index
+        if self.node_index is not None:
+            active = self.status_array == status
+        else:
+            active = index.to_array(self.status, np.int64) == status
+
+        if self.__active_neighbors is None:
+            self.__active_neighbors = {}
+        if status not in self.__active_neighbors:
+            counts = index.adjacency(incoming=True).dot(active.astype(np.int64))
+        else:
+            previous, counts = self.__active_neighbors[status]
+            changed = np.flatnonzero(active != previous)
+            if len(changed) > 0:
+                rows, successors, _ = index.neighbor_entries(changed, incoming=False)
+                entering = active[changed][rows]
+                counts = (
+                    counts
+                    + np.bincount(successors[entering], minlength=len(index))
+                    - np.bincount(successors[~entering], minlength=len(index))
+                )
+
+        self.__active_neighbors[status] = (active, counts)
+        return counts
+
+    def activation_attempts(self, node, activation):
+        """
+        Successors (neighbors for undirected graphs) of a node, along with the activation probability of
+        the edges reaching them
+
+        :param node: the node id
+        :param activation: NumPy array of edge activation probabilities, aligned with the outgoing CSR
+                           adjacency entries of the graph index (see edge_attribute_index)
+        :return: a list of pairs (successor, probability)
+        """
+        index = self.edge_attribute_index().index
+        adjacency = index.adjacency()
+        i = index.position[node]
+        start, end = adjacency.indptr[i], adjacency.indptr[i + 1]
+        nodes = index.nodes
+        return list(
+            zip(
+                [nodes[v] for v in adjacency.indices[start:end].tolist()],
+                activation[start:end].tolist(),
             )
-            old_status_count[st] = len([x for x in self.status if self.status[x] == st])
+        )
 
-        status_delta = {
-            st: actual_status_count[st] - old_status_count[st]
-            for st in actual_status_count
+    def cascade_iteration(self, activation, node_status=True):
+        """
+        Array backend iteration of a cascade: each infected node gets a single chance to activate each of
+        its susceptible successors (neighbors for undirected graphs), succeeding with the activation
+        probability of the edge, and is then removed.
+
+        :param activation: NumPy array of edge activation probabilities, aligned with the outgoing CSR
+                           adjacency entries of node_index (see edge_attribute_index)
+        :param node_status: if the incremental node status has to be returned.
+        :return: the iteration description (as returned by iteration())
+        """
+        actual_status = self.status_array.copy()
+        changed = None
+
+        if self.actual_iteration > 0:
+            infected = np.flatnonzero(self.status_array == 1)
+            _, neighbors, entries = self.node_index.neighbor_entries(
+                infected, incoming=False
+            )
+            susceptible = self.status_array[neighbors] == 0
+            neighbors, entries = neighbors[susceptible], entries[susceptible]
+
+            flip = np.random.random_sample(len(entries))
+            activated = np.unique(neighbors[flip <= activation[entries]])
+            actual_status[activated] = 1
+            actual_status[infected] = 2
+            changed = np.concatenate([infected, activated])
+
+        return self.commit_iteration(actual_status, node_status, changed)
+
+    def commit_iteration(self, actual_status, node_status=True, changed=None):
+        """
+        Close an iteration computed on the status array: evaluate the variations w.r.t. the previous
+        configuration, store the new statuses and advance the iteration counter.
+
+        Requires the array backend.
+
+        :param actual_status: the status array computed by the iteration
+        :param node_status: if the incremental node status has to be returned.
+        :param changed: (optional) positions of the nodes that may have changed status (see status_delta)
+        :return: the iteration description (as returned by iteration()); None within compact iteration
+                 bunches, whose counts are written in place (see iteration_bunch)
+        """
+        if self.__compact_rows is not None:
+            self.__commit_compact(actual_status, changed)
+            return None
+
+        delta, node_count, status_delta = self.__status_array_delta(
+            actual_status, changed, node_status
+        )
+        if self.actual_iteration == 0 and node_status:
+            delta = self.status.copy()
+        self.__adopt_status_count(actual_status)
+        self.status_array = actual_status
+        self.actual_iteration += 1
+
+        return {
+            "iteration": self.actual_iteration - 1,
+            "status": delta if node_status else {},
+            "node_count": node_count,
+            "status_delta": status_delta,
+        }
+
+    def __commit_compact(self, actual_status, changed):
+        """
+        Close an iteration of a compact bunch: the node counts and their variations are written into the rows
+        of the bunch arrays, from per-status counters kept as a NumPy array across iterations
+        """
+        node_count, status_delta = self.__compact_rows
+        old_count = self.__compact_count
+        if changed is None or old_count is None:
+            old_count = self.__code_count(self.status_array)
+
+        if changed is None:
+            actual_count = self.__code_count(actual_status)
+        else:
+            changed = np.asarray(changed, dtype=np.int64)
+            actual_count = (
+                old_count
+                - self.__code_count(self.status_array[changed])
+                + self.__code_count(actual_status[changed])
+            )
+
+        node_count[:] = actual_count
+        status_delta[:] = actual_count - old_count
+        self.__compact_count = actual_count
+        self.__status_count, self.__pending_status_count = None, None
+        self.status_array = actual_status
+        self.actual_iteration += 1
+
+    def __code_count(self, status_array):
+        """
+        Number of nodes in each status, following the order of the status codes
+        """
+        codes = np.fromiter(self.available_statuses.values(), dtype=np.int64)
+        if len(status_array) == 0:
+            return np.zeros(len(codes), dtype=np.int64)
+        lowest = min(int(status_array.min()), int(codes.min()))
+        counts = np.bincount(
+            status_array.astype(np.int64) - lowest,
+            minlength=int(codes.max()) - lowest + 1,
+        )
+        return counts[codes - lowest]
+
+    def commit_updates(self, updates, node_status=True):
+        """
+        Close an iteration that modified only a few nodes: the new statuses are applied in place and
+        variations and node counts are computed in O(len(updates)) (see status_delta).
+
+        :param updates: dictionary node->new status for the nodes updated during the iteration
+        :param node_status: if the incremental node status has to be returned.
+        :return: the iteration description (as returned by iteration())
+        """
+        if self.node_index is None and self.status is self.initial_status:
+            # keep the initial configuration untouched
+            self.status = dict(self.status)
+
+        delta, node_count, status_delta = self.status_delta(updates, updates.keys())
+        self.__adopt_status_count(updates)
+
+        status = self.status
+        for n, v in future.utils.iteritems(delta):
+            status[n] = v
+        self.actual_iteration += 1
+
+        return {
+            "iteration": self.actual_iteration - 1,
+            "status": delta if node_status else {},
+            "node_count": node_count,
+            "status_delta": status_delta,
         }
 
-        return delta, actual_status_count, status_delta
+    def node_order(self):
+        """
+        Position of the nodes in the graph iteration order
+
+        :return: a dictionary node->position
+        """
+        if self.node_index is not None:
+            return self.node_index.position
+        if self.__node_order is None:
+            self.__node_order = {n: i for i, n in enumerate(self.graph.nodes)}
+        return self.__node_order
+
+    def __graph_index(self):
+        """
+        Index of the graph: the one of the array backend, or the one the attribute arrays are aligned with
+        """
+        if self.node_index is not None:
+            return self.node_index
+        for attributes in (self.node_attributes, self.edge_attributes):
+            if attributes is not None:
+                return attributes.index
+        return GraphIndex(self.graph)
+
+    def node_attribute_index(self):
+        """
+        Node parameters and graph node attributes as typed columns aligned with the graph index, built on
+        first use and dropped by set_initial_status or when the graph changes. Columns are snapshots: values
+        changed in place during a simulation require NodeAttributeIndex.invalidate.
+
+        :return: a NodeAttributeIndex object
+        """
+        if (
+            self.node_attributes is None
+            or self.node_attributes.graph is not self.graph
+            or (
+                self.node_index is not None
+                and self.node_attributes.index is not self.node_index
+            )
+        ):
+            self.node_attributes = NodeAttributeIndex(
+                self.__graph_index(), self.graph, self.params["nodes"]
+            )
+        return self.node_attributes
+
+    def edge_attribute_index(self):
+        """
+        Edge parameters and graph edge attributes as arrays aligned with the CSR adjacency entries of the
+        graph index. The arrays of the edge parameters are built by set_initial_status, the ones of graph
+        edge attributes on first use. Arrays are snapshots: values changed in place during a simulation
+        require EdgeAttributeIndex.invalidate.
+
+        :return: an EdgeAttributeIndex object
+        """
+        if (
+            self.edge_attributes is None
+            or self.edge_attributes.graph is not self.graph
+            or (
+                self.node_index is not None
+                and self.edge_attributes.index is not self.node_index
+            )
+        ):
+            self.edge_attributes = EdgeAttributeIndex(
+                self.__graph_index(), self.graph, self.params["edges"]
+            )
+        return self.edge_attributes
+
+    def invalidate_sampling(self):
+        """
+        Drop the graph index used by random_nodes and random_neighbors, so that it is rebuilt from the current
+        graph on next use. Changes of the graph object or of its number of nodes are detected automatically,
+        edges added or removed in place (with the same nodes) are not.
+        """
+        self.__sampling = None
+
+    def __sampling_index(self):
+        """
+        Graph index drawing random nodes and neighbors, checked on each use against the graph object and its
+        number of nodes (both O(1)) and rebuilt when they change
+
+        :return: a GraphIndex object
+        """
+        key = (id(self.graph), self.graph.number_of_nodes())
+        if self.__sampling is None or self.__sampling[0] != key:
+            self.__sampling = (key, GraphIndex(self.graph))
+        return self.__sampling[1]
+
+    def random_nodes(self, size=None):
+        """
+        Nodes drawn uniformly at random (with replacement) from the cached node list of the graph index
+        (see __sampling_index), in O(1) per draw
+
+        :param size: the number of draws, e.g. the updates of a whole sweep (None for a single draw)
+        :return: a node id, or a list of node ids
+        """
+        nodes = self.__sampling_index().nodes
+        if size is None:
+            return nodes[np.random.randint(0, len(nodes))]
+        return [nodes[i] for i in np.random.randint(0, len(nodes), size)]
+
+    def random_neighbors(self, node, size=None, incoming=False):
+        """
+        Neighbors of a node drawn uniformly at random (with replacement) from the CSR adjacency of the graph
+        index (see __sampling_index), in O(1) per draw
+
+        :param node: the node id
+        :param size: the number of draws (None for a single draw)
+        :param incoming: for directed graphs, whether to draw predecessors (True) or successors (False)
+        :return: a node id (None if the node has no neighbors), or a list of node ids (empty if the node has
+                 no neighbors): callers handle isolated nodes explicitly
+        """
+        index = self.__sampling_index()
+        adjacency = index.adjacency(incoming)
+        i = index.position[node]
+        start, end = adjacency.indptr[i], adjacency.indptr[i + 1]
+        if start == end:
+            return None if size is None else []
+
+        nodes = index.nodes
+        if size is None:
+            return nodes[adjacency.indices[start + np.random.randint(0, end - start)]]
+        return [
+            nodes[v]
+            for v in adjacency.indices[start + np.random.randint(0, end - start, size)]
+        ]
+
+    def timer(self, name, value):
+        """
+        Per-node integer timer of the model (e.g., the one of a CountDown compartment).
+        Timers are created on first use and dropped by set_initial_status and reset.
+
+        :param name: the timer name
+        :param value: the initial value of the timer of each node
+        :return: a NumPy int64 array aligned with node_order()
+        """
+        if self.__timers is None:
+            self.__timers = {}
+        if name not in self.__timers:
+            self.__timers[name] = np.full(len(self.node_order()), value, dtype=np.int64)
+        return self.__timers[name]
 
     def status_delta_continuous(self, actual_status):
         """
@@ -426,9 +1081,27 @@ class DiffusionModel(object):
         """
         Build node status and node delta trends from model iteration bunch
 
-        :param iterations: a set of iterations
+        :param iterations: a set of iterations (or the result of a compact iteration bunch, whose arrays are
+                           returned without copies: every status is mapped to a column view)
         :return: a trend description
         """
+        if isinstance(iterations, dict):
+            columns = {st: i for i, st in enumerate(iterations["statuses"])}
+            return [
+                {
+                    "trends": {
+                        "node_count": {
+                            st: iterations["node_count"][:, i]
+                            for st, i in columns.items()
+                        },
+                        "status_delta": {
+                            st: iterations["status_delta"][:, i]
+                            for st, i in columns.items()
+                        },
+                    }
+                }
+            ]
+
         status_delta = {status: [] for status in self.available_statuses.values()}
         node_count = {status: [] for status in self.available_statuses.values()}
 
@@ -0,0 +1,171 @@
+import numpy as np
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class DistanceBiasedSampler(object):
+    """
+    Selection of interaction partners biased by opinion distance: agent j is drawn, for agent i, with
+    probability proportional to max(|x_i - x_j|, min_dist)^-gamma (the algorithmic bias selection law).
+
+    Agents are kept sorted by opinion. The agents around x_i are grouped in distance shells, whose sizes grow
+    geometrically so that weights within a shell differ at most by a factor 2: a shell is chosen according to
+    the upper bounds of its weights (its size is found by binary search), an agent is drawn uniformly in it
+    and accepted with the ratio between its weight and the bound. A draw costs O(log N) (for a given gamma),
+    an opinion update O(log N) plus the shift of the agents whose opinion lies between the old and the new one.
+    """
+
+    def __init__(self, values, gamma, min_dist=0.00001):
+        """
+        Sampler Constructor
+
+        :param values: the opinions of the agents (NumPy array, agent ids are positions)
+        :param gamma: the strength of the bias (non negative)
+        :param min_dist: the minimum distance of the selection law, default 0.00001
+        """
+        self.values = np.array(values, dtype=float)
+        self.gamma = float(gamma)
+        self.min_dist = float(min_dist)
+
+        order = np.lexsort((np.arange(len(self.values)), self.values))
+        self.sorted_values = self.values[order]
+        self.sorted_agents = order
+
+        # shell radii: min_dist * ratio^s, extended on demand up to the largest distance of a query
+        self.__ratio = 2.0 ** (1.0 / max(self.gamma, 1.0))
+        self.__radii = self.min_dist * self.__ratio ** np.arange(64)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __slot(self, agent):
+        """
+        Position of an agent in the sorted arrays (ties are sorted by agent id)
+        """
+        value = self.values[agent]
+        lo = np.searchsorted(self.sorted_values, value, "left")
+        hi = np.searchsorted(self.sorted_values, value, "right")
+        return lo + np.searchsorted(self.sorted_agents[lo:hi], agent)
+
+    def sample(self, agent):
+        """
+        Draw the partner of an agent
+
+        :param agent: the agent id
+        :return: the id of the selected agent (None if there are no other agents)
+        """
+        return self.__draw(self.values[agent], agent)
+
+    def sample_opinion(self, value):
+        """
+        Draw an agent for an opinion held outside the sampler (e.g., media drawn by a node)
+
+        :param value: the opinion
+        :return: the id of the selected agent (None if there are no agents)
+        """
+        return self.__draw(value, None)
+
+    def __shells(self, reach):
+        """
+        Shell radii covering the distances up to reach (the last radius is infinite), along with the log of the
+        weight bound of each shell: shell 0 (d <= min_dist) has exact weights
+        """
+        shells = int(
+            np.ceil(
+                np.log(max(reach, self.min_dist) / self.min_dist) / np.log(self.__ratio)
+            )
+        )
+        while len(self.__radii) <= shells:
+            self.__radii = self.min_dist * self.__ratio ** np.arange(
+                2 * len(self.__radii)
+            )
+
+        radii = self.__radii[: shells + 1].copy()
+        radii[-1] = np.inf
+        log_bounds = -self.gamma * np.log(np.concatenate([[self.min_dist], radii[:-1]]))
+        return radii, log_bounds
+
+    def __draw(self, x, agent):
+        """
+        Draw an agent for opinion x, excluding the given agent (if not None)
+        """
+        excluded = 0 if agent is None else 1
+        if len(self.values) <= excluded:
+            return None
+
+        # x may lie outside the opinions of the agents (e.g., for media, or after updates widening them)
+        radii, shell_bounds = self.__shells(
+            max(x - self.sorted_values[0], self.sorted_values[-1] - x)
+        )
+        left = np.searchsorted(self.sorted_values, x - radii, "left")
+        right = np.searchsorted(self.sorted_values, x + radii, "right")
+
+        # shell 0 (excluding the agent), then the left and right halves of the outer shells
+        counts = np.concatenate(
+            [
+                [right[0] - left[0] - excluded],
+                left[:-1] - left[1:],
+                right[1:] - right[:-1],
+            ]
+        )
+        starts = np.concatenate([[left[0]], left[1:], right[:-1]])
+        log_bounds = np.concatenate(
+            [shell_bounds[:1], shell_bounds[1:], shell_bounds[1:]]
+        )
+
+        nonempty = counts > 0
+        masses = np.zeros(len(counts))
+        masses[nonempty] = counts[nonempty] * np.exp(
+            log_bounds[nonempty] - log_bounds[nonempty].max()
+        )
+        cumulative = np.cumsum(masses)
+
+        while True:
+            shell = min(
+                np.searchsorted(
+                    cumulative, np.random.random_sample() * cumulative[-1], "right"
+                ),
+                len(counts) - 1,
+            )
+            rank = starts[shell] + np.random.randint(0, counts[shell])
+
+            if shell == 0:
+                # weights within min_dist are exact: skip the excluded agent
+                if agent is not None and rank >= self.__slot(agent):
+                    rank += 1
+                return int(self.sorted_agents[rank])
+
+            distance = max(abs(self.sorted_values[rank] - x), self.min_dist)
+            if np.random.random_sample() < np.exp(
+                -self.gamma * np.log(distance) - log_bounds[shell]
+            ):
+                return int(self.sorted_agents[rank])
+
+    def update(self, agent, value):
+        """
+        Change the opinion of an agent
+
+        :param agent: the agent id
+        :param value: the new opinion
+        """
+        if value == self.values[agent]:
+            return
+
+        old = self.__slot(agent)
+        lo = np.searchsorted(self.sorted_values, value, "left")
+        hi = np.searchsorted(self.sorted_values, value, "right")
+        new = lo + np.searchsorted(self.sorted_agents[lo:hi], agent)
+
+        # shift the agents in between and insert the agent at its new position
+        if new > old:
+            new -= 1
+            self.sorted_values[old:new] = self.sorted_values[old + 1 : new + 1]
+            self.sorted_agents[old:new] = self.sorted_agents[old + 1 : new + 1]
+        else:
+            self.sorted_values[new + 1 : old + 1] = self.sorted_values[new:old]
+            self.sorted_agents[new + 1 : old + 1] = self.sorted_agents[new:old]
+        self.sorted_values[new] = value
+        self.sorted_agents[new] = agent
+        self.values[agent] = value
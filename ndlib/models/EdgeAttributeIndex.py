@@ -0,0 +1,85 @@
+import numpy as np
+from ndlib.models.ParameterView import EdgeParameterView
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class EdgeAttributeIndex(object):
+    """
+    Edge parameters and graph edge attributes stored as NumPy arrays aligned with the entries of the outgoing
+    CSR adjacency of a GraphIndex (see GraphIndex.edge_array), so that edge values are read by entry position.
+
+    Each array is built once, on first use: it is a snapshot of the values at that time, so parameters or
+    graph attributes changed afterwards are not seen until the array is dropped (see invalidate).
+    """
+
+    def __init__(self, index, graph, params):
+        """
+        Index Constructor
+
+        :param index: a GraphIndex object
+        :param graph: the indexed graph
+        :param params: the edge parameters of the model (dictionary parameter->(edge->value))
+        """
+        self.index = index
+        self.graph = graph
+        self.params = params
+        self.__parameters = {}
+        self.__attributes = {}
+        self.__derived = {}
+
+    def parameter(self, name):
+        """
+        Edge parameter of the model
+
+        :param name: the parameter name
+        :return: a NumPy array aligned with the outgoing CSR adjacency entries
+        """
+        if name not in self.__parameters:
+            values = self.params[name]
+            if isinstance(values, EdgeParameterView) and values.index is self.index:
+                self.__parameters[name] = values.array
+            else:
+                self.__parameters[name] = self.index.edge_array(values)
+        return self.__parameters[name]
+
+    def attribute(self, name):
+        """
+        Edge attribute of the graph
+
+        :param name: the attribute name
+        :return: a NumPy array aligned with the outgoing CSR adjacency entries
+        """
+        if name not in self.__attributes:
+            self.__attributes[name] = self.index.edge_array(
+                self.graph.get_edge_attributes(name)
+            )
+        return self.__attributes[name]
+
+    def invalidate(self, name=None):
+        """
+        Drop cached arrays, so that they are rebuilt from the current values on next use (derived arrays are
+        always dropped, as they may depend on any of them)
+
+        :param name: the parameter/attribute name (None to drop all the arrays)
+        """
+        if name is None:
+            self.__parameters, self.__attributes = {}, {}
+        else:
+            self.__parameters.pop(name, None)
+            self.__attributes.pop(name, None)
+        self.__derived = {}
+
+    def derived(self, name, build):
+        """
+        Array computed from the edge parameters/attributes (e.g., per-edge probabilities of a model)
+
+        :param name: the array name
+        :param build: a function receiving this index and returning the array, called on first use only
+        :return: a NumPy array aligned with the outgoing CSR adjacency entries
+        """
+        if name not in self.__derived:
+            self.__derived[name] = build(self)
+        return self.__derived[name]
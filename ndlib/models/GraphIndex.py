@@ -0,0 +1,269 @@
+import numpy as np
+import scipy.sparse as sp
+from ndlib.models.SharedGraph import SharedGraph
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class GraphIndex(object):
+    """
+    Contiguous integer indexing of the nodes of a graph
+
+    Nodes are mapped once, following the graph iteration order, to the integers 0..N-1
+    so that per-node quantities can be stored in NumPy arrays.
+    """
+
+    def __init__(self, graph):
+        """
+        Index Constructor
+
+        :param graph: a netdispatch AGraph object (or a SharedGraph, whose arrays are reused)
+        """
+        self.graph = graph
+        self.directed = graph.directed
+        self.__edges = None
+        self.__adjacency = {}
+        self.__entry_keys = None
+        self.__incoming_entries = None
+
+        if isinstance(graph, SharedGraph):
+            self.nodes = graph.nodes
+            self.position = graph.position
+            self.__edges = graph.edge_positions()
+            for incoming in [False, True] if self.directed else [False]:
+                self.__adjacency[incoming] = graph.adjacency(incoming)
+        else:
+            self.nodes = list(graph.nodes)
+            self.position = {n: i for i, n in enumerate(self.nodes)}
+
+        # integer node ids can be located with a binary search instead of a dictionary lookup
+        self.__sorted_ids, self.__order = None, None
+        ids = np.asarray(self.nodes)
+        if ids.ndim == 1 and ids.dtype.kind in "iu":
+            self.__order = np.argsort(ids, kind="stable")
+            self.__sorted_ids = ids[self.__order]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def positions(self, nodes):
+        """
+        Map a collection of node ids to their integer positions
+
+        :param nodes: iterable of node ids
+        :return: a NumPy array of positions
+        """
+        if self.__sorted_ids is not None:
+            keys = np.asarray(nodes if isinstance(nodes, np.ndarray) else list(nodes))
+            if keys.dtype.kind in "iu":
+                loc = np.searchsorted(self.__sorted_ids, keys)
+                loc[loc == len(self.nodes)] = 0
+                if len(keys) > 0 and not np.array_equal(self.__sorted_ids[loc], keys):
+                    raise KeyError("Node(s) not in the graph")
+                return self.__order[loc].astype(np.int64)
+            nodes = keys.tolist()
+
+        return np.fromiter((self.position[n] for n in nodes), dtype=np.int64)
+
+    def to_array(self, node_to_value, dtype):
+        """
+        Convert a dictionary node->value into an array aligned with the index
+
+        :param node_to_value: a mapping defined for every indexed node
+        :param dtype: the NumPy dtype of the resulting array
+        :return: a NumPy array
+        """
+        return np.fromiter(
+            (node_to_value[n] for n in self.nodes), dtype=dtype, count=len(self.nodes)
+        )
+
+    def edge_positions(self):
+        """
+        Positions of the endpoints of the graph edges, following the graph edge order
+
+        :return: a pair of NumPy arrays (sources, targets)
+        """
+        if self.__edges is None:
+            edges = list(self.graph.edges)
+            if len(edges) == 0:
+                self.__edges = (np.zeros(0, np.int64), np.zeros(0, np.int64))
+            else:
+                self.__edges = (
+                    self.positions([u for u, _ in edges]),
+                    self.positions([v for _, v in edges]),
+                )
+        return self.__edges
+
+    def adjacency(self, incoming=False):
+        """
+        CSR adjacency matrix of the indexed graph, built once and cached
+
+        :param incoming: if True row i lists the predecessors of node i, otherwise its successors.
+                         The two coincide for undirected graphs.
+        :return: a scipy.sparse.csr_matrix with unit entries
+        """
+        incoming = incoming and self.directed
+        if incoming not in self.__adjacency:
+            src, dst = self.edge_positions()
+            if not self.directed:
+                loops = src == dst
+                src, dst = (
+                    np.concatenate([src, dst[~loops]]),
+                    np.concatenate([dst, src[~loops]]),
+                )
+            if incoming:
+                src, dst = dst, src
+            n = len(self.nodes)
+            self.__adjacency[incoming] = sp.csr_matrix(
+                (np.ones(len(src), dtype=np.int32), (src, dst)), shape=(n, n)
+            )
+        return self.__adjacency[incoming]
+
+    def edge_entries(self, src, dst):
+        """
+        Locate node pairs among the entries of the outgoing CSR adjacency
+
+        :param src: NumPy array of source positions
+        :param dst: NumPy array of target positions
+        :return: a NumPy array of entry positions (-1 for the pairs that are not edges)
+        """
+        adjacency = self.adjacency()
+        n = len(self.nodes)
+        if self.__entry_keys is None:
+            rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(adjacency.indptr))
+            self.__entry_keys = rows * n + adjacency.indices
+
+        keys = np.asarray(src, dtype=np.int64) * n + np.asarray(dst, dtype=np.int64)
+        loc = np.searchsorted(self.__entry_keys, keys)
+        loc[loc == len(self.__entry_keys)] = 0
+        found = self.__entry_keys[loc] == keys if len(loc) > 0 else loc.astype(bool)
+        return np.where(found, loc, -1)
+
+    def incoming_entries(self):
+        """
+        Map the entries of the incoming CSR adjacency to the ones of the outgoing CSR adjacency
+
+        :return: a NumPy array: the entry of row i, column j of the incoming adjacency (i.e., the edge (j, i))
+                 is the entry at the same position of the outgoing one. For undirected graphs the two
+                 adjacencies coincide, and the entry (i, j) is mapped to the entry (j, i): values depending on
+                 the direction of the edges (e.g., activation probabilities) are read in the right direction.
+        """
+        if self.__incoming_entries is None:
+            adjacency = self.adjacency(incoming=True)
+            rows = np.repeat(
+                np.arange(len(self.nodes), dtype=np.int64),
+                np.diff(adjacency.indptr),
+            )
+            self.__incoming_entries = self.edge_entries(adjacency.indices, rows)
+        return self.__incoming_entries
+
+    def neighbor_entries(self, nodes, incoming=True):
+        """
+        List the neighbors of a batch of nodes along with the edges connecting them
+
+        :param nodes: NumPy array of node positions
+        :param incoming: for directed graphs, whether to list predecessors (True) or successors (False)
+        :return: a triple of NumPy arrays (rows, neighbors, entries): for each neighbor of each node, the position
+                 of the node in nodes, the position of the neighbor and the entry of the edge in the outgoing
+                 CSR adjacency (see edge_array)
+        """
+        adjacency = self.adjacency(incoming)
+        counts = np.diff(adjacency.indptr)[nodes]
+        rows = np.repeat(np.arange(len(nodes)), counts)
+        positions = np.arange(len(rows)) + np.repeat(
+            adjacency.indptr[nodes] - (np.cumsum(counts) - counts), counts
+        )
+        entries = positions
+        if incoming and self.directed:
+            entries = self.incoming_entries()[positions]
+        return rows, adjacency.indices[positions], entries
+
+    def common_neighbors(self, mask=None, chunk_size=2**22):
+        """
+        Count the common neighbors of the endpoints of each edge (u, v), i.e. the successors w of u that are
+        also successors of v, intersecting the CSR rows of the two endpoints: the pairs are expanded from the
+        shorter row and looked up in the other one, in O(min(deg(u), deg(v)) log E) per edge and without
+        materializing the A A^T product.
+
+        :param mask: (optional) boolean NumPy array aligned with the outgoing CSR adjacency entries: only the
+                     successors w of u whose entry (u, w) is selected are counted
+        :param chunk_size: maximum number of expanded pairs held in memory at once, default 2**22
+        :return: an int64 NumPy array aligned with the outgoing CSR adjacency entries
+        """
+        adjacency = self.adjacency()
+        if mask is None:
+            mask = np.ones(adjacency.nnz, dtype=bool)
+        degree = np.diff(adjacency.indptr)
+        src = np.repeat(np.arange(len(self.nodes)), degree)
+        dst = adjacency.indices
+
+        # each edge is expanded from the endpoint with fewer successors
+        from_src = degree[src] <= degree[dst]
+        rows, others = np.where(from_src, src, dst), np.where(from_src, dst, src)
+        sizes = degree[rows]
+        ends = np.cumsum(sizes)
+
+        common = np.zeros(adjacency.nnz, dtype=np.int64)
+        start = 0
+        while start < adjacency.nnz:
+            stop = max(
+                start + 1,
+                np.searchsorted(ends, ends[start] - sizes[start] + chunk_size, "right"),
+            )
+            counts = sizes[start:stop]
+            owners = np.repeat(np.arange(start, stop), counts)
+            positions = np.arange(counts.sum()) + np.repeat(
+                adjacency.indptr[rows[start:stop]] - (np.cumsum(counts) - counts),
+                counts,
+            )
+            neighbors = adjacency.indices[positions]
+
+            # from u: (v, w) must be an edge; from v: (u, w) must be an edge. Either way (u, w) must be selected
+            found = self.edge_entries(others[owners], neighbors)
+            selected = np.where(from_src[owners], positions, found)
+            hit = (found >= 0) & mask[selected]
+            common[start:stop] = np.bincount(
+                owners[hit] - start, minlength=stop - start
+            )
+            start = stop
+        return common
+
+    def community_embeddedness(self, communities):
+        """
+        Community embeddedness of each edge (u, v): the neighbors of u, in the community of u, shared with v,
+        over the union of the neighborhoods of u and v
+
+        :param communities: NumPy array of node communities aligned with the index
+        :return: a triple of NumPy arrays aligned with the outgoing CSR adjacency entries (sources, whether
+                 the endpoints share the community, embeddedness)
+        """
+        adjacency = self.adjacency()
+        degree = np.diff(adjacency.indptr)
+        src = np.repeat(np.arange(len(self.nodes)), degree)
+        dst = adjacency.indices
+        same = communities[src] == communities[dst]
+        common = self.common_neighbors(same).astype(float)
+        return src, same, common / (degree[src] + degree[dst] - common)
+
+    def edge_array(self, edge_to_value, dtype=None):
+        """
+        Convert a dictionary edge->value into an array aligned with the entries of the outgoing CSR adjacency
+        (for undirected graphs both the orientations of an edge get its value)
+
+        :param edge_to_value: a mapping defined for every graph edge
+        :param dtype: the NumPy dtype of the resulting array (inferred from the values if None)
+        :return: a NumPy array
+        """
+        edges = list(edge_to_value.keys())
+        values = np.asarray([edge_to_value[e] for e in edges], dtype=dtype)
+        src = self.positions([u for u, _ in edges])
+        dst = self.positions([v for _, v in edges])
+
+        array = np.zeros(self.adjacency().nnz, dtype=values.dtype)
+        pairs = [(src, dst)] if self.directed else [(src, dst), (dst, src)]
+        for s, d in pairs:
+            entries = self.edge_entries(s, d)
+            array[entries[entries >= 0]] = values[entries >= 0]
+        return array
@@ -0,0 +1,102 @@
+import numpy as np
+import past.builtins
+from scipy import stats
+from ndlib.models.DiffusionModel import ConfigurationException
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class LiveEdgeSampler(object):
+    """
+    Monte Carlo estimation of the spread of an independent cascade through live-edge graphs
+
+    A live-edge graph keeps each edge of the model graph independently, with the activation probability the model
+    uses for it (e.g., the edge threshold for IndependentCascadesModel): the set of nodes activated by a cascade
+    started from a seed set has the same distribution of the set of nodes reachable from the seeds in a live-edge
+    graph. Samples are drawn once, stored as compact CSR arrays, and shared by the estimates of any number of
+    seed sets.
+    """
+
+    def __init__(self, model, samples=100):
+        """
+        Sampler Constructor
+
+        :param model: a configured cascade model (i.e., exposing activation_probabilities, e.g. IndependentCascadesModel)
+        :param samples: number of live-edge graphs to draw, default 100
+        """
+        if not hasattr(model, "activation_probabilities"):
+            raise ConfigurationException(
+                {"message": "The model does not define edge activation probabilities"}
+            )
+
+        self.index = model.edge_attribute_index().index
+        activation = model.activation_probabilities()
+        adjacency = self.index.adjacency()
+        n = len(self.index)
+        rows = np.repeat(np.arange(n), np.diff(adjacency.indptr))
+
+        self.samples = []
+        for _ in past.builtins.xrange(max(1, samples)):
+            live = np.random.random_sample(len(activation)) <= activation
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum(np.bincount(rows[live], minlength=n))
+            self.samples.append((indptr, adjacency.indices[live]))
+
+    def __len__(self):
+        return len(self.samples)
+
+    def reachable(self, seeds, sample=0):
+        """
+        Nodes reachable from a seed set in a live-edge graph
+
+        :param seeds: iterable of node ids
+        :param sample: the id of the live-edge graph, default 0
+        :return: a NumPy array of node positions (see GraphIndex), seeds included
+        """
+        indptr, indices = self.samples[sample]
+        visited = np.zeros(len(self.index), dtype=bool)
+        frontier = np.unique(self.index.positions(seeds))
+        visited[frontier] = True
+
+        while len(frontier) > 0:
+            counts = indptr[frontier + 1] - indptr[frontier]
+            positions = np.arange(counts.sum()) + np.repeat(
+                indptr[frontier] - (np.cumsum(counts) - counts), counts
+            )
+            reached = indices[positions]
+            frontier = np.unique(reached[~visited[reached]])
+            visited[frontier] = True
+
+        return np.flatnonzero(visited)
+
+    def spreads(self, seeds):
+        """
+        Spread of a seed set in each live-edge graph
+
+        :param seeds: iterable of node ids
+        :return: a NumPy array with the number of reached nodes (seeds included) per sample
+        """
+        seeds = list(seeds)
+        return np.array(
+            [len(self.reachable(seeds, s)) for s in past.builtins.xrange(len(self))]
+        )
+
+    def expected_spread(self, seeds, confidence=0.95):
+        """
+        Expected spread of a seed set
+
+        :param seeds: iterable of node ids
+        :param confidence: confidence level of the interval, default 0.95
+        :return: a pair (mean spread, (lower bound, upper bound)); the confidence interval of the mean follows
+                 the normal approximation
+        """
+        spreads = self.spreads(seeds)
+        mean = spreads.mean()
+        if len(spreads) < 2:
+            return mean, (mean, mean)
+
+        width = stats.norm.ppf(0.5 + confidence / 2.0) * spreads.std(ddof=1)
+        width /= np.sqrt(len(spreads))
+        return mean, (mean - width, mean + width)
@@ -0,0 +1,41 @@
+import numpy as np
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class NeighborCounts(object):
+    """
+    Per-iteration cache of neighborhood aggregates
+
+    For each requested status, the number of neighbors (predecessors for directed graphs) of every node
+    having that status is computed once, with a sparse matrix-vector product, and shared by all the
+    compartments evaluated during the iteration. A cache is bound to a status array: it must be discarded
+    as soon as the statuses change.
+    """
+
+    def __init__(self, index, status):
+        """
+        Cache Constructor
+
+        :param index: the GraphIndex of the graph
+        :param status: the NumPy status array the counts refer to
+        """
+        self.index = index
+        self.status = status
+        self.__counts = {}
+
+    def count(self, status_code):
+        """
+        Number of neighbors in a given status
+
+        :param status_code: the status code
+        :return: a NumPy array aligned with the index
+        """
+        if status_code not in self.__counts:
+            adjacency = self.index.adjacency(incoming=True)
+            self.__counts[status_code] = adjacency.dot(
+                (self.status == status_code).astype(np.int32)
+            )
+        return self.__counts[status_code]
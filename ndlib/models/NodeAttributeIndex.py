@@ -0,0 +1,130 @@
+import numpy as np
+from ndlib.models.ParameterView import NodeParameterView
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class NodeAttributeIndex(object):
+    """
+    Node parameters and graph node attributes stored as typed NumPy columns aligned with a GraphIndex
+
+    Numeric values (and booleans) are stored as they are; any other value is stored as the integer code of
+    its category (see categories and code). Each column is built once, on first use: it is a snapshot of the
+    values at that time, so parameters or graph attributes changed afterwards are not seen until the column
+    is dropped (see invalidate).
+    """
+
+    def __init__(self, index, graph, params):
+        """
+        Index Constructor
+
+        :param index: a GraphIndex object
+        :param graph: the indexed graph
+        :param params: the node parameters of the model (dictionary parameter->(node->value))
+        """
+        self.index = index
+        self.graph = graph
+        self.params = params
+        self.__columns = {}
+
+    def parameter(self, name):
+        """
+        Node parameter of the model
+
+        :param name: the parameter name
+        :return: a NumPy array aligned with the index (values or category codes)
+        """
+        return self.__column(name, True)[0]
+
+    def attribute(self, name):
+        """
+        Node attribute of the graph
+
+        :param name: the attribute name
+        :return: a NumPy array aligned with the index (values or category codes)
+        """
+        return self.__column(name, False)[0]
+
+    def numeric(self, name, parameter=False):
+        """
+        Numeric node parameter or graph node attribute
+
+        :param name: the parameter/attribute name
+        :param parameter: whether name is a node parameter of the model (True) or a graph node attribute
+        :return: a NumPy array aligned with the index
+        """
+        column, categories = self.__column(name, parameter)
+        if categories is not None:
+            raise ValueError("Numeric values expected for '%s'" % name)
+        return column
+
+    def categories(self, name, parameter=False):
+        """
+        Categories of a categorical node parameter or graph node attribute
+
+        :param name: the parameter/attribute name
+        :param parameter: whether name is a node parameter of the model (True) or a graph node attribute
+        :return: the list of the category values (the code of a category is its position), None for numeric
+                 columns
+        """
+        return self.__column(name, parameter)[1]
+
+    def code(self, name, value, parameter=False):
+        """
+        Encode a value so that it can be compared with a column
+
+        :param name: the parameter/attribute name
+        :param value: the value to encode
+        :param parameter: whether name is a node parameter of the model (True) or a graph node attribute
+        :return: the category code of value (-1 if no node has it), or value itself for numeric columns
+        """
+        categories = self.__column(name, parameter)[1]
+        if categories is None:
+            return value
+        try:
+            return categories.index(value)
+        except ValueError:
+            return -1
+
+    def invalidate(self, name=None):
+        """
+        Drop cached columns, so that they are rebuilt from the current values on next use
+
+        :param name: the parameter/attribute name (None to drop all the columns)
+        """
+        if name is None:
+            self.__columns = {}
+        else:
+            self.__columns.pop((name, True), None)
+            self.__columns.pop((name, False), None)
+
+    def __column(self, name, parameter):
+        key = (name, parameter)
+        if key not in self.__columns:
+            if parameter:
+                values = self.params[name]
+                if (
+                    isinstance(values, NodeParameterView)
+                    and values.index is self.index
+                    and values.array.dtype.kind in "biuf"
+                ):
+                    self.__columns[key] = (values.array, None)
+                    return self.__columns[key]
+            else:
+                values = self.graph.get_node_attributes(name)
+
+            raw = [values[n] for n in self.index.nodes]
+            column = np.asarray(raw)
+            if column.ndim == 1 and column.dtype.kind in "biuf":
+                self.__columns[key] = (column, None)
+            else:
+                codes = {}
+                column = np.fromiter(
+                    (codes.setdefault(v, len(codes)) for v in raw),
+                    dtype=np.int32,
+                    count=len(raw),
+                )
+                self.__columns[key] = (column, list(codes))
+        return self.__columns[key]
@@ -0,0 +1,80 @@
+import numpy as np
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class NodeParameterView(Mapping):
+    """
+    Read-only dictionary-like view (node->value) over an array of node parameters aligned with a GraphIndex
+    """
+
+    def __init__(self, index, array):
+        """
+        View Constructor
+
+        :param index: a GraphIndex object
+        :param array: the NumPy array of parameter values, aligned with the index
+        """
+        self.index = index
+        self.array = array
+
+    def __getitem__(self, node):
+        return self.array[self.index.position[node]].item()
+
+    def __iter__(self):
+        return iter(self.index.nodes)
+
+    def __len__(self):
+        return len(self.index.nodes)
+
+    def __contains__(self, node):
+        return node in self.index.position
+
+
+class EdgeParameterView(Mapping):
+    """
+    Read-only dictionary-like view (edge->value) over an array of edge parameters aligned with the entries
+    of the outgoing CSR adjacency of a GraphIndex (see GraphIndex.edge_array).
+
+    For undirected graphs an edge can be looked up in both its orientations.
+    """
+
+    def __init__(self, index, array):
+        """
+        View Constructor
+
+        :param index: a GraphIndex object
+        :param array: the NumPy array of parameter values, aligned with the adjacency entries
+        """
+        self.index = index
+        self.array = array
+
+    def __entry(self, edge):
+        try:
+            u, v = edge
+            src = np.array([self.index.position[u]])
+            dst = np.array([self.index.position[v]])
+        except (KeyError, TypeError, ValueError):
+            raise KeyError(edge)
+        entry = self.index.edge_entries(src, dst)[0]
+        if entry < 0:
+            raise KeyError(edge)
+        return entry
+
+    def __getitem__(self, edge):
+        return self.array[self.__entry(edge)].item()
+
+    def __iter__(self):
+        nodes = self.index.nodes
+        src, dst = self.index.edge_positions()
+        return ((nodes[u], nodes[v]) for u, v in zip(src, dst))
+
+    def __len__(self):
+        return len(self.index.edge_positions()[0])
@@ -0,0 +1,189 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import past.builtins
+from scipy import stats
+from ndlib.models.DiffusionModel import ConfigurationException
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class ReverseReachableIndex(object):
+    """
+    Reverse-reachable (RR) set index for influence estimation and maximization under independent cascades
+
+    An RR set lists the nodes reached by a breadth-first search from a random root along reversed live edges
+    (each edge kept independently with the activation probability the cascade model uses for it): the expected
+    spread of a seed set is the number of nodes times the probability that it intersects an RR set. All the RR
+    sets are stored in a single flattened array of node positions (see GraphIndex) delimited by an offsets array.
+    """
+
+    def __init__(
+        self, model, sets=10000, nprocesses=multiprocessing.cpu_count(), chunk_size=None
+    ):
+        """
+        Index Constructor
+
+        :param model: a configured cascade model (i.e., exposing activation_probabilities, e.g. IndependentCascadesModel)
+        :param sets: number of RR sets to generate, default 10000
+        :param nprocesses: number of processes generating the RR sets. Default values cpu number.
+        :param chunk_size: number of RR sets generated by a single task, sharing a visit stamp array of
+                           the size of the graph. Default the sets assigned to each process.
+        """
+        if not hasattr(model, "activation_probabilities"):
+            raise ConfigurationException(
+                {"message": "The model does not define edge activation probabilities"}
+            )
+
+        self.index = model.edge_attribute_index().index
+        adjacency = self.index.adjacency(incoming=True)
+        activation = model.activation_probabilities()[self.index.incoming_entries()]
+        n = len(self.index)
+        nprocesses = max(1, min(nprocesses, multiprocessing.cpu_count()))
+        if chunk_size is None:
+            chunk_size = -(-sets // nprocesses)
+        chunk_size = max(1, chunk_size)
+
+        sizes = [
+            min(chunk_size, sets - start)
+            for start in past.builtins.xrange(0, max(1, sets), chunk_size)
+        ]
+        seeds = np.random.randint(0, 2**31 - 1, size=len(sizes))
+        args = (adjacency.indptr, adjacency.indices, activation)
+        if nprocesses == 1 or len(sizes) == 1:
+            chunks = [
+                self.sample(seed, size, *args) for seed, size in zip(seeds, sizes)
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=nprocesses) as executor:
+                futures = [
+                    executor.submit(self.sample, seed, size, *args)
+                    for seed, size in zip(seeds, sizes)
+                ]
+                chunks = [f.result() for f in futures]
+
+        self.nodes = np.concatenate([nodes for nodes, _ in chunks])
+        sizes = np.concatenate([np.diff(offsets) for _, offsets in chunks])
+        self.offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum(sizes)
+        self.owners = np.repeat(np.arange(len(sizes)), sizes)
+
+        # RR sets containing each node (transposed index)
+        order = np.argsort(self.nodes, kind="stable")
+        self.__node_sets = self.owners[order]
+        self.__node_offsets = np.zeros(n + 1, dtype=np.int64)
+        self.__node_offsets[1:] = np.cumsum(np.bincount(self.nodes, minlength=n))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @staticmethod
+    def sample(seed, count, indptr, indices, activation):
+        """
+        Generate a batch of RR sets from uniformly drawn roots
+
+        :param seed: the random seed of the batch
+        :param count: number of RR sets
+        :param indptr: index pointer array of the incoming CSR adjacency
+        :param indices: column indices of the incoming CSR adjacency
+        :param activation: activation probabilities aligned with the entries of the incoming CSR adjacency
+        :return: a pair of NumPy arrays (node positions, offsets): RR set i spans nodes[offsets[i]:offsets[i+1]]
+        """
+        np.random.seed(seed)
+        n = len(indptr) - 1
+        roots = np.random.randint(0, n, size=count)
+
+        # stamp[v] is the id (plus one) of the last RR set visiting node v: a search only touches its own nodes
+        stamp = np.zeros(n, dtype=np.int64)
+        visited = []
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        for i in past.builtins.xrange(count):
+            frontier = roots[i : i + 1]
+            stamp[frontier] = i + 1
+            size = 1
+            visited.append(frontier)
+            while len(frontier) > 0:
+                counts = indptr[frontier + 1] - indptr[frontier]
+                positions = np.arange(counts.sum()) + np.repeat(
+                    indptr[frontier] - (np.cumsum(counts) - counts), counts
+                )
+                live = positions[
+                    np.random.random_sample(len(positions)) <= activation[positions]
+                ]
+                reached = indices[live]
+                reached = reached[stamp[reached] != i + 1]
+                if len(reached) > 1:
+                    reached = np.sort(reached)
+                    reached = reached[np.diff(reached, prepend=-1) != 0]
+                stamp[reached] = i + 1
+                size += len(reached)
+                visited.append(reached)
+                frontier = reached
+            offsets[i + 1] = offsets[i] + size
+
+        nodes = np.concatenate(visited) if count > 0 else np.zeros(0, dtype=np.int64)
+        return nodes.astype(np.int64), offsets
+
+    def rr_set(self, i):
+        """
+        Nodes of an RR set
+
+        :param i: the id of the RR set
+        :return: a NumPy array of node positions
+        """
+        return self.nodes[self.offsets[i] : self.offsets[i + 1]]
+
+    def coverage(self, seeds):
+        """
+        RR sets intersecting a seed set
+
+        :param seeds: iterable of node ids
+        :return: a boolean NumPy array, one entry per RR set
+        """
+        covered = np.zeros(len(self), dtype=bool)
+        covered[self.owners[np.isin(self.nodes, self.index.positions(seeds))]] = True
+        return covered
+
+    def expected_spread(self, seeds, confidence=0.95):
+        """
+        Expected spread of a seed set
+
+        :param seeds: iterable of node ids
+        :param confidence: confidence level of the interval, default 0.95
+        :return: a pair (spread estimate, (lower bound, upper bound)); the confidence interval follows the normal
+                 approximation of the fraction of covered RR sets
+        """
+        n = len(self.index)
+        fraction = self.coverage(seeds).mean()
+        width = stats.norm.ppf(0.5 + confidence / 2.0) * n
+        width *= np.sqrt(fraction * (1 - fraction) / len(self))
+        return n * fraction, (n * fraction - width, n * fraction + width)
+
+    def select_seeds(self, k):
+        """
+        Greedy seed selection: the node covering most of the RR sets not yet covered is added, k times
+
+        :param k: the budget (number of seeds)
+        :return: a pair (list of seed node ids in selection order, spread estimate of the seed set)
+        """
+        n = len(self.index)
+        covered = np.zeros(len(self), dtype=bool)
+        degree = np.bincount(self.nodes, minlength=n)
+        seeds = []
+        for _ in past.builtins.xrange(min(k, n)):
+            v = int(np.argmax(degree))
+            seeds.append(v)
+            sets = self.__node_sets[self.__node_offsets[v] : self.__node_offsets[v + 1]]
+            sets = sets[~covered[sets]]
+            covered[sets] = True
+
+            counts = self.offsets[sets + 1] - self.offsets[sets]
+            positions = np.arange(counts.sum()) + np.repeat(
+                self.offsets[sets] - (np.cumsum(counts) - counts), counts
+            )
+            degree -= np.bincount(self.nodes[positions], minlength=n)
+            degree[seeds] = -1
+
+        return [self.index.nodes[v] for v in seeds], n * covered.mean()
@@ -0,0 +1,142 @@
+import os
+import pickle
+import numpy as np
+import scipy.sparse as sp
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class SharedGraph(object):
+    """
+    Read-only graph stored as CSR arrays in memory-mapped .npy files
+
+    The topology of an indexed graph is written once (see dump); every process opening the same directory
+    maps the same files, so that the operating system keeps a single copy of the arrays in memory.
+    The object exposes the subset of the netdispatch AGraph interface used by the diffusion models.
+    Graph node/edge attributes are not stored.
+    """
+
+    def __init__(self, path):
+        """
+        Shared Graph Constructor
+
+        :param path: a directory written by SharedGraph.dump
+        """
+        self.path = path
+        with open(os.path.join(path, "graph.pkl"), "rb") as f:
+            meta = pickle.load(f)
+
+        self.directed = meta["directed"]
+        if meta["nodes"] is None:
+            self.nodes = self.__load("nodes").tolist()
+        else:
+            self.nodes = meta["nodes"]
+        self.position = {n: i for i, n in enumerate(self.nodes)}
+
+        self.__edges = (self.__load("edges_src"), self.__load("edges_dst"))
+        self.__adjacency = {}
+        for incoming in [False, True] if self.directed else [False]:
+            name = "in" if incoming else "out"
+            self.__adjacency[incoming] = sp.csr_matrix(
+                (
+                    self.__load("%s_data" % name),
+                    self.__load("%s_indices" % name),
+                    self.__load("%s_indptr" % name),
+                ),
+                shape=(len(self.nodes), len(self.nodes)),
+                copy=False,
+            )
+
+    def __load(self, name):
+        return np.load(os.path.join(self.path, "%s.npy" % name), mmap_mode="r")
+
+    @staticmethod
+    def dump(index, path):
+        """
+        Store the topology of an indexed graph
+
+        :param index: a GraphIndex object
+        :param path: an existing directory
+        """
+        ids = np.asarray(index.nodes)
+        shared_ids = ids.ndim == 1 and ids.dtype.kind in "iu"
+        if shared_ids:
+            np.save(os.path.join(path, "nodes.npy"), ids)
+
+        src, dst = index.edge_positions()
+        np.save(os.path.join(path, "edges_src.npy"), src)
+        np.save(os.path.join(path, "edges_dst.npy"), dst)
+
+        for incoming in [False, True] if index.directed else [False]:
+            name = "in" if incoming else "out"
+            adjacency = index.adjacency(incoming)
+            np.save(os.path.join(path, "%s_data.npy" % name), adjacency.data)
+            np.save(os.path.join(path, "%s_indices.npy" % name), adjacency.indices)
+            np.save(os.path.join(path, "%s_indptr.npy" % name), adjacency.indptr)
+
+        with open(os.path.join(path, "graph.pkl"), "wb") as f:
+            pickle.dump(
+                {
+                    "directed": index.directed,
+                    "nodes": None if shared_ids else index.nodes,
+                },
+                f,
+            )
+
+    def adjacency(self, incoming=False):
+        """
+        CSR adjacency matrix
+
+        :param incoming: if True row i lists the predecessors of node i, otherwise its successors
+        :return: a scipy.sparse.csr_matrix over the memory-mapped arrays
+        """
+        return self.__adjacency[incoming and self.directed]
+
+    def edge_positions(self):
+        """
+        Positions of the endpoints of the graph edges
+
+        :return: a pair of NumPy arrays (sources, targets)
+        """
+        return self.__edges
+
+    @property
+    def edges(self):
+        src, dst = self.__edges
+        return [(self.nodes[u], self.nodes[v]) for u, v in zip(src, dst)]
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        return len(self.__edges[0])
+
+    def __row(self, node, incoming=False):
+        adjacency = self.adjacency(incoming)
+        i = self.position[node]
+        return adjacency.indices[adjacency.indptr[i] : adjacency.indptr[i + 1]]
+
+    def neighbors(self, node):
+        return [self.nodes[v] for v in self.__row(node)]
+
+    def successors(self, node):
+        return self.neighbors(node)
+
+    def predecessors(self, node):
+        return [self.nodes[v] for v in self.__row(node, incoming=True)]
+
+    def has_edge(self, u, v):
+        if u not in self.position or v not in self.position:
+            return False
+        row = self.__row(u)
+        j = self.position[v]
+        k = np.searchsorted(row, j)
+        return bool(k < len(row) and row[k] == j)
+
+    def get_node_attributes(self, attribute):
+        raise ValueError("Node attributes are not available on shared graphs")
+
+    def get_edge_attributes(self, attribute):
+        raise ValueError("Edge attributes are not available on shared graphs")
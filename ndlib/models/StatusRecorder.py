@@ -0,0 +1,226 @@
+import bisect
+import os
+import pickle
+import numpy as np
+import past.builtins
+import tqdm
+from ndlib.models.DiffusionModel import ConfigurationException
+from ndlib.models.GraphIndex import GraphIndex
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class StatusRecorder(object):
+    """
+    Append-only, columnar, on-disk recording of the node status trajectory of a model
+
+    Each recorded iteration is stored as the pairs (node position, new status) of the nodes that changed status.
+    Pairs are buffered in memory and written every chunk_size iterations as a chunk of .npy files, along with a
+    snapshot of all the statuses at the beginning of the chunk: any iteration can be rebuilt by reading a single
+    chunk (see StatusTrajectory).
+    """
+
+    def __init__(self, model, path, chunk_size=100):
+        """
+        Recorder Constructor
+
+        :param model: a configured diffusion model (discrete statuses)
+        :param path: the directory where the recording is stored (created if needed)
+        :param chunk_size: number of iterations per chunk, default 100
+        """
+        if not model.discrete_state:
+            raise ConfigurationException(
+                {"message": "The status recorder requires discrete node statuses"}
+            )
+
+        self.model = model
+        self.path = path
+        self.chunk_size = max(1, chunk_size)
+        self.index = (
+            model.node_index
+            if model.node_index is not None
+            else GraphIndex(model.graph)
+        )
+        self.status = self.index.to_array(model.status, np.int16)
+        self.chunks = []
+
+        self.__snapshot = None
+        self.__positions, self.__statuses, self.__iterations = [], [], []
+
+        if not os.path.exists(path):
+            os.makedirs(path)
+        with open(os.path.join(path, "nodes.pkl"), "wb") as f:
+            pickle.dump(self.index.nodes, f)
+        self.__write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def record(self, iteration):
+        """
+        Append an iteration to the recording
+
+        :param iteration: an iteration description, as returned by the model iteration() with node_status=True
+        """
+        if self.__snapshot is None:
+            self.__snapshot = self.status.copy()
+
+        delta = iteration["status"]
+        positions = self.index.positions(list(delta.keys()))
+        statuses = np.fromiter(delta.values(), dtype=np.int16, count=len(delta))
+
+        # iteration 0 lists every node: only actual changes are kept
+        changed = self.status[positions] != statuses
+        positions, statuses = positions[changed], statuses[changed]
+        self.status[positions] = statuses
+
+        self.__positions.append(positions)
+        self.__statuses.append(statuses)
+        self.__iterations.append(iteration["iteration"])
+
+        if len(self.__iterations) == self.chunk_size:
+            self.flush()
+
+    def record_bunch(self, bunch_size, progress_bar=False):
+        """
+        Execute and record a bunch of model iterations
+
+        :param bunch_size: the number of iterations to execute
+        :param progress_bar: whether to display a progress bar, default False
+        :return: the recorder itself
+        """
+        for _ in tqdm.tqdm(
+            past.builtins.xrange(0, bunch_size), disable=not progress_bar
+        ):
+            self.record(self.model.iteration(True))
+        return self
+
+    def flush(self):
+        """
+        Write the buffered iterations as a new chunk
+        """
+        if len(self.__iterations) == 0:
+            return
+
+        chunk = len(self.chunks)
+        offsets = np.zeros(len(self.__positions) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in self.__positions])
+        columns = {
+            "snapshot": self.__snapshot,
+            "positions": np.concatenate(self.__positions),
+            "statuses": np.concatenate(self.__statuses),
+            "offsets": offsets,
+            "iterations": np.asarray(self.__iterations, dtype=np.int64),
+        }
+        for name, column in columns.items():
+            np.save(os.path.join(self.path, "%06d_%s.npy" % (chunk, name)), column)
+
+        self.chunks.append(len(self.__iterations))
+        self.__write_meta()
+
+        self.__snapshot = None
+        self.__positions, self.__statuses, self.__iterations = [], [], []
+
+    def close(self):
+        """
+        Write the buffered iterations and close the recording
+
+        :return: a StatusTrajectory reading the recording
+        """
+        self.flush()
+        return StatusTrajectory(self.path)
+
+    def __write_meta(self):
+        with open(os.path.join(self.path, "meta.pkl"), "wb") as f:
+            pickle.dump({"chunks": self.chunks}, f)
+
+
+class StatusTrajectory(object):
+    """
+    Random access reader of a recording written by StatusRecorder
+
+    Iterations are addressed by their position t in the recording (0 for the first recorded one); the model
+    iteration ids are listed in the iterations attribute.
+    """
+
+    def __init__(self, path):
+        """
+        Reader Constructor
+
+        :param path: the directory of the recording
+        """
+        self.path = path
+        with open(os.path.join(path, "nodes.pkl"), "rb") as f:
+            self.nodes = pickle.load(f)
+        with open(os.path.join(path, "meta.pkl"), "rb") as f:
+            self.chunks = pickle.load(f)["chunks"]
+
+        self.__first = [0]
+        for size in self.chunks:
+            self.__first.append(self.__first[-1] + size)
+        self.iterations = np.concatenate(
+            [np.zeros(0, dtype=np.int64)]
+            + [self.__load(c, "iterations") for c in range(len(self.chunks))]
+        )
+
+    def __len__(self):
+        return self.__first[-1]
+
+    def __load(self, chunk, name):
+        return np.load(
+            os.path.join(self.path, "%06d_%s.npy" % (chunk, name)), mmap_mode="r"
+        )
+
+    def __locate(self, t):
+        if t < 0:
+            t += len(self)
+        if not 0 <= t < len(self):
+            raise IndexError("Iteration not recorded")
+        chunk = bisect.bisect_right(self.__first, t) - 1
+        return chunk, t - self.__first[chunk]
+
+    def changes(self, t):
+        """
+        Nodes that changed status during a recorded iteration
+
+        :param t: position of the iteration in the recording
+        :return: a pair of NumPy arrays (node positions, new statuses)
+        """
+        chunk, i = self.__locate(t)
+        offsets = self.__load(chunk, "offsets")
+        return (
+            np.array(self.__load(chunk, "positions")[offsets[i] : offsets[i + 1]]),
+            np.array(self.__load(chunk, "statuses")[offsets[i] : offsets[i + 1]]),
+        )
+
+    def status_array(self, t):
+        """
+        Node statuses at the end of a recorded iteration
+
+        :param t: position of the iteration in the recording
+        :return: a NumPy array aligned with the nodes attribute
+        """
+        chunk, i = self.__locate(t)
+        status = np.array(self.__load(chunk, "snapshot"))
+        offsets = self.__load(chunk, "offsets")
+        positions = self.__load(chunk, "positions")
+        statuses = self.__load(chunk, "statuses")
+        for j in past.builtins.xrange(i + 1):
+            status[positions[offsets[j] : offsets[j + 1]]] = statuses[
+                offsets[j] : offsets[j + 1]
+            ]
+        return status
+
+    def status(self, t):
+        """
+        Node statuses at the end of a recorded iteration
+
+        :param t: position of the iteration in the recording
+        :return: a dictionary node->status
+        """
+        return dict(zip(self.nodes, self.status_array(t).tolist()))
@@ -0,0 +1,62 @@
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+__author__ = "Giulio Rossetti"
+__license__ = "BSD-2-Clause"
+__email__ = "giulio.rossetti@gmail.com"
+
+
+class StatusView(MutableMapping):
+    """
+    Dictionary-like view (node->status) over an array of node statuses
+
+    Reads and writes go straight to the underlying array; a plain dictionary is
+    materialized only when the whole mapping is requested (copy, items, values).
+    """
+
+    def __init__(self, index, array):
+        """
+        View Constructor
+
+        :param index: a GraphIndex object
+        :param array: the NumPy status array aligned with the index
+        """
+        self.index = index
+        self.array = array
+
+    def __getitem__(self, node):
+        return int(self.array[self.index.position[node]])
+
+    def __setitem__(self, node, value):
+        self.array[self.index.position[node]] = value
+
+    def __delitem__(self, node):
+        raise TypeError("Node statuses cannot be removed")
+
+    def __iter__(self):
+        return iter(self.index.nodes)
+
+    def __len__(self):
+        return len(self.index.nodes)
+
+    def __contains__(self, node):
+        return node in self.index.position
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def copy(self):
+        """
+        Materialize the view
+
+        :return: a dictionary node->status
+        """
+        return dict(zip(self.index.nodes, self.array.tolist()))
+
+    def items(self):
+        return self.copy().items()
+
+    def values(self):
+        return self.array.tolist()
@@ -1,5 +1,11 @@
 import abc
+import inspect
 import six
+import numpy as np
+from ndlib.models.DiffusionModel import DiffusionModel
+from ndlib.models.StatusView import StatusView
+from ndlib.models.EdgeAttributeIndex import EdgeAttributeIndex
+from ndlib.models.NodeAttributeIndex import NodeAttributeIndex
 
 __author__ = "Giulio Rossetti"
 __license__ = "BSD-2-Clause"
@@ -28,3 +34,144 @@ class Compartiment(object):
             return self.composed.execute(*args, **kwargs)
         else:
             return True
+
+    @staticmethod
+    def evaluating_model(args, kwargs):
+        """
+        Model evaluating the compartment, if provided through the model keyword
+
+        :param args: the positional arguments of execute
+        :param kwargs: the keyword arguments of execute
+        :return: the model, or None
+        """
+        # composing compartments forward their keyword arguments as a positional dictionary, possibly after
+        # the model parameters (whose "model" entry, if any, is not the model)
+        for extra in [kwargs] + [a for a in args if isinstance(a, dict)]:
+            if isinstance(extra.get("model"), DiffusionModel):
+                return extra["model"]
+        return None
+
+    @staticmethod
+    def accepts_model(rule):
+        """
+        Whether the execute method of a compartment can receive the model keyword (i.e., it declares a model
+        parameter or accepts arbitrary keyword arguments). Compartments defined before the keyword was
+        introduced are evaluated without it.
+
+        :param rule: the compartment
+        :return: a boolean
+        """
+        try:
+            parameters = inspect.signature(rule.execute).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        return any(
+            p.kind == p.VAR_KEYWORD
+            or (
+                p.name == "model"
+                and p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)
+            )
+            for p in parameters
+        )
+
+    def execute_batch(
+        self, nodes, graph, status, status_map, params, index, *args, **kwargs
+    ):
+        """
+        Evaluate the compartment for a batch of nodes
+
+        Compartments without a vectorized implementation are evaluated node by node through execute.
+
+        :param nodes: NumPy array of node positions (see GraphIndex)
+        :param graph: the model graph
+        :param status: NumPy array of the node statuses, aligned with index
+        :param status_map: dictionary status name->status code
+        :param params: the model parameters
+        :param index: the GraphIndex of the graph
+        :param neighbor_counts: (optional keyword) the NeighborCounts cache shared by the compartments
+                                evaluated during the iteration
+        :param model: (optional keyword) the model evaluating the compartment, forwarded to execute if it
+                      accepts it (see accepts_model)
+        :return: a boolean NumPy mask, aligned with nodes, of the nodes satisfying the compartment
+        """
+        view = StatusView(index, status)
+        extra = {}
+        if kwargs.get("model") is not None and self.accepts_model(self):
+            extra["model"] = kwargs["model"]
+        return np.fromiter(
+            (
+                bool(
+                    self.execute(
+                        node=index.nodes[i],
+                        graph=graph,
+                        status=view,
+                        status_map=status_map,
+                        params=params,
+                        **extra
+                    )
+                )
+                for i in nodes
+            ),
+            dtype=bool,
+            count=len(nodes),
+        )
+
+    def compose_batch(self, mask, nodes, *args, **kwargs):
+        """
+        Intersect the mask of the compartment with the one of the composed compartment (if any), which is
+        evaluated only for the nodes satisfying the former
+
+        :param mask: boolean NumPy mask aligned with nodes (updated in place)
+        :param nodes: NumPy array of node positions
+        :return: the intersected mask
+        """
+        if self.composed is not None and mask.any():
+            mask[mask] = self.composed.execute_batch(nodes[mask], *args, **kwargs)
+        return mask
+
+    @staticmethod
+    def neighbors_in_status(nodes, status, status_code, index, neighbor_counts=None):
+        """
+        Count, for a batch of nodes, the neighbors (predecessors for directed graphs) having a given status
+
+        :param nodes: NumPy array of node positions
+        :param status: NumPy array of the node statuses
+        :param status_code: the status code
+        :param index: the GraphIndex of the graph
+        :param neighbor_counts: (optional) the NeighborCounts cache of the iteration
+        :return: a NumPy array aligned with nodes
+        """
+        if neighbor_counts is not None:
+            return neighbor_counts.count(status_code)[nodes]
+        adjacency = index.adjacency(incoming=True)
+        return adjacency[nodes].dot((status == status_code).astype(np.int32))
+
+    @staticmethod
+    def node_attribute_index(index, graph, params, model=None):
+        """
+        Node parameters and graph node attributes as typed columns aligned with an index
+
+        :param index: the GraphIndex of the graph
+        :param graph: the model graph
+        :param params: the model parameters
+        :param model: (optional) the model evaluating the compartment, whose columns are reused
+        :return: a NodeAttributeIndex object
+        """
+        if model is not None and model.node_attribute_index().index is index:
+            return model.node_attributes
+        return NodeAttributeIndex(index, graph, params["nodes"])
+
+    @staticmethod
+    def edge_attribute_index(index, graph, params, model=None):
+        """
+        Edge parameters and graph edge attributes as arrays aligned with the CSR adjacency entries of an index
+
+        :param index: the GraphIndex of the graph
+        :param graph: the model graph
+        :param params: the model parameters
+        :param model: (optional) the model evaluating the compartment, whose arrays are reused
+        :return: an EdgeAttributeIndex object
+        """
+        if model is not None and model.edge_attribute_index().index is index:
+            return model.edge_attributes
+        return EdgeAttributeIndex(index, graph, params["edges"])
@@ -1,4 +1,5 @@
 from ndlib.models.compartments.Compartment import Compartiment, ConfigurationException
+import numpy as np
 
 __author__ = "Giulio Rossetti"
 __license__ = "BSD-2-Clause"
@@ -27,3 +28,16 @@ class ConditionalComposition(Compartiment):
             return self.first_branch.execute(*args, **kwargs)
         else:
             return self.second_branch.execute(*args, **kwargs)
+
+    def execute_batch(self, nodes, *args, **kwargs):
+        condition = self.condition.execute_batch(nodes, *args, **kwargs)
+        test = np.zeros(len(nodes), dtype=bool)
+        if condition.any():
+            test[condition] = self.first_branch.execute_batch(
+                nodes[condition], *args, **kwargs
+            )
+        if not condition.all():
+            test[~condition] = self.second_branch.execute_batch(
+                nodes[~condition], *args, **kwargs
+            )
+        return test
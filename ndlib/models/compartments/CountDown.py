@@ -1,4 +1,5 @@
 from ndlib.models.compartments.Compartment import Compartiment
+import numpy as np
 
 __author__ = "Giulio Rossetti"
 __license__ = "BSD-2-Clause"
@@ -6,19 +7,61 @@ __email__ = "giulio.rossetti@gmail.com"
 
 
 class CountDown(Compartiment):
+    """
+    Satisfied by a node the iterations-th time it is tested after the first one
+
+    The timers are stored by the model evaluating the compartment (see DiffusionModel.timer) and restart
+    when the model is reset. When no model is provided the timers are stored in the graph node attributes.
+    """
+
+    # timer value of the nodes not tested yet
+    UNSET = np.iinfo(np.int64).min
+
     def __init__(self, name, iterations, **kwargs):
         super(self.__class__, self).__init__(kwargs)
         self.iterations = iterations
         self.name = name
 
     def execute(self, node, graph, status, status_map, *args, **kwargs):
-        if self.name in graph.nodes[node]:
-            graph.nodes[node][self.name] -= 1
+        model = self.evaluating_model(args, kwargs)
+        if model is not None:
+            timer = model.timer(self.name, self.UNSET)
+            i = model.node_order()[node]
+            if timer[i] != self.UNSET:
+                timer[i] -= 1
+            else:
+                timer[i] = self.iterations
+            test = timer[i] == 0
+
         else:
-            graph.nodes[node][self.name] = self.iterations
+            if self.name in graph.nodes[node]:
+                graph.nodes[node][self.name] -= 1
+            else:
+                graph.nodes[node][self.name] = self.iterations
+            test = graph.nodes[node][self.name] == 0
 
-        test = graph.nodes[node][self.name] == 0
         if test:
             return self.compose(node, graph, status, status_map, kwargs)
 
         return False
+
+    def execute_batch(
+        self, nodes, graph, status, status_map, params, index, *args, **kwargs
+    ):
+        if kwargs.get("model") is None:
+            return super(CountDown, self).execute_batch(
+                nodes, graph, status, status_map, params, index, *args, **kwargs
+            )
+
+        timer = kwargs["model"].timer(self.name, self.UNSET)
+        values = timer[nodes]
+        started = values != self.UNSET
+        values[started] -= 1
+        values[~started] = self.iterations
+        timer[nodes] = values
+
+        test = values == 0
+
+        return self.compose_batch(
+            test, nodes, graph, status, status_map, params, index, *args, **kwargs
+        )
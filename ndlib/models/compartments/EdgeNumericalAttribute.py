@@ -55,6 +55,29 @@ class EdgeNumericalAttribute(Compartiment):
             raise ValueError("The operator provided '%s' is not valid" % operator)
 
     def execute(self, node, graph, status, status_map, *args, **kwargs):
+        model = self.evaluating_model(args, kwargs)
+        if model is not None:
+            # attribute values read by CSR entry
+            attributes = model.edge_attribute_index()
+            index = attributes.index
+            _, neighbors, entries = index.neighbor_entries(
+                np.array([index.position[node]]), incoming=False
+            )
+            triggered = self.__test(attributes.attribute(self.attribute)[entries])
+            if self.trigger is not None:
+                triggered &= np.array(
+                    [
+                        status[index.nodes[v]] == status_map[self.trigger]
+                        for v in neighbors
+                    ],
+                    dtype=bool,
+                )
+
+            for _ in range(np.count_nonzero(triggered)):
+                p = np.random.random_sample()
+                if p <= self.probability:
+                    return self.compose(node, graph, status, status_map, kwargs)
+            return False
 
         neighbors = list(graph.neighbors(node))
         if isinstance(graph, nx.DiGraph):
@@ -111,3 +134,38 @@ class EdgeNumericalAttribute(Compartiment):
                 return self.compose(node, graph, status, status_map, kwargs)
 
         return False
+
+    def execute_batch(
+        self, nodes, graph, status, status_map, params, index, *args, **kwargs
+    ):
+        attributes = self.edge_attribute_index(
+            index, graph, params, kwargs.get("model")
+        )
+        rows, neighbors, entries = index.neighbor_entries(nodes, incoming=False)
+        triggered = self.__test(attributes.attribute(self.attribute)[entries])
+
+        if self.trigger is not None:
+            triggered &= status[neighbors] == status_map[self.trigger]
+
+        # each triggering neighbor is an independent trial
+        count = np.bincount(rows[triggered], minlength=len(nodes))
+        p = np.random.random_sample(len(nodes))
+        test = p < 1 - np.power(1 - np.clip(self.probability, 0, 1), count)
+        return self.compose_batch(
+            test, nodes, graph, status, status_map, params, index, *args, **kwargs
+        )
+
+    def __test(self, values):
+        """
+        Evaluate the attribute condition on an array of edge values
+
+        :param values: NumPy array of attribute values
+        :return: a boolean NumPy mask
+        """
+        if self.operator == "IN":
+            return self.__available_operators[self.operator][0](
+                values, self.attribute_range[0]
+            ) & self.__available_operators[self.operator][1](
+                values, self.attribute_range[1]
+            )
+        return self.__available_operators[self.operator](values, self.attribute_range)
@@ -15,6 +15,24 @@ class EdgeStochastic(Compartiment):
             raise ConfigurationException("Triggering status not specified.")
 
     def execute(self, node, graph, status, status_map, params, *args, **kwargs):
+        model = self.evaluating_model(args, kwargs)
+        if model is not None and "threshold" in params["edges"]:
+            # per-edge thresholds read by CSR entry
+            attributes = model.edge_attribute_index()
+            index = attributes.index
+            _, neighbors, entries = index.neighbor_entries(
+                np.array([index.position[node]])
+            )
+            thresholds = attributes.parameter("threshold")[entries]
+            for v, threshold in zip(neighbors.tolist(), thresholds.tolist()):
+                if status[index.nodes[v]] == status_map[self.trigger]:
+                    flip = np.random.random_sample()
+                    if flip <= threshold:
+                        return self.compose(
+                            node, graph, status, status_map, params, kwargs
+                        )
+            return False
+
         neighbors = list(graph.neighbors(node))
 
         try:
@@ -45,3 +63,41 @@ class EdgeStochastic(Compartiment):
                 return self.compose(node, graph, status, status_map, params, kwargs)
 
         return False
+
+    def execute_batch(
+        self, nodes, graph, status, status_map, params, index, *args, **kwargs
+    ):
+        if "threshold" not in params["edges"]:
+            # uniform per-edge thresholds: only the number of triggering neighbors matters
+            triggered = self.neighbors_in_status(
+                nodes,
+                status,
+                status_map[self.trigger],
+                index,
+                kwargs.get("neighbor_counts"),
+            )
+            if self.threshold is not None:
+                threshold = self.threshold
+            else:
+                degree = np.diff(index.adjacency(incoming=True).indptr)[nodes]
+                threshold = 1.0 / np.maximum(degree, 1)
+
+            flip = np.random.random_sample(len(nodes))
+            test = flip < 1 - np.power(1 - np.clip(threshold, 0, 1), triggered)
+            return self.compose_batch(
+                test, nodes, graph, status, status_map, params, index, *args, **kwargs
+            )
+
+        attributes = self.edge_attribute_index(
+            index, graph, params, kwargs.get("model")
+        )
+        rows, neighbors, entries = index.neighbor_entries(nodes)
+        triggered = status[neighbors] == status_map[self.trigger]
+        rows, entries = rows[triggered], entries[triggered]
+        threshold = attributes.parameter("threshold")[entries]
+
+        flip = np.random.random_sample(len(rows))
+        test = np.bincount(rows[flip <= threshold], minlength=len(nodes)) > 0
+        return self.compose_batch(
+            test, nodes, graph, status, status_map, params, index, *args, **kwargs
+        )
@@ -19,12 +19,34 @@ class NodeCategoricalAttribute(Compartiment):
         self.probability = probability
 
     def execute(self, node, graph, status, status_map, *args, **kwargs):
+        model = self.evaluating_model(args, kwargs)
+        if model is not None:
+            attributes = model.node_attribute_index()
+            val = attributes.attribute(self.attribute)[attributes.index.position[node]]
+            condition = val == attributes.code(self.attribute, self.attribute_value)
+        else:
+            val = nx.get_node_attributes(graph, self.attribute)[node]
+            condition = val == self.attribute_value
 
-        val = nx.get_node_attributes(graph, self.attribute)[node]
         p = np.random.random_sample()
-        test = val == self.attribute_value and p <= self.probability
+        test = condition and p <= self.probability
 
         if test:
             return self.compose(node, graph, status, status_map, kwargs)
 
         return False
+
+    def execute_batch(
+        self, nodes, graph, status, status_map, params, index, *args, **kwargs
+    ):
+        attributes = self.node_attribute_index(
+            index, graph, params, kwargs.get("model")
+        )
+        val = attributes.attribute(self.attribute)[nodes]
+        p = np.random.random_sample(len(nodes))
+
+        condition = val == attributes.code(self.attribute, self.attribute_value)
+        test = condition & (p <= self.probability)
+        return self.compose_batch(
+            test, nodes, graph, status, status_map, params, index, *args, **kwargs
+        )
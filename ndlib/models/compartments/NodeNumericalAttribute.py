@@ -46,8 +46,13 @@ class NodeNumericalAttribute(Compartiment):
             raise ValueError("The operator provided '%s' is not valid" % operator)
 
     def execute(self, node, graph, status, status_map, *args, **kwargs):
+        model = self.evaluating_model(args, kwargs)
+        if model is not None:
+            attributes = model.node_attribute_index()
+            val = attributes.numeric(self.attribute)[attributes.index.position[node]]
+        else:
+            val = nx.get_node_attributes(graph, self.attribute)[node]
 
-        val = nx.get_node_attributes(graph, self.attribute)[node]
         p = np.random.random_sample()
 
         if self.operator == "IN":
@@ -67,3 +72,28 @@ class NodeNumericalAttribute(Compartiment):
             return self.compose(node, graph, status, status_map, kwargs)
 
         return False
+
+    def execute_batch(
+        self, nodes, graph, status, status_map, params, index, *args, **kwargs
+    ):
+        attributes = self.node_attribute_index(
+            index, graph, params, kwargs.get("model")
+        )
+        val = attributes.numeric(self.attribute)[nodes]
+        p = np.random.random_sample(len(nodes))
+
+        if self.operator == "IN":
+            condition = self.__available_operators[self.operator][0](
+                val, self.attribute_range[0]
+            ) & self.__available_operators[self.operator][1](
+                val, self.attribute_range[1]
+            )
+        else:
+            condition = self.__available_operators[self.operator](
+                val, self.attribute_range
+            )
+
+        test = condition & (p <= self.probability)
+        return self.compose_batch(
+            test, nodes, graph, status, status_map, params, index, *args, **kwargs
+        )
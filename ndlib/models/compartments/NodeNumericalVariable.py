@@ -87,23 +87,19 @@ class NodeNumericalVariable(Compartiment):
     def execute(
         self, node, graph, status, status_map, attributes=None, *args, **kwargs
     ):
+        model = self.evaluating_model(args, kwargs)
+
         if self.variable_type == NumericalType.STATUS:
             val = status[node][self.variable]
         elif self.variable_type == NumericalType.ATTRIBUTE:
-            if attributes:
-                val = attributes[node][self.variable]
-            else:
-                val = nx.get_node_attributes(graph, self.variable)[node]
+            val = self.__attribute_value(node, self.variable, graph, attributes, model)
 
         testVal = self.value
 
         if self.value_type == NumericalType.STATUS:
             testVal = status[node][self.value]
         elif self.value_type == NumericalType.ATTRIBUTE:
-            if attributes:
-                testVal = attributes[node][self.value]
-            else:
-                testVal = nx.get_node_attributes(graph, self.value)[node]
+            testVal = self.__attribute_value(node, self.value, graph, attributes, model)
 
         p = np.random.random_sample()
 
@@ -120,3 +116,52 @@ class NodeNumericalVariable(Compartiment):
             return self.compose(node, graph, status, status_map, kwargs)
 
         return False
+
+    def execute_batch(
+        self, nodes, graph, status, status_map, params, index, *args, **kwargs
+    ):
+        if (
+            self.variable_type != NumericalType.ATTRIBUTE
+            or self.value_type == NumericalType.STATUS
+        ):
+            # statuses holding variables are not stored in status arrays
+            return super(NodeNumericalVariable, self).execute_batch(
+                nodes, graph, status, status_map, params, index, *args, **kwargs
+            )
+
+        attributes = self.node_attribute_index(
+            index, graph, params, kwargs.get("model")
+        )
+        val = attributes.numeric(self.variable)[nodes]
+
+        testVal = self.value
+        if self.value_type == NumericalType.ATTRIBUTE:
+            testVal = attributes.numeric(self.value)[nodes]
+
+        p = np.random.random_sample(len(nodes))
+
+        if self.operator == "IN":
+            condition = self.__available_operators[self.operator][0](
+                val, testVal[0]
+            ) & self.__available_operators[self.operator][1](val, testVal[1])
+        else:
+            condition = self.__available_operators[self.operator](val, testVal)
+
+        test = condition & (p <= self.probability)
+        return self.compose_batch(
+            test, nodes, graph, status, status_map, params, index, *args, **kwargs
+        )
+
+    @staticmethod
+    def __attribute_value(node, name, graph, attributes, model):
+        """
+        Value of a node attribute, read from the attributes provided by the caller, from the node attribute
+        columns of the evaluating model or, lacking both, from the graph. Composing compartments (e.g.,
+        NodeThreshold) forward the model parameters in place of the attributes: they hold no node entries.
+        """
+        if attributes and node in attributes:
+            return attributes[node][name]
+        if model is not None:
+            columns = model.node_attribute_index()
+            return columns.numeric(name)[columns.index.position[node]]
+        return nx.get_node_attributes(graph, name)[node]
@@ -38,3 +38,26 @@ class NodeStochastic(Compartiment):
             return self.compose(node, graph, status, status_map, kwargs)
 
         return False
+
+    def execute_batch(
+        self, nodes, graph, status, status_map, params, index, *args, **kwargs
+    ):
+        p = np.random.random_sample(len(nodes))
+        if self.trigger is None:
+            triggered = 1
+        else:
+            triggered = (
+                self.neighbors_in_status(
+                    nodes,
+                    status,
+                    status_map[self.trigger],
+                    index,
+                    kwargs.get("neighbor_counts"),
+                )
+                > 0
+            )
+
+        test = p < self.rate * triggered
+        return self.compose_batch(
+            test, nodes, graph, status, status_map, params, index, *args, **kwargs
+        )
@@ -1,4 +1,5 @@
 from ndlib.models.compartments.Compartment import Compartiment, ConfigurationException
+import numpy as np
 
 __author__ = "Giulio Rossetti"
 __license__ = "BSD-2-Clause"
@@ -43,3 +44,37 @@ class NodeThreshold(Compartiment):
             return self.compose(node, graph, status, status_map, params, kwargs)
 
         return False
+
+    def execute_batch(
+        self, nodes, graph, status, status_map, params, index, *args, **kwargs
+    ):
+        degree = np.diff(index.adjacency(incoming=True).indptr)[nodes]
+        if self.trigger is None:
+            triggered = np.zeros(len(nodes))
+        else:
+            triggered = self.neighbors_in_status(
+                nodes,
+                status,
+                status_map[self.trigger],
+                index,
+                kwargs.get("neighbor_counts"),
+            )
+
+        if "threshold" in params["nodes"]:
+            attributes = self.node_attribute_index(
+                index, graph, params, kwargs.get("model")
+            )
+            threshold = attributes.numeric("threshold", parameter=True)[nodes]
+        elif self.threshold is not None:
+            threshold = self.threshold
+        elif (degree > 0).any():
+            raise ConfigurationException("Threshold not specified")
+        else:
+            threshold = 0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            infected_ratio = triggered / degree.astype(float)
+        test = (degree > 0) & (infected_ratio >= threshold)
+        return self.compose_batch(
+            test, nodes, graph, status, status_map, params, index, *args, **kwargs
+        )
@@ -1,4 +1,5 @@
 from ..DiffusionModel import DiffusionModel
+import numpy as np
 import future.utils
 import random
 import queue
@@ -86,24 +87,15 @@ class GeneralisedThresholdModel(DiffusionModel):
                 gamma -= 1
                 number_node_susceptible -= 1
 
-        for u in self.graph.nodes:
+        nodes = self.node_attribute_index().index.nodes
+        for i in np.flatnonzero(self.__threshold_reached()):
+            u = nodes[i]
             if actual_status[u] == 1:
                 continue
 
-            neighbors = list(self.graph.neighbors(u))
-            if self.graph.directed:
-                neighbors = list(self.graph.predecessors(u))
-
-            infected = 0
-            for v in neighbors:
-                infected += self.status[v]
-
-            if len(neighbors) > 0:
-                infected_ratio = float(infected) / len(neighbors)
-                if infected_ratio >= self.params["nodes"]["threshold"][u]:
-                    if u not in self.inqueue:
-                        self.queue.put((self.actual_iteration, u))
-                        self.inqueue[u] = None
+            if u not in self.inqueue:
+                self.queue.put((self.actual_iteration, u))
+                self.inqueue[u] = None
 
         while not self.queue.empty():
             next = self.queue.queue[0]
@@ -117,3 +109,22 @@ class GeneralisedThresholdModel(DiffusionModel):
         self.actual_iteration += 1
 
         return self.actual_iteration - 1, delta
+
+    def __threshold_reached(self):
+        """
+        Nodes whose ratio of infected neighbors (predecessors for directed graphs) reaches their threshold.
+        Infected neighbors are counted incrementally (see active_neighbors) and compared at once with the
+        threshold array.
+        :return: a boolean NumPy array aligned with the graph index
+        """
+        attributes = self.node_attribute_index()
+        degree = np.diff(attributes.index.adjacency(incoming=True).indptr)
+        infected_ratio = np.divide(
+            self.active_neighbors(1),
+            degree,
+            out=np.zeros(len(degree)),
+            where=degree > 0,
+        )
+        return (degree > 0) & (
+            infected_ratio >= attributes.numeric("threshold", parameter=True)
+        )
@@ -33,6 +33,10 @@ class ICEModel(DiffusionModel):
         :return: Iteration_id, Incremental node status (dictionary node->status)
         """
         self.clean_initial_status(self.available_statuses.values())
+
+        if self.node_index is not None:
+            return self.cascade_iteration(self.activation_probabilities(), node_status)
+
         actual_status = {
             node: nstatus for node, nstatus in future.utils.iteritems(self.status)
         }
@@ -55,57 +59,16 @@ class ICEModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
-        edge_embeddedness = {}
+        activation = self.activation_probabilities()
         for u in self.graph.nodes:
             if self.status[u] != 1:
                 continue
 
-            edge_embeddedness[u] = {}
-            com_embeddedness = {}
-
-            neighbors = list(
-                self.graph.neighbors(u)
-            )  # neighbors and successors (in DiGraph) produce the same result
-            embeddedness = 1
-            for v in neighbors:
-                same_community_neighbors = 0
-                neighbors_v = list(self.graph.neighbors(v))
-                for neighbor in neighbors_v:
-                    if (
-                        neighbor in neighbors
-                        and self.params["nodes"]["com"][neighbor]
-                        == self.params["nodes"]["com"][u]
-                    ):
-                        same_community_neighbors += 1
-                tmp_embeddedness = float(same_community_neighbors) / float(
-                    len(neighbors) + len(neighbors_v) - same_community_neighbors
-                )
-                edge_embeddedness[u][v] = tmp_embeddedness
-                if tmp_embeddedness < embeddedness:
-                    embeddedness = tmp_embeddedness
-            com_embeddedness[self.params["nodes"]["com"][u]] = embeddedness
-
-            # neighbors = list(self.graph.neighbors(u))  # neighbors and successors (in DiGraph) produce the same result
-            # same_community_neighbors = [n for n in neighbors if self.params['nodes']['com'][u] == self.params['nodes']['com'][n]]
-
-            # Standard threshold
-            if len(neighbors) > 0:
-
-                for v in neighbors:
-                    if actual_status[v] == 0:
-
-                        if (
-                            self.params["nodes"]["com"][u]
-                            == self.params["nodes"]["com"][v]
-                        ):
-                            threshold = edge_embeddedness[u][v]
-
-                        else:  # across communities
-                            threshold = com_embeddedness[self.params["nodes"]["com"][u]]
-
-                        flip = np.random.random_sample()
-                        if flip <= threshold:
-                            actual_status[v] = 1
+            for v, threshold in self.activation_attempts(u, activation):
+                if actual_status[v] == 0:
+                    flip = np.random.random_sample()
+                    if flip <= threshold:
+                        actual_status[v] = 1
 
             actual_status[u] = 2
 
@@ -127,3 +90,26 @@ class ICEModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def activation_probabilities(self):
+        """
+        Activation probability of each edge: its community embeddedness within communities, the lowest
+        embeddedness among the edges of its source across communities. Computed once per configuration.
+
+        :return: a NumPy array aligned with the outgoing CSR adjacency entries of the graph index
+        """
+        return self.edge_attribute_index().derived(
+            "activation", self.__activation_probabilities
+        )
+
+    def __activation_probabilities(self, attributes):
+        index = attributes.index
+        com = self.node_attribute_index().parameter("com")
+        src, same, embeddedness = index.community_embeddedness(com)
+
+        indptr = index.adjacency().indptr
+        lowest = np.ones(len(index))
+        rows = np.flatnonzero(np.diff(indptr) > 0)
+        if len(rows) > 0:
+            lowest[rows] = np.minimum.reduceat(embeddedness, indptr[rows])
+        return np.where(same, embeddedness, lowest[src])
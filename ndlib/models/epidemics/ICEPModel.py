@@ -52,6 +52,10 @@ class ICEPModel(DiffusionModel):
         :return: Iteration_id, Incremental node status (dictionary node->status)
         """
         self.clean_initial_status(self.available_statuses.values())
+
+        if self.node_index is not None:
+            return self.cascade_iteration(self.activation_probabilities(), node_status)
+
         actual_status = {
             node: nstatus for node, nstatus in future.utils.iteritems(self.status)
         }
@@ -74,63 +78,16 @@ class ICEPModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
-        edge_embeddedness = {}
+        activation = self.activation_probabilities()
         for u in self.graph.nodes:
             if self.status[u] != 1:
                 continue
 
-            edge_embeddedness[u] = {}
-
-            neighbors = list(
-                self.graph.neighbors(u)
-            )  # neighbors and successors (in DiGraph) produce the same result
-
-            # Standard threshold
-            if len(neighbors) > 0:
-                threshold = 1.0 / len(neighbors)
-
-                for v in neighbors:
-                    if actual_status[v] == 0:
-                        key = (u, v)
-
-                        same_community_neighbors = 0
-                        neighbors_v = list(self.graph.neighbors(v))
-                        for neighbor in neighbors_v:
-                            if (
-                                neighbor in neighbors
-                                and self.params["nodes"]["com"][neighbor]
-                                == self.params["nodes"]["com"][u]
-                            ):
-                                same_community_neighbors += 1
-                        edge_embeddedness[u][v] = float(
-                            same_community_neighbors
-                        ) / float(
-                            len(neighbors) + len(neighbors_v) - same_community_neighbors
-                        )
-
-                        if (
-                            self.params["nodes"]["com"][u]
-                            == self.params["nodes"]["com"][v]
-                        ):  # within same community
-                            threshold = edge_embeddedness[u][v]  # Embedness
-
-                        else:  # across communities
-                            p = self.params["model"]["permeability"]
-                            if "threshold" in self.params["edges"]:
-                                if key in self.params["edges"]["threshold"]:
-                                    threshold = (
-                                        self.params["edges"]["threshold"][key] * p
-                                    )
-                                elif (v, u) in self.params["edges"][
-                                    "threshold"
-                                ] and not self.graph.directed:
-                                    threshold = (
-                                        self.params["edges"]["threshold"][(v, u)] * p
-                                    )
-
-                        flip = np.random.random_sample()
-                        if flip <= threshold:
-                            actual_status[v] = 1
+            for v, threshold in self.activation_attempts(u, activation):
+                if actual_status[v] == 0:
+                    flip = np.random.random_sample()
+                    if flip <= threshold:
+                        actual_status[v] = 1
 
             actual_status[u] = 2
 
@@ -152,3 +109,30 @@ class ICEPModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def activation_probabilities(self):
+        """
+        Activation probability of each edge: its community embeddedness within communities, its threshold
+        scaled by the community permeability across communities (the inverse of the out-degree of its source
+        if thresholds are not specified). Computed once per configuration.
+
+        :return: a NumPy array aligned with the outgoing CSR adjacency entries of the graph index
+        """
+        return self.edge_attribute_index().derived(
+            "activation", self.__activation_probabilities
+        )
+
+    def __activation_probabilities(self, attributes):
+        index = attributes.index
+        com = self.node_attribute_index().parameter("com")
+        src, same, embeddedness = index.community_embeddedness(com)
+
+        if "threshold" in self.params["edges"]:
+            across = (
+                attributes.parameter("threshold").astype(float)
+                * self.params["model"]["permeability"]
+            )
+        else:
+            degree = np.diff(index.adjacency().indptr)
+            across = 1.0 / degree[src]
+        return np.where(same, embeddedness, across)
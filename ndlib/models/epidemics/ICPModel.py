@@ -53,6 +53,10 @@ class ICPModel(DiffusionModel):
         :return: Iteration_id, Incremental node status (dictionary node->status)
         """
         self.clean_initial_status(self.available_statuses.values())
+
+        if self.node_index is not None:
+            return self.cascade_iteration(self.activation_probabilities(), node_status)
+
         actual_status = {
             node: nstatus for node, nstatus in future.utils.iteritems(self.status)
         }
@@ -75,54 +79,16 @@ class ICPModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
+        activation = self.activation_probabilities()
         for u in self.graph.nodes:
             if self.status[u] != 1:
                 continue
 
-            neighbors = list(
-                self.graph.neighbors(u)
-            )  # neighbors and successors (in DiGraph) produce the same result
-
-            # Standard threshold
-            if len(neighbors) > 0:
-                threshold = 1.0 / len(neighbors)
-
-                for v in neighbors:
-                    if actual_status[v] == 0:
-                        key = (u, v)
-
-                        if (
-                            self.params["nodes"]["com"][u]
-                            == self.params["nodes"]["com"][v]
-                        ):  # within same community
-                            # Individual specified thresholds
-                            if "threshold" in self.params["edges"]:
-                                if key in self.params["edges"]["threshold"]:
-                                    threshold = self.params["edges"]["threshold"][key]
-                                elif (v, u) in self.params["edges"][
-                                    "threshold"
-                                ] and not self.graph.directed:
-                                    threshold = self.params["edges"]["threshold"][
-                                        (v, u)
-                                    ]
-
-                        else:  # across communities
-                            p = self.params["model"]["permeability"]
-                            if "threshold" in self.params["edges"]:
-                                if key in self.params["edges"]["threshold"]:
-                                    threshold = (
-                                        self.params["edges"]["threshold"][key] * p
-                                    )
-                                elif (v, u) in self.params["edges"][
-                                    "threshold"
-                                ] and not self.graph.directed:
-                                    threshold = (
-                                        self.params["edges"]["threshold"][(v, u)] * p
-                                    )
-
-                        flip = np.random.random_sample()
-                        if flip <= threshold:
-                            actual_status[v] = 1
+            for v, threshold in self.activation_attempts(u, activation):
+                if actual_status[v] == 0:
+                    flip = np.random.random_sample()
+                    if flip <= threshold:
+                        actual_status[v] = 1
 
             actual_status[u] = 2
 
@@ -144,3 +110,27 @@ class ICPModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def activation_probabilities(self):
+        """
+        Activation probability of each edge: its threshold, scaled by the community permeability for the
+        edges across communities, or, if thresholds are not specified, the inverse of the out-degree of its
+        source. Computed once per configuration.
+
+        :return: a NumPy array aligned with the outgoing CSR adjacency entries of the graph index
+        """
+        return self.edge_attribute_index().derived(
+            "activation", self.__activation_probabilities
+        )
+
+    def __activation_probabilities(self, attributes):
+        index = attributes.index
+        if "threshold" not in self.params["edges"]:
+            degree = np.diff(index.adjacency().indptr)
+            return np.repeat(1.0 / np.maximum(degree, 1), degree)
+
+        src, dst, _ = index.neighbor_entries(np.arange(len(index)), incoming=False)
+        com = self.node_attribute_index().parameter("com")
+        threshold = attributes.parameter("threshold").astype(float)
+        threshold[com[src] != com[dst]] *= self.params["model"]["permeability"]
+        return threshold
@@ -12,6 +12,10 @@ class IndependentCascadesModel(DiffusionModel):
     Edge Parameters to be specified via ModelConfig
 
     :param threshold: The edge threshold. As default a value of 0.1 is assumed for all edges.
+
+    Model Parameters to be specified via ModelConfig
+
+    :param frontier: Whether to evaluate, at each iteration, only the newly infected nodes (0/1, default 0)
     """
 
     def __init__(self, graph, seed=None):
@@ -24,7 +28,14 @@ class IndependentCascadesModel(DiffusionModel):
         self.available_statuses = {"Susceptible": 0, "Infected": 1, "Removed": 2}
 
         self.parameters = {
-            "model": {},
+            "model": {
+                "frontier": {
+                    "descr": "Whether to evaluate only the newly infected nodes, tracked across iterations",
+                    "range": [0, 1],
+                    "optional": True,
+                    "default": 0,
+                }
+            },
             "nodes": {},
             "edges": {
                 "threshold": {
@@ -36,6 +47,7 @@ class IndependentCascadesModel(DiffusionModel):
             },
         }
 
+        self.frontier = None
         self.name = "Independent Cascades"
 
     def iteration(self, node_status=True):
@@ -44,7 +56,21 @@ class IndependentCascadesModel(DiffusionModel):
 
         :return: Iteration_id, Incremental node status (dictionary node->status)
         """
+        if self.node_index is not None:
+            # the cascade step only evaluates infected nodes: the frontier is implicit
+            self.clean_initial_status(self.available_statuses.values())
+            return self.cascade_iteration(self.activation_probabilities(), node_status)
+
+        if self.params["model"]["frontier"] and self.actual_iteration > 0:
+            return self.__frontier_iteration(node_status)
+
         self.clean_initial_status(self.available_statuses.values())
+
+        if self.params["model"]["frontier"]:
+            self.frontier = set(
+                n for n, s in future.utils.iteritems(self.status) if s == 1
+            )
+
         actual_status = {
             node: nstatus for node, nstatus in future.utils.iteritems(self.status)
         }
@@ -67,34 +93,16 @@ class IndependentCascadesModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
+        activation = self.activation_probabilities()
         for u in self.graph.nodes:
             if self.status[u] != 1:
                 continue
 
-            neighbors = list(
-                self.graph.neighbors(u)
-            )  # neighbors and successors (in DiGraph) produce the same result
-
-            # Standard threshold
-            if len(neighbors) > 0:
-                threshold = 1.0 / len(neighbors)
-
-                for v in neighbors:
-                    if actual_status[v] == 0:
-                        key = (u, v)
-
-                        # Individual specified thresholds
-                        if "threshold" in self.params["edges"]:
-                            if key in self.params["edges"]["threshold"]:
-                                threshold = self.params["edges"]["threshold"][key]
-                            elif (v, u) in self.params["edges"][
-                                "threshold"
-                            ] and not self.graph.directed:
-                                threshold = self.params["edges"]["threshold"][(v, u)]
-
-                        flip = np.random.random_sample()
-                        if flip <= threshold:
-                            actual_status[v] = 1
+            for v, threshold in self.activation_attempts(u, activation):
+                if actual_status[v] == 0:
+                    flip = np.random.random_sample()
+                    if flip <= threshold:
+                        actual_status[v] = 1
 
             actual_status[u] = 2
 
@@ -116,3 +124,39 @@ class IndependentCascadesModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def __frontier_iteration(self, node_status):
+        """
+        Frontier iteration: only the nodes infected in the previous iteration are evaluated (in graph
+        order), so that the per-step cost scales with the cascade frontier instead of the graph size.
+        """
+        updates = {}
+        activation = self.activation_probabilities()
+        for u in sorted(self.frontier, key=self.node_order().__getitem__):
+            for v, threshold in self.activation_attempts(u, activation):
+                if updates.get(v, self.status[v]) == 0:
+                    flip = np.random.random_sample()
+                    if flip <= threshold:
+                        updates[v] = 1
+
+            updates[u] = 2
+
+        self.frontier = set(v for v, st in future.utils.iteritems(updates) if st == 1)
+        return self.commit_updates(updates, node_status)
+
+    def activation_probabilities(self):
+        """
+        Activation probability of each edge: its threshold or, if thresholds are not specified, the inverse
+        of the out-degree of its source. Computed once per configuration.
+
+        :return: a NumPy array aligned with the outgoing CSR adjacency entries of the graph index
+        """
+        return self.edge_attribute_index().derived(
+            "activation", self.__activation_probabilities
+        )
+
+    def __activation_probabilities(self, attributes):
+        if "threshold" in self.params["edges"]:
+            return attributes.parameter("threshold").astype(float)
+        degree = np.diff(attributes.index.adjacency().indptr)
+        return np.repeat(1.0 / np.maximum(degree, 1), degree)
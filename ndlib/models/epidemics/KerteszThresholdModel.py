@@ -1,6 +1,5 @@
 from ..DiffusionModel import DiffusionModel
 import numpy as np
-from scipy import stats
 import future.utils
 
 __author__ = "Letizia Milli"
@@ -78,9 +77,7 @@ class KerteszThresholdModel(DiffusionModel):
                     # select a random node
                     # print("aa", len(self.graph.nodes()))#, self.graph.number_of_nodes(), np.random.randint(0, self.graph.number_of_nodes()))
                     try:
-                        node = list(self.graph.nodes())[
-                            np.random.randint(0, self.graph.number_of_nodes())
-                        ]
+                        node = self.random_nodes()
 
                         # node not infected
                         if actual_status[node] == 0:
@@ -109,35 +106,22 @@ class KerteszThresholdModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
+        position = self.node_attribute_index().index.position
+        adopters = None
+        if self.params["model"]["adopter_rate"] > 0:
+            # spontaneous adoptions: a single vectorized Bernoulli draw per iteration
+            adopters = (
+                np.random.random_sample(len(position))
+                < self.params["model"]["adopter_rate"]
+            )
+        reached = self.__threshold_reached()
         for node in self.graph.nodes:
             if self.status[node] == 0:
-                if self.params["model"]["adopter_rate"] > 0:
-                    xk = (0, 1)
-                    pk = (
-                        1 - self.params["model"]["adopter_rate"],
-                        self.params["model"]["adopter_rate"],
-                    )
-                    probability = stats.rv_discrete(name="probability", values=(xk, pk))
-                    number_probability = probability.rvs()
-
-                    if number_probability == 1:
-                        actual_status[node] = 1
-                        continue
-
-                neighbors = list(self.graph.neighbors(node))
-                if len(neighbors) == 0:
+                if adopters is not None and adopters[position[node]]:
+                    actual_status[node] = 1
                     continue
 
-                if self.graph.directed:
-                    neighbors = self.graph.predecessors(node)
-
-                infected = 0
-                for v in neighbors:
-                    if self.status[v] != -1:
-                        infected += self.status[v]
-
-                infected_ratio = float(infected) / len(neighbors)
-                if infected_ratio >= self.params["nodes"]["threshold"][node]:
+                if reached[position[node]]:
                     actual_status[node] = 1
 
         delta, node_count, status_delta = self.status_delta(actual_status)
@@ -158,3 +142,26 @@ class KerteszThresholdModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def __threshold_reached(self):
+        """
+        Nodes, having at least a neighbor, whose ratio of infected predecessors (neighbors for undirected
+        graphs) reaches their threshold. Infected neighbors are counted incrementally (see active_neighbors)
+        and compared at once with the threshold array.
+
+        :return: a boolean NumPy array aligned with the graph index
+        """
+        attributes = self.node_attribute_index()
+        index = attributes.index
+        degree = np.diff(index.adjacency(incoming=True).indptr)
+        infected_ratio = np.divide(
+            self.active_neighbors(1),
+            degree,
+            out=np.zeros(len(degree)),
+            where=degree > 0,
+        )
+        return (
+            (np.diff(index.adjacency().indptr) > 0)
+            & (degree > 0)
+            & (infected_ratio >= attributes.numeric("threshold", parameter=True))
+        )
@@ -1,7 +1,6 @@
 from ..DiffusionModel import DiffusionModel
 import numpy as np
 import future.utils
-from scipy import stats
 
 __author__ = "Giulio Rossetti"
 __license__ = "BSD-2-Clause"
@@ -81,40 +80,34 @@ class ProfileModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
+        # nodes whose infected neighbors (predecessors for directed graphs), net of the blocked ones, are
+        # positive: counted incrementally (see active_neighbors)
+        reached = (self.active_neighbors(1) - self.active_neighbors(-1)) > 0
+        # spontaneous adoptions, profile and blocking coins: vectorized draws over the nodes, once per iteration
+        attributes = self.node_attribute_index()
+        position = attributes.index.position
+        n = len(position)
+        adopters = np.random.random_sample(n) < self.params["model"]["adopter_rate"]
+        adopt = reached & (
+            np.random.random_sample(n) >= attributes.numeric("profile", parameter=True)
+        )
+        block = np.zeros(n, dtype=bool)
+        if self.params["model"]["blocked"] != 0:
+            block = (
+                reached
+                & ~adopt
+                & (np.random.random_sample(n) > self.params["model"]["blocked"])
+            )
+
         for u in self.graph.nodes:
             if actual_status[u] != 0:
                 continue
 
-            if self.params["model"]["adopter_rate"] > 0:
-                xk = (0, 1)
-                pk = (
-                    1 - self.params["model"]["adopter_rate"],
-                    self.params["model"]["adopter_rate"],
-                )
-                probability = stats.rv_discrete(name="probability", values=(xk, pk))
-                number_probability = probability.rvs()
-
-                if number_probability == 1:
-                    actual_status[u] = 1
-                    continue
-
-            neighbors = self.graph.neighbors(u)
-            if self.graph.directed:
-                neighbors = self.graph.predecessors(u)
-
-            infected = 0
-            for v in neighbors:
-                infected += self.status[v]
-
-            if infected > 0 and actual_status[u] == 0:
-                eventp = np.random.random_sample()
-                if eventp >= self.params["nodes"]["profile"][u]:
-                    actual_status[u] = 1
-                else:
-                    if self.params["model"]["blocked"] != 0:
-                        blip = np.random.random_sample()
-                        if blip > self.params["model"]["blocked"]:
-                            actual_status[u] = -1
+            i = position[u]
+            if adopters[i] or adopt[i]:
+                actual_status[u] = 1
+            elif block[i]:
+                actual_status[u] = -1
 
         delta, node_count, status_delta = self.status_delta(actual_status)
         self.status = actual_status
@@ -1,7 +1,6 @@
 from ..DiffusionModel import DiffusionModel
 import numpy as np
 import future.utils
-from scipy import stats
 
 __author__ = "Giulio Rossetti"
 __license__ = "BSD-2-Clause"
@@ -88,43 +87,32 @@ class ProfileThresholdModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
+        reached = self.__threshold_reached()
+        # spontaneous adoptions, profile and blocking coins: vectorized draws over the nodes, once per iteration
+        attributes = self.node_attribute_index()
+        position = attributes.index.position
+        n = len(position)
+        adopters = np.random.random_sample(n) < self.params["model"]["adopter_rate"]
+        adopt = reached & (
+            np.random.random_sample(n) >= attributes.numeric("profile", parameter=True)
+        )
+        block = np.zeros(n, dtype=bool)
+        if self.params["model"]["blocked"] != 0:
+            block = (
+                reached
+                & ~adopt
+                & (np.random.random_sample(n) > self.params["model"]["blocked"])
+            )
+
         for u in self.graph.nodes:
             if actual_status[u] != 0:
                 continue
 
-            if self.params["model"]["adopter_rate"] > 0:
-                xk = (0, 1)
-                pk = (
-                    1 - self.params["model"]["adopter_rate"],
-                    self.params["model"]["adopter_rate"],
-                )
-                probability = stats.rv_discrete(name="probability", values=(xk, pk))
-                number_probability = probability.rvs()
-
-                if number_probability == 1:
-                    actual_status[u] = 1
-                    continue
-
-            neighbors = list(self.graph.neighbors(u))
-            if self.graph.directed:
-                neighbors = list(self.graph.predecessors(u))
-
-            infected = 0
-            for v in neighbors:
-                infected += self.status[v]
-
-            if infected > 0 and actual_status[u] == 0:
-
-                infected_ratio = float(infected) / len(neighbors)
-                if infected_ratio >= self.params["nodes"]["threshold"][u]:
-                    eventp = np.random.random_sample()
-                    if eventp >= self.params["nodes"]["profile"][u]:
-                        actual_status[u] = 1
-                    else:
-                        if self.params["model"]["blocked"] != 0:
-                            blip = np.random.random_sample()
-                            if blip > self.params["model"]["blocked"]:
-                                actual_status[u] = -1
+            i = position[u]
+            if adopters[i] or adopt[i]:
+                actual_status[u] = 1
+            elif block[i]:
+                actual_status[u] = -1
 
         delta, node_count, status_delta = self.status_delta(actual_status)
         self.status = actual_status
@@ -144,3 +132,21 @@ class ProfileThresholdModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def __threshold_reached(self):
+        """
+        Nodes whose ratio of infected neighbors (predecessors for directed graphs) is positive and reaches
+        their threshold; blocked neighbors count as -1. Neighbors are counted incrementally (see
+        active_neighbors) and compared at once with the threshold array.
+
+        :return: a boolean NumPy array aligned with the graph index
+        """
+        attributes = self.node_attribute_index()
+        degree = np.diff(attributes.index.adjacency(incoming=True).indptr)
+        infected = self.active_neighbors(1) - self.active_neighbors(-1)
+        infected_ratio = np.divide(
+            infected, degree, out=np.zeros(len(degree)), where=degree > 0
+        )
+        return (infected > 0) & (
+            infected_ratio >= attributes.numeric("threshold", parameter=True)
+        )
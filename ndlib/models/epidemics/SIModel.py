@@ -51,6 +51,9 @@ class SIModel(DiffusionModel):
         """
         self.clean_initial_status(self.available_statuses.values())
 
+        if self.node_index is not None:
+            return self.__vectorized_iteration(node_status)
+
         actual_status = {
             node: nstatus for node, nstatus in future.utils.iteritems(self.status)
         }
@@ -73,6 +76,7 @@ class SIModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
+        changed = set()
         for u in self.graph.nodes:
             u_status = self.status[u]
             eventp = np.random.random_sample()
@@ -89,11 +93,13 @@ class SIModel(DiffusionModel):
                         infected_neighbors
                     ):
                         actual_status[u] = 1
+                        changed.add(u)
                 else:
                     if eventp < self.params["model"]["beta"] * triggered:
                         actual_status[u] = 1
+                        changed.add(u)
 
-        delta, node_count, status_delta = self.status_delta(actual_status)
+        delta, node_count, status_delta = self.status_delta(actual_status, changed)
         self.status = actual_status
         self.actual_iteration += 1
 
@@ -111,3 +117,30 @@ class SIModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def __vectorized_iteration(self, node_status):
+        """
+        Array backend iteration: the transitions of all the nodes are drawn at once from the
+        neighborhood infected counts (same per-node probabilities of the node-level loop).
+        """
+        actual_status = self.status_array.copy()
+        changed = None
+
+        if self.actual_iteration > 0:
+            infected_neighbors = self.neighbors_in_status(1)
+            eventp = np.random.random_sample(len(actual_status))
+
+            if self.params["model"]["tp_rate"] == 1:
+                p_infection = 1 - np.power(
+                    1 - self.params["model"]["beta"], infected_neighbors
+                )
+            else:
+                p_infection = self.params["model"]["beta"] * (infected_neighbors > 0)
+
+            susceptible = self.status_array == 0
+            infection = susceptible & (eventp < p_infection)
+            actual_status[infection] = 1
+
+            changed = np.flatnonzero(infection)
+
+        return self.commit_iteration(actual_status, node_status, changed)
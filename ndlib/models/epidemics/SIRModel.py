@@ -13,6 +13,7 @@ class SIRModel(DiffusionModel):
 
     :param beta: The infection rate (float value in [0,1])
     :param gamma: The recovery rate (float value in [0,1])
+    :param frontier: Whether to evaluate, at each iteration, only the infected nodes (0/1, default 0)
     """
 
     def __init__(self, graph, seed=None):
@@ -34,12 +35,19 @@ class SIRModel(DiffusionModel):
                     "optional": True,
                     "default": 1,
                 },
+                "frontier": {
+                    "descr": "Whether to evaluate only the infected nodes, tracked across iterations",
+                    "range": [0, 1],
+                    "optional": True,
+                    "default": 0,
+                },
             },
             "nodes": {},
             "edges": {},
         }
 
         self.active = []
+        self.frontier = None
         self.name = "SIR"
 
     def iteration(self, node_status=True):
@@ -48,8 +56,22 @@ class SIRModel(DiffusionModel):
 
         :return: Iteration_id, Incremental node status (dictionary node->status)
         """
+        if self.params["model"]["frontier"] and self.actual_iteration > 0:
+            return self.__frontier_iteration(node_status)
+
         self.clean_initial_status(self.available_statuses.values())
 
+        if self.params["model"]["frontier"]:
+            if self.node_index is not None:
+                self.frontier = np.flatnonzero(self.status_array == 1)
+            else:
+                self.frontier = set(
+                    n for n, s in future.utils.iteritems(self.status) if s == 1
+                )
+
+        if self.node_index is not None:
+            return self.__vectorized_iteration(node_status)
+
         actual_status = {
             node: nstatus for node, nstatus in future.utils.iteritems(self.status)
         }
@@ -77,6 +99,7 @@ class SIRModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
+        changed = set()
         for u in self.active:
 
             u_status = self.status[u]
@@ -95,12 +118,14 @@ class SIRModel(DiffusionModel):
                     eventp = np.random.random_sample()
                     if eventp < self.params["model"]["beta"]:
                         actual_status[v] = 1
+                        changed.add(v)
 
                 eventp = np.random.random_sample()
                 if eventp < self.params["model"]["gamma"]:
                     actual_status[u] = 2
+                    changed.add(u)
 
-        delta, node_count, status_delta = self.status_delta(actual_status)
+        delta, node_count, status_delta = self.status_delta(actual_status, changed)
         self.status = actual_status
         self.actual_iteration += 1
 
@@ -118,3 +143,113 @@ class SIRModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def __vectorized_iteration(self, node_status):
+        """
+        Array backend iteration: a susceptible node with k infected predecessors gets infected with
+        probability 1-(1-beta)^k, as for k independent per-edge trials of the node-level loop.
+        """
+        actual_status = self.status_array.copy()
+        changed = None
+
+        if self.actual_iteration > 0:
+            infected_neighbors = self.neighbors_in_status(1)
+            eventp = np.random.random_sample(len(actual_status))
+
+            susceptible = self.status_array == 0
+            p_infection = 1 - np.power(
+                1 - self.params["model"]["beta"], infected_neighbors
+            )
+            infection = susceptible & (eventp < p_infection)
+            actual_status[infection] = 1
+
+            infected = self.status_array == 1
+            recovery = infected & (eventp < self.params["model"]["gamma"])
+            actual_status[recovery] = 2
+
+            changed = np.flatnonzero(infection | recovery)
+
+        return self.commit_iteration(actual_status, node_status, changed)
+
+    def ensemble_iteration(self, statuses):
+        """
+        Advance a batch of independent executions by one iteration (array backend kernel applied row-wise)
+
+        :param statuses: a NumPy matrix (executions x nodes) of node statuses aligned with node_index,
+                         updated in place
+        """
+        infected = statuses == 1
+        infected_neighbors = np.ascontiguousarray(
+            self.node_index.adjacency(incoming=True).dot(infected.T.astype(np.int32)).T
+        )
+
+        # only the infected nodes and the susceptible ones with infected neighbors can change status
+        exposed = np.flatnonzero((statuses == 0) & (infected_neighbors > 0))
+        infected = np.flatnonzero(infected)
+        eventp = np.random.random_sample(len(exposed) + len(infected))
+
+        p_infection = 1 - np.power(
+            1 - self.params["model"]["beta"],
+            np.arange(infected_neighbors.max(initial=0) + 1),
+        )
+        infection = exposed[
+            eventp[: len(exposed)] < p_infection[infected_neighbors.ravel()[exposed]]
+        ]
+        recovery = infected[eventp[len(exposed) :] < self.params["model"]["gamma"]]
+
+        statuses.flat[infection] = 1
+        statuses.flat[recovery] = 2
+
+    def __frontier_iteration(self, node_status):
+        """
+        Frontier iteration: only the infected nodes, tracked across iterations, are evaluated (in graph
+        order), so that the per-step cost scales with the epidemic frontier instead of the graph size.
+        """
+        if self.node_index is not None:
+            return self.__vectorized_frontier_iteration(node_status)
+
+        updates = {}
+        for u in sorted(self.frontier, key=self.node_order().__getitem__):
+            if self.graph.directed:
+                neighbors = self.graph.successors(u)
+            else:
+                neighbors = self.graph.neighbors(u)
+
+            for v in neighbors:
+                if self.status[v] == 0:
+                    eventp = np.random.random_sample()
+                    if eventp < self.params["model"]["beta"]:
+                        updates[v] = 1
+
+            eventp = np.random.random_sample()
+            if eventp < self.params["model"]["gamma"]:
+                updates[u] = 2
+
+        for v, st in future.utils.iteritems(updates):
+            if st == 1:
+                self.frontier.add(v)
+            else:
+                self.frontier.discard(v)
+
+        return self.commit_updates(updates, node_status)
+
+    def __vectorized_frontier_iteration(self, node_status):
+        infected = self.frontier
+        targets = self.node_index.adjacency()[infected].indices
+        targets = targets[self.status_array[targets] == 0]
+        candidates, infected_neighbors = np.unique(targets, return_counts=True)
+
+        eventp = np.random.random_sample(len(candidates))
+        p_infection = 1 - np.power(1 - self.params["model"]["beta"], infected_neighbors)
+        infection = candidates[eventp < p_infection]
+
+        eventp = np.random.random_sample(len(infected))
+        recovery = infected[eventp < self.params["model"]["gamma"]]
+
+        actual_status = self.status_array.copy()
+        actual_status[infection] = 1
+        actual_status[recovery] = 2
+        self.frontier = np.union1d(np.setdiff1d(infected, recovery), infection)
+
+        changed = np.concatenate([infection, recovery])
+        return self.commit_iteration(actual_status, node_status, changed)
@@ -53,6 +53,9 @@ class SISModel(DiffusionModel):
         """
         self.clean_initial_status(self.available_statuses.values())
 
+        if self.node_index is not None:
+            return self.__vectorized_iteration(node_status)
+
         actual_status = {
             node: nstatus for node, nstatus in future.utils.iteritems(self.status)
         }
@@ -75,6 +78,7 @@ class SISModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
+        changed = set()
         for u in self.graph.nodes:
 
             u_status = self.status[u]
@@ -92,15 +96,18 @@ class SISModel(DiffusionModel):
                         infected_neighbors
                     ):
                         actual_status[u] = 1
+                        changed.add(u)
                 else:
                     if eventp < self.params["model"]["beta"] * triggered:
                         actual_status[u] = 1
+                        changed.add(u)
 
             elif u_status == 1:
                 if eventp < self.params["model"]["lambda"]:
                     actual_status[u] = 0
+                    changed.add(u)
 
-        delta, node_count, status_delta = self.status_delta(actual_status)
+        delta, node_count, status_delta = self.status_delta(actual_status, changed)
         self.status = actual_status
         self.actual_iteration += 1
 
@@ -118,3 +125,34 @@ class SISModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def __vectorized_iteration(self, node_status):
+        """
+        Array backend iteration: the transitions of all the nodes are drawn at once from the
+        neighborhood infected counts (same per-node probabilities of the node-level loop).
+        """
+        actual_status = self.status_array.copy()
+        changed = None
+
+        if self.actual_iteration > 0:
+            infected_neighbors = self.neighbors_in_status(1)
+            eventp = np.random.random_sample(len(actual_status))
+
+            if self.params["model"]["tp_rate"] == 1:
+                p_infection = 1 - np.power(
+                    1 - self.params["model"]["beta"], infected_neighbors
+                )
+            else:
+                p_infection = self.params["model"]["beta"] * (infected_neighbors > 0)
+
+            susceptible = self.status_array == 0
+            infection = susceptible & (eventp < p_infection)
+            actual_status[infection] = 1
+
+            infected = self.status_array == 1
+            recovery = infected & (eventp < self.params["model"]["lambda"])
+            actual_status[recovery] = 0
+
+            changed = np.flatnonzero(infection | recovery)
+
+        return self.commit_iteration(actual_status, node_status, changed)
@@ -1,4 +1,5 @@
 from ..DiffusionModel import DiffusionModel
+import numpy as np
 import future.utils
 
 __author__ = "Giulio Rossetti"
@@ -11,6 +12,11 @@ class ThresholdModel(DiffusionModel):
      Node Parameters to be specified via ModelConfig
 
     :param threshold: The node threshold. If not specified otherwise a value of 0.1 is assumed for all nodes.
+
+    Model Parameters to be specified via ModelConfig
+
+    :param frontier: Whether to evaluate, at each iteration, only the nodes whose neighborhood changed (0/1, default 0).
+                     Supported by both status backends.
     """
 
     def __init__(self, graph, seed=None):
@@ -23,7 +29,14 @@ class ThresholdModel(DiffusionModel):
         self.available_statuses = {"Susceptible": 0, "Infected": 1}
 
         self.parameters = {
-            "model": {},
+            "model": {
+                "frontier": {
+                    "descr": "Whether to evaluate only the nodes whose neighborhood changed in the previous iteration",
+                    "range": [0, 1],
+                    "optional": True,
+                    "default": 0,
+                }
+            },
             "nodes": {
                 "threshold": {
                     "descr": "Node threshold",
@@ -35,6 +48,7 @@ class ThresholdModel(DiffusionModel):
             "edges": {},
         }
 
+        self.frontier = None
         self.name = "Threshold"
 
     def iteration(self, node_status=True):
@@ -43,8 +57,20 @@ class ThresholdModel(DiffusionModel):
 
         :return: Iteration_id, Incremental node status (dictionary node->status)
         """
+        if (
+            self.params["model"]["frontier"]
+            and self.actual_iteration > 1
+            and self.frontier is not None
+        ):
+            if self.node_index is not None:
+                return self.__vectorized_frontier_iteration(node_status)
+            return self.__frontier_iteration(node_status)
+
         self.clean_initial_status(self.available_statuses.values())
 
+        if self.node_index is not None:
+            return self.__vectorized_iteration(node_status)
+
         actual_status = {
             node: nstatus for node, nstatus in future.utils.iteritems(self.status)
         }
@@ -67,27 +93,17 @@ class ThresholdModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
-        for u in self.graph.nodes:
-            if actual_status[u] == 1:
-                continue
-
-            neighbors = list(self.graph.neighbors(u))
-            if self.graph.directed:
-                neighbors = list(self.graph.predecessors(u))
-
-            infected = 0
-            for v in neighbors:
-                infected += self.status[v]
-
-            if len(neighbors) > 0:
-                infected_ratio = float(infected) / len(neighbors)
-                if infected_ratio >= self.params["nodes"]["threshold"][u]:
-                    actual_status[u] = 1
+        nodes = self.node_attribute_index().index.nodes
+        for i in np.flatnonzero(self.__threshold_reached()):
+            actual_status[nodes[i]] = 1
 
         delta, node_count, status_delta = self.status_delta(actual_status)
         self.status = actual_status
         self.actual_iteration += 1
 
+        if self.params["model"]["frontier"]:
+            self.frontier = self.__neighborhood_changes(delta)
+
         if node_status:
             return {
                 "iteration": self.actual_iteration - 1,
@@ -102,3 +118,104 @@ class ThresholdModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def __vectorized_iteration(self, node_status):
+        """
+        Array backend iteration: the susceptible nodes whose threshold is reached get infected
+        """
+        self.frontier = None
+        actual_status = self.status_array.copy()
+        changed = None
+
+        if self.actual_iteration > 0:
+            changed = np.flatnonzero(
+                self.__threshold_reached() & (self.status_array != 1)
+            )
+            actual_status[changed] = 1
+            if self.params["model"]["frontier"]:
+                self.frontier = self.__successors(changed)
+
+        return self.commit_iteration(actual_status, node_status, changed)
+
+    def __vectorized_frontier_iteration(self, node_status):
+        """
+        Array backend frontier iteration: only the susceptible nodes having a neighbor activated in the
+        previous iteration (an array of node positions) are evaluated
+        """
+        candidates = self.frontier[self.status_array[self.frontier] != 1]
+        changed = candidates[self.__threshold_reached(candidates)]
+
+        actual_status = self.status_array.copy()
+        actual_status[changed] = 1
+        self.frontier = self.__successors(changed)
+
+        return self.commit_iteration(actual_status, node_status, changed)
+
+    def __successors(self, nodes):
+        """
+        Positions of the successors (neighbors for undirected graphs) of a batch of nodes
+        """
+        return np.unique(self.node_index.adjacency()[nodes].indices)
+
+    def __threshold_reached(self, nodes=None):
+        """
+        Nodes whose ratio of infected neighbors (predecessors for directed graphs) reaches their threshold.
+        Infected neighbors are counted incrementally (see active_neighbors) and compared at once with the
+        threshold array.
+
+        :param nodes: (optional) NumPy array of node positions to evaluate (requires the array backend): their
+                      infected neighbors are counted on their adjacency rows only
+        :return: a boolean NumPy array aligned with the graph index (with nodes, if provided)
+        """
+        attributes = self.node_attribute_index()
+        adjacency = attributes.index.adjacency(incoming=True)
+        degree = np.diff(adjacency.indptr)
+        threshold = attributes.numeric("threshold", parameter=True)
+        if nodes is None:
+            infected = self.active_neighbors(1)
+        else:
+            degree, threshold = degree[nodes], threshold[nodes]
+            infected = adjacency[nodes].dot((self.status_array == 1).astype(np.int64))
+
+        infected_ratio = np.divide(
+            infected,
+            degree,
+            out=np.zeros(len(degree)),
+            where=degree > 0,
+        )
+        return (degree > 0) & (infected_ratio >= threshold)
+
+    def __neighborhood_changes(self, delta):
+        """
+        Nodes whose (in-)neighborhood contains a node that changed status
+        """
+        frontier = set()
+        for v in delta:
+            frontier.update(self.graph.neighbors(v))
+        return frontier
+
+    def __frontier_iteration(self, node_status):
+        """
+        Frontier iteration: only the nodes having a neighbor activated in the previous iteration are
+        evaluated, so that the per-step cost scales with the activation frontier instead of the graph size.
+        """
+        updates = {}
+        for u in self.frontier:
+            if self.status[u] == 1:
+                continue
+
+            neighbors = list(self.graph.neighbors(u))
+            if self.graph.directed:
+                neighbors = list(self.graph.predecessors(u))
+
+            infected = 0
+            for v in neighbors:
+                infected += self.status[v]
+
+            if len(neighbors) > 0:
+                infected_ratio = float(infected) / len(neighbors)
+                if infected_ratio >= self.params["nodes"]["threshold"][u]:
+                    updates[u] = 1
+
+        self.frontier = self.__neighborhood_changes(updates)
+        return self.commit_updates(updates, node_status)
@@ -7,6 +7,9 @@ __license__ = "BSD-2-Clause"
 
 
 class UTLDRModel(DiffusionModel):
+    # per-node values of the stratified parameters (see __segment_thresholds)
+    __thresholds = None
+
     def __init__(self, graph, seed=None):
 
         super(self.__class__, self).__init__(graph, seed)
@@ -732,8 +735,35 @@ class UTLDRModel(DiffusionModel):
     def __get_threshold(self, u, parameter):
         # stratified population scenario
         if isinstance(self.params["model"][parameter], dict):
-            n_class = self.params["nodes"]["segment"][u]
-            return self.params["model"][parameter][n_class]
+            attributes = self.node_attribute_index()
+            thresholds = self.__segment_thresholds(parameter, attributes)
+            return thresholds[attributes.index.position[u]]
         # base scenario, single value
         else:
             return self.params["model"][parameter]
+
+    def __segment_thresholds(self, parameter, attributes):
+        """
+        Values of a stratified parameter for all the nodes, computed once from the segment column
+
+        :param parameter: the model parameter (dictionary segment->value)
+        :param attributes: the node attribute index of the model
+        :return: a NumPy array aligned with the index
+        """
+        if self.__thresholds is None or self.__thresholds[0] is not attributes:
+            self.__thresholds = (attributes, {})
+        thresholds = self.__thresholds[1]
+
+        if parameter not in thresholds:
+            values = self.params["model"][parameter]
+            segments = attributes.parameter("segment")
+            categories = attributes.categories("segment", parameter=True)
+            if categories is None:
+                thresholds[parameter] = np.array(
+                    [values[c] for c in segments.tolist()], dtype=float
+                )
+            else:
+                thresholds[parameter] = np.array(
+                    [values[c] for c in categories], dtype=float
+                )[segments]
+        return thresholds[parameter]
@@ -309,27 +309,20 @@ class ARWHKModel(DiffusionModel):
             - else
                 repulsion: different cases according to the sign of the agents' opinions
         """
-        for _ in range(0, self.graph.number_of_nodes()):
-
-            # select a random node
-            n1 = list(self.graph.nodes)[
-                np.random.randint(0, self.graph.number_of_nodes())
-            ]
+        # the random nodes of the whole sweep are drawn at once
+        for n1 in self.random_nodes(self.graph.number_of_nodes()):
 
             # if n1 isn't stubborn
             if self.params["nodes"]["stubborn"][n1] == 0:
 
-                # select neighbors of n1
-                neighbours = list(self.graph.neighbors(n1))
                 sum_op = 0
                 new_op = 0
 
-                if len(neighbours) == 0:
+                # select a neigh of n1 for peer interaction
+                neigh = self.random_neighbors(n1)
+                if neigh is None:
                     continue
 
-                # select a neigh for peer interaction
-                neigh = random.choice(neighbours)
-
                 jaccard_sim = 0
                 if self.params["model"]["similarity"] == 1:
                     # compute similarity between n1 and neigh using jaccard score
@@ -1,4 +1,5 @@
 from ndlib.models.DiffusionModel import DiffusionModel
+from ndlib.models.DistanceBiasedSampler import DistanceBiasedSampler
 import numpy as np
 from random import choice
 import future.utils
@@ -59,6 +60,7 @@ class AlgorithmicBiasModel(DiffusionModel):
         self.node_data = {}
         self.ids = None
         self.sts = None
+        self.sampler = None
 
     def set_initial_status(self, configuration=None):
         """
@@ -133,6 +135,13 @@ class AlgorithmicBiasModel(DiffusionModel):
         actual_status = self.status.copy()
 
         if self.actual_iteration == 0:
+            # on complete graphs partners are drawn by a sampler kept sorted by opinion
+            if len(self.node_data) == 0:
+                self.sts = np.array([actual_status[int(i)] for i in self.ids])
+                self.sampler = DistanceBiasedSampler(
+                    self.sts, self.params["model"]["gamma"]
+                )
+
             self.actual_iteration += 1
             delta, node_count, status_delta = self.status_delta(self.status)
             if node_status:
@@ -160,38 +169,28 @@ class AlgorithmicBiasModel(DiffusionModel):
             n1 = int(choice(self.ids))
 
             if len(self.node_data) == 0:
-                sts = self.sts
-                ids = self.ids
-                # toglie se stesso dalla lista degli id e degli status perché mi sembra rimanesse
-                # e quindi con gamma alto a volte sceglieva se stesso per interagire
-                neigh_sts = np.delete(sts, n1)
-                neigh_ids = np.delete(ids, n1)
+                # same selection law of pb1, drawn in O(log N) among all the other agents
+                n2 = int(self.ids[self.sampler.sample(n1)])
             else:
                 neigh_ids = self.node_data[n1][0]
                 neigh_sts = np.array([actual_status[id] for id in neigh_ids])
 
-            # ho cambiato come crea l'array degli stati
-            # niegh_sts = self.node_data[n1][1]
-
-            # uso neigh_sts e actual_status[n1] come argomenti della funzione
-            # perché altrimenti self.status[n1] è quello che viene dalla precedente
-            # iterazione ma non viene aggiornato in corso di interazioni all'interno di questo for
-            # e potrebbe essere cambiato in precedenza
-            # e nel codice vecchio su usava invece lo stato sempre aggiornato
-
-            # selection_prob = self.pb1(sts, self.status[n1])
-            selection_prob = self.pb1(neigh_sts, actual_status[n1])
+                # uso neigh_sts e actual_status[n1] come argomenti della funzione
+                # perché altrimenti self.status[n1] è quello che viene dalla precedente
+                # iterazione ma non viene aggiornato in corso di interazioni all'interno di questo for
+                # e potrebbe essere cambiato in precedenza
+                # e nel codice vecchio su usava invece lo stato sempre aggiornato
+                selection_prob = self.pb1(neigh_sts, actual_status[n1])
 
-            # compute probabilities to select a second node among the neighbours
-            total = np.sum(selection_prob)
-            selection_prob = selection_prob / total
-            cumulative_selection_probability = np.cumsum(selection_prob)
+                # compute probabilities to select a second node among the neighbours
+                total = np.sum(selection_prob)
+                selection_prob = selection_prob / total
+                cumulative_selection_probability = np.cumsum(selection_prob)
 
-            r = np.random.random_sample()
-            # n2 = np.argmax(cumulative_selection_probability >= r) -1
-            n2 = np.argmax(cumulative_selection_probability >= r)
-            # seleziono n2 dagli id dei neighbors di n1
-            n2 = int(neigh_ids[n2])
+                r = np.random.random_sample()
+                n2 = np.argmax(cumulative_selection_probability >= r)
+                # seleziono n2 dagli id dei neighbors di n1
+                n2 = int(neigh_ids[n2])
 
             # update status of n1 and n2
             diff = np.abs(actual_status[n1] - actual_status[n2])
@@ -205,6 +204,8 @@ class AlgorithmicBiasModel(DiffusionModel):
                 if len(self.node_data) == 0:
                     self.sts[n1] = avg
                     self.sts[n2] = avg
+                    self.sampler.update(n1, avg)
+                    self.sampler.update(n2, avg)
 
         # delta, node_count, status_delta = self.status_delta(actual_status)
         delta = actual_status
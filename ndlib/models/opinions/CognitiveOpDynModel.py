@@ -202,20 +202,13 @@ class CognitiveOpDynModel(DiffusionModel):
                 actual_status[node] *= 0.5
 
         # then interact with peers
-        for i in range(0, self.graph.number_of_nodes()):
-            # select a random node
-            n1 = list(self.graph.nodes)[
-                np.random.randint(0, self.graph.number_of_nodes())
-            ]
-
-            # select all of the nodes neighbours (no digraph possible)
-            neighbours = list(self.graph.neighbors(n1))
-            if len(neighbours) == 0:
+        # the random nodes of the whole sweep are drawn at once
+        for n1 in self.random_nodes(self.graph.number_of_nodes()):
+            # select second node - a random neighbour (no digraph possible)
+            n2 = self.random_neighbors(n1)
+            if n2 is None:
                 continue
 
-            # select second node - a random neighbour
-            n2 = neighbours[np.random.randint(0, len(neighbours))]
-
             # update status of n1 and n2
             p1 = pow(actual_status[n1], 1.0 / self.params["nodes"]["cognitive"][n1][1])
             p2 = pow(actual_status[n2], 1.0 / self.params["nodes"]["cognitive"][n2][1])
@@ -1,6 +1,7 @@
 from ndlib.models.DiffusionModel import DiffusionModel
 import future.utils
 import numpy as np
+import scipy.sparse as sp
 import random
 from sklearn.metrics import jaccard_score
 
@@ -12,6 +13,7 @@ class HKModel(DiffusionModel):
     """
     Model Parameters to be specified via ModelConfig
     :param epsilon: bounded confidence threshold from the HK model (float in [0,1])
+    :param synchronous: whether to update all the nodes at once, from the opinions of the previous iteration ( in {0,1}, default 0)
     """
 
     def __init__(self, graph):
@@ -30,7 +32,13 @@ class HKModel(DiffusionModel):
                     "descr": "Bounded confidence threshold",
                     "range": [0, 1],
                     "optional": False,
-                }
+                },
+                "synchronous": {
+                    "descr": "Whether to update all the nodes at once",
+                    "range": [0, 1],
+                    "optional": True,
+                    "default": 0,
+                },
             },
             "edges": {},
             "nodes": {},
@@ -87,12 +95,11 @@ class HKModel(DiffusionModel):
                     "status_delta": status_delta.copy(),
                 }
 
-        for i in range(0, self.graph.number_of_nodes()):
-            # select a random node
-            n1 = list(self.graph.nodes)[
-                np.random.randint(0, self.graph.number_of_nodes())
-            ]
+        if self.params["model"]["synchronous"]:
+            return self.__synchronous_iteration(actual_status, node_status)
 
+        # the random nodes of the whole sweep are drawn at once
+        for n1 in self.random_nodes(self.graph.number_of_nodes()):
             # select neighbors of n1
             neighbours = list(self.graph.neighbors(n1))
             sum_op = 0
@@ -134,3 +141,54 @@ class HKModel(DiffusionModel):
                 "node_count": node_count.copy(),
                 "status_delta": status_delta.copy(),
             }
+
+    def __synchronous_iteration(self, actual_status, node_status):
+        """
+        Synchronous model iteration: every node moves to the mean opinion of its neighbors within epsilon,
+        computed for all the nodes at once as a masked sparse matrix-vector product over the CSR adjacency
+
+        :return: Iteration_id, Incremental node status (dictionary code -> status)
+        """
+        edges = self.edge_attribute_index()
+        index, adjacency = edges.index, edges.index.adjacency()
+        rows = edges.derived(
+            "sources",
+            lambda e: np.repeat(np.arange(len(index)), np.diff(adjacency.indptr)),
+        )
+        opinions = index.to_array(actual_status, float)
+
+        # neighbors within epsilon, as the entries of a masked adjacency
+        in_eps = (
+            np.abs(opinions[rows] - opinions[adjacency.indices])
+            < self.params["model"]["epsilon"]
+        )
+        masked = sp.csr_matrix(
+            (in_eps.astype(float), adjacency.indices, adjacency.indptr),
+            shape=adjacency.shape,
+        )
+        sum_op = masked.dot(opinions)
+        count_in_eps = np.bincount(rows[in_eps], minlength=len(index))
+
+        # if there aren't neighbors in epsilon, the status of a node doesn't change
+        new_op = np.where(
+            count_in_eps > 0, sum_op / np.maximum(count_in_eps, 1), opinions
+        )
+        actual_status = dict(zip(index.nodes, new_op.tolist()))
+
+        delta, node_count, status_delta = self.status_delta(actual_status)
+        self.status = actual_status
+        self.actual_iteration += 1
+        if node_status:
+            return {
+                "iteration": self.actual_iteration - 1,
+                "status": delta.copy(),
+                "node_count": node_count.copy(),
+                "status_delta": status_delta.copy(),
+            }
+        else:
+            return {
+                "iteration": self.actual_iteration - 1,
+                "status": {},
+                "node_count": node_count.copy(),
+                "status_delta": status_delta.copy(),
+            }
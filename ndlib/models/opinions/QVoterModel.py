@@ -1,5 +1,4 @@
 from ..DiffusionModel import DiffusionModel
-import numpy as np
 
 __author__ = "Alina Sirbu"
 __email__ = "alina.sirbu@unipi.it"
@@ -67,29 +66,25 @@ class QVoterModel(DiffusionModel):
                 }
 
                 # select a random listener
-        listener = list(self.graph.nodes)[
-            np.random.randint(0, self.graph.number_of_nodes())
-        ]
-
-        # select all of the listener's neighbours
-        neighbours = list(self.graph.neighbors(listener))
-        if self.graph.directed:
-            # consider only the predecessors
-            # assumed if a->b then b can be influenced by a
-            neighbours = list(self.graph.predecessors(listener))
+        listener = self.random_nodes()
 
         # select q random neighbours (with repetitions)
+        # for digraphs consider only the predecessors: assumed if a->b then b can be influenced by a
         influence_group_state = [
-            self.status[neighbours[i]]
-            for i in np.random.randint(0, len(neighbours), self.params["model"]["q"])
+            self.status[n]
+            for n in self.random_neighbors(
+                listener, self.params["model"]["q"], incoming=True
+            )
         ]
 
         delta = {}
         # if all neighbours agree (either on 0 or on 1)
         status_delta = {st: 0 for st in self.available_statuses.values()}
 
-        if sum(influence_group_state) == 0 or sum(influence_group_state) == len(
-            influence_group_state
+        # a listener without neighbours keeps its status
+        if len(influence_group_state) > 0 and (
+            sum(influence_group_state) == 0
+            or sum(influence_group_state) == len(influence_group_state)
         ):
             # update status of listener to either on of the neighbours selected
             delta[listener] = influence_group_state[0]
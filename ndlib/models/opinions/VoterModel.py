@@ -1,5 +1,4 @@
 from ..DiffusionModel import DiffusionModel
-import numpy as np
 
 __author__ = "Alina Sirbu"
 __email__ = "alina.sirbu@unipi.it"
@@ -52,33 +51,31 @@ class VoterModel(DiffusionModel):
                 }
 
         # select a random node
-        listener = list(self.graph.nodes)[
-            np.random.randint(0, self.graph.number_of_nodes())
-        ]
+        listener = self.random_nodes()
 
         # select a random neighbour
-        neighbours = list(self.graph.neighbors(listener))
-        if self.graph.directed:
-            # difficult to have a digraph but assumed if a->b then b can be influenced by a
-            # but not the other way around
-            neighbours = list(self.graph.predecessors(listener))
+        # difficult to have a digraph but assumed if a->b then b can be influenced by a
+        # but not the other way around
+        speaker = self.random_neighbors(listener, incoming=True)
 
-        speaker = neighbours[np.random.randint(0, len(neighbours))]
+        delta = {}
+        status_delta = {st: 0 for st in self.available_statuses.values()}
+        # a listener without neighbours keeps its status
+        if speaker is not None:
+            # update status of listener
+            delta[listener] = self.status[speaker]
+            self.status[listener] = self.status[speaker]
 
-        # update status of listener
-        delta = {listener: self.status[speaker]}
-        self.status[listener] = self.status[speaker]
+            status_delta[self.status[speaker]] += 1
+            for x in self.available_statuses.values():
+                if x != self.status[speaker]:
+                    status_delta[x] -= 1
 
         # fix
         node_count = {
             st: len([n for n in self.status if self.status[n] == st])
             for st in self.available_statuses.values()
         }
-        status_delta = {st: 0 for st in self.available_statuses.values()}
-        status_delta[self.status[speaker]] += 1
-        for x in self.available_statuses.values():
-            if x != self.status[speaker]:
-                status_delta[x] -= 1
 
         self.actual_iteration += 1
 
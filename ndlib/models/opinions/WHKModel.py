@@ -1,6 +1,7 @@
 from ndlib.models.DiffusionModel import DiffusionModel
 import future.utils
 import numpy as np
+import scipy.sparse as sp
 import random
 from sklearn.metrics import jaccard_score
 
@@ -15,6 +16,7 @@ class WHKModel(DiffusionModel):
     :param perc_stubborness: Percentage of stubborn agent (float in [0,1], default 0)
     :param option_for_stubbornness: Define distribution of stubborns (in {-1,0,1}, default 0)
     :param similarity: the method uses the similarity or not  ( in {0,1}, default 0)
+    :param synchronous: whether to update all the nodes at once, from the opinions of the previous iteration ( in {0,1}, default 0)
     :param weight: the weight of edges (float in [0,1])
     :param stubborn: The agent is stubborn or not ( in {0,1}, default 0)
     :param vector: represents the character of the node (list in [0,1], default [])
@@ -55,6 +57,12 @@ class WHKModel(DiffusionModel):
                     "optional": True,
                     "default": 0,
                 },
+                "synchronous": {
+                    "descr": "Whether to update all the nodes at once",
+                    "range": [0, 1],
+                    "optional": True,
+                    "default": 0,
+                },
             },
             "edges": {
                 "weight": {
@@ -239,11 +247,11 @@ class WHKModel(DiffusionModel):
                 sum the weighted opinion of the neighbor to the sum_op
             - compute new_op (updated opinion of n1)
         """
-        for i in range(0, self.graph.number_of_nodes()):
-            # select a random node
-            n1 = list(self.graph.nodes)[
-                np.random.randint(0, self.graph.number_of_nodes())
-            ]
+        if self.params["model"]["synchronous"]:
+            return self.__synchronous_iteration(actual_status, node_status)
+
+        # the random nodes of the whole sweep are drawn at once
+        for n1 in self.random_nodes(self.graph.number_of_nodes()):
 
             # if n1 isn't stubborn
             if self.params["nodes"]["stubborn"][n1] == 0:
@@ -329,3 +337,76 @@ class WHKModel(DiffusionModel):
                 "node_count": len(actual_status),
                 "status_delta": self.status.copy(),
             }
+
+    def __synchronous_iteration(self, actual_status, node_status):
+        """
+        Synchronous model iteration: the weighted opinions of the neighbors within epsilon of every node are
+        averaged at once, as a masked sparse matrix-vector product over the CSR adjacency and its edge weights
+
+        :return: Iteration_id, Incremental node status (dictionary code -> status)
+        """
+        edges = self.edge_attribute_index()
+        index, adjacency = edges.index, edges.index.adjacency()
+        rows = edges.derived(
+            "sources",
+            lambda e: np.repeat(np.arange(len(index)), np.diff(adjacency.indptr)),
+        )
+        opinions = index.to_array(actual_status, float)
+
+        # neighbors within epsilon, weighted by the edge weights (and the similarity of the nodes)
+        in_eps = (
+            np.abs(opinions[rows] - opinions[adjacency.indices])
+            < self.params["model"]["epsilon"]
+        )
+        weights = np.where(in_eps, edges.parameter("weight"), 0.0)
+        if self.params["model"]["similarity"] == 1:
+            weights = weights * edges.derived("jaccard", self.__jaccard)
+        masked = sp.csr_matrix(
+            (weights, adjacency.indices, adjacency.indptr), shape=adjacency.shape
+        )
+        mean_op = masked.dot(opinions)
+        count_in_eps = np.bincount(rows[in_eps], minlength=len(index))
+        mean_op /= np.maximum(count_in_eps, 1)
+
+        new_op = np.where(
+            opinions > 0,
+            opinions + mean_op * (1 - opinions),
+            opinions + mean_op * (1 + opinions),
+        )
+        # stubborn nodes, and nodes without neighbors in epsilon, don't change
+        stubborn = index.to_array(self.params["nodes"]["stubborn"], np.int64)
+        new_op = np.where((count_in_eps > 0) & (stubborn == 0), new_op, opinions)
+        actual_status = dict(zip(index.nodes, new_op.tolist()))
+
+        self.status = actual_status
+        self.actual_iteration += 1
+        if node_status:
+            return {
+                "iteration": self.actual_iteration - 1,
+                "status": self.status.copy(),
+                "node_count": len(actual_status),
+                "status_delta": self.status.copy(),
+            }
+        else:
+            return {
+                "iteration": self.actual_iteration - 1,
+                "status": {},
+                "node_count": len(actual_status),
+                "status_delta": self.status.copy(),
+            }
+
+    def __jaccard(self, edges):
+        """
+        Jaccard similarity of the (binary) vectors of the endpoints of each edge
+
+        :param edges: the EdgeAttributeIndex of the model
+        :return: a NumPy array aligned with the outgoing CSR adjacency entries
+        """
+        index, adjacency = edges.index, edges.index.adjacency()
+        vectors = np.array([self.params["nodes"]["vector"][n] for n in index.nodes])
+        vectors = vectors.astype(bool)
+        rows = np.repeat(np.arange(len(index)), np.diff(adjacency.indptr))
+        source, target = vectors[rows], vectors[adjacency.indices]
+        intersection = np.count_nonzero(source & target, axis=1)
+        union = np.count_nonzero(source | target, axis=1)
+        return np.where(union > 0, intersection / np.maximum(union, 1), 0.0)
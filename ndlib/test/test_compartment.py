@@ -1,11 +1,14 @@
 from __future__ import absolute_import
 
+import itertools
 import unittest
 import networkx as nx
 import numpy as np
 import ndlib.models.ModelConfig as mc
 import ndlib.models.CompositeModel as gc
 import ndlib.models.compartments as cpm
+from ndlib.models.compartments.Compartment import Compartiment
+from ndlib.models.NeighborCounts import NeighborCounts
 from ndlib.models.compartments.enums.NumericalType import NumericalType
 
 __author__ = "Giulio Rossetti"
@@ -201,7 +204,10 @@ class NdlibCompartmentsTest(unittest.TestCase):
     def test_edge_attribute(self):
 
         g = nx.karate_club_graph()
-        attr = {(u, v): {"even": int((u + v) % 2)} for (u, v) in g.edges()}
+        attr = {
+            (u, v): {"even": (u + v) % 2, "parity": str((u + v) % 2)}
+            for (u, v) in g.edges()
+        }
         nx.set_edge_attributes(g, attr)
 
         model = gc.CompositeModel(g)
@@ -378,3 +384,446 @@ class NdlibCompartmentsTest(unittest.TestCase):
         model.set_initial_status(config)
         iterations = model.iteration_bunch(10)
         self.assertEqual(len(iterations), 10)
+
+    def test_compiled_plan(self):
+        g = nx.erdos_renyi_graph(500, 0.02)
+        thresholds = {n: np.random.random_sample() * 0.5 for n in g.nodes()}
+
+        # deterministic compartments: same trajectories on both backends
+        for rule, directed in [
+            (lambda: cpm.NodeThreshold(0.2, triggering_status="Infected"), False),
+            (lambda: cpm.NodeThreshold(triggering_status="Infected"), True),
+            (lambda: cpm.CountDown(name="time", iterations=3), False),
+        ]:
+            results = []
+            for backend in ["dict", "array"]:
+                graph = g.to_directed() if directed else g.copy()
+                model = gc.CompositeModel(graph)
+                model.add_status("Susceptible")
+                model.add_status("Infected")
+                model.add_rule("Susceptible", "Infected", rule())
+                model.set_backend(backend)
+
+                config = mc.Configuration()
+                config.add_model_initial_configuration("Infected", [1, 2, 3, 4, 5])
+                config.add_node_set_configuration("threshold", thresholds)
+                model.set_initial_status(config)
+                results.append(model.iteration_bunch(10))
+            self.assertEqual(results[0], results[1])
+
+        # first-match rule priority
+        model = gc.CompositeModel(g)
+        model.add_status("Susceptible")
+        model.add_status("Infected")
+        model.add_status("Removed")
+        model.add_rule("Infected", "Removed", cpm.NodeStochastic(1))
+        model.add_rule("Infected", "Susceptible", cpm.NodeStochastic(1))
+        model.set_backend("array")
+
+        config = mc.Configuration()
+        config.add_model_parameter("fraction_infected", 0.1)
+        model.set_initial_status(config)
+        iterations = model.iteration_bunch(2, node_status=False)
+        self.assertEqual(iterations[1]["node_count"][2], 50)
+        self.assertEqual(iterations[1]["node_count"][1], 0)
+
+        # stochastic compartments (composed): same dynamics on both backends
+        infected = []
+        for backend in ["dict", "array"]:
+            finals = []
+            for seed in range(10):
+                np.random.seed(seed)
+                model = gc.CompositeModel(g)
+                model.add_status("Susceptible")
+                model.add_status("Infected")
+                model.add_rule(
+                    "Susceptible",
+                    "Infected",
+                    cpm.NodeStochastic(
+                        0.5, "Infected", composed=cpm.NodeStochastic(0.4)
+                    ),
+                )
+                model.add_rule("Infected", "Susceptible", cpm.NodeStochastic(0.3))
+                model.set_backend(backend)
+
+                config = mc.Configuration()
+                config.add_model_parameter("fraction_infected", 0.1)
+                model.set_initial_status(config)
+                iterations = model.iteration_bunch(20, node_status=False)
+                finals.append(iterations[-1]["node_count"][1])
+            infected.append(np.mean(finals) / 500)
+        self.assertAlmostEqual(infected[0], infected[1], delta=0.1)
+
+    def test_execute_batch(self):
+        class Even(Compartiment):
+            def __init__(self, **kwargs):
+                super(Even, self).__init__(kwargs)
+
+            def execute(self, node, *args, **kwargs):
+                return node % 2 == 0
+
+        for directed in [False, True]:
+            g = nx.erdos_renyi_graph(200, 0.05, directed=directed)
+            nx.set_node_attributes(
+                g, {n: {"age": n % 50, "even": str(n % 2)} for n in g.nodes()}
+            )
+            nx.set_edge_attributes(
+                g,
+                {
+                    (u, v): {"weight": (u * v) % 10, "type": str((u + v) % 2)}
+                    for u, v in g.edges()
+                },
+            )
+
+            model = gc.CompositeModel(g)
+            model.add_status("Susceptible")
+            model.add_status("Infected")
+            model.set_backend("array")
+            config = mc.Configuration()
+            config.add_model_parameter("fraction_infected", 0.3)
+            for e in g.edges():
+                config.add_edge_configuration("threshold", e, 1)
+            model.set_initial_status(config)
+
+            compartments = [
+                lambda: cpm.EdgeStochastic(triggering_status="Infected"),
+                lambda: cpm.NodeCategoricalAttribute("even", "0"),
+                lambda: cpm.NodeNumericalAttribute("age", value=[10, 30], op="IN"),
+                lambda: cpm.NodeNumericalVariable(
+                    "age", var_type=NumericalType.ATTRIBUTE, value=20, op=">="
+                ),
+                lambda: cpm.EdgeCategoricalAttribute("type", "1", "Infected"),
+                lambda: cpm.EdgeNumericalAttribute("weight", value=5, op="<"),
+                lambda: cpm.ConditionalComposition(
+                    cpm.NodeCategoricalAttribute("even", "1"),
+                    cpm.NodeNumericalAttribute("age", value=25, op=">"),
+                    cpm.EdgeNumericalAttribute("weight", value=[2, 6], op="IN"),
+                ),
+                lambda: cpm.NodeNumericalAttribute(
+                    "age", value=10, op=">", composed=Even()
+                ),
+                lambda: Even(),
+            ]
+
+            nodes = np.arange(len(model.node_index))
+            # with and without the arrays of the evaluating model
+            for compartment, evaluating in itertools.product(
+                compartments, [None, model]
+            ):
+                mask = compartment().execute_batch(
+                    nodes,
+                    graph=model.graph,
+                    status=model.status_array,
+                    status_map=model.available_statuses,
+                    params=model.params,
+                    index=model.node_index,
+                    model=evaluating,
+                )
+                expected = compartment()
+                expected = [
+                    bool(
+                        expected.execute(
+                            node=n,
+                            graph=model.graph,
+                            status=model.status,
+                            status_map=model.available_statuses,
+                            params=model.params,
+                            model=evaluating,
+                        )
+                    )
+                    for n in model.node_index.nodes
+                ]
+                self.assertEqual(mask.tolist(), expected)
+
+            # count down: same timers on both backends
+            results = []
+            for backend in ["dict", "array"]:
+                model = gc.CompositeModel(g.copy())
+                model.add_status("Susceptible")
+                model.add_status("Infected")
+                model.add_rule(
+                    "Susceptible",
+                    "Infected",
+                    cpm.CountDown(
+                        "time",
+                        iterations=3,
+                        composed=cpm.NodeCategoricalAttribute("even", "0"),
+                    ),
+                )
+                model.set_backend(backend)
+                config = mc.Configuration()
+                config.add_model_initial_configuration("Infected", [1, 2, 3])
+                model.set_initial_status(config)
+                results.append(model.iteration_bunch(6))
+            self.assertEqual(results[0], results[1])
+
+    def test_neighbor_counts(self):
+        g = nx.erdos_renyi_graph(300, 0.03)
+        model = gc.CompositeModel(g)
+        model.add_status("Susceptible")
+        model.add_status("Infected")
+        model.add_status("Removed")
+        model.set_backend("array")
+        config = mc.Configuration()
+        config.add_model_parameter("fraction_infected", 0.2)
+        model.set_initial_status(config)
+
+        counts = NeighborCounts(model.node_index, model.status_array)
+        self.assertIs(counts.count(1), counts.count(1))
+        for n in [0, 10, 100]:
+            self.assertEqual(
+                counts.count(1)[model.node_index.position[n]],
+                len([v for v in g.neighbors(n) if model.status[v] == 1]),
+            )
+
+        # compartments reading the shared counts
+        nodes = np.arange(300)
+        for neighbor_counts in [None, counts]:
+            mask = cpm.NodeThreshold(0.1, "Infected").execute_batch(
+                nodes,
+                graph=model.graph,
+                status=model.status_array,
+                status_map=model.available_statuses,
+                params=model.params,
+                index=model.node_index,
+                neighbor_counts=neighbor_counts,
+            )
+            expected = [
+                bool(
+                    cpm.NodeThreshold(0.1, "Infected").execute(
+                        node=n,
+                        graph=model.graph,
+                        status=model.status,
+                        status_map=model.available_statuses,
+                        params=model.params,
+                    )
+                )
+                for n in model.node_index.nodes
+            ]
+            self.assertEqual(mask.tolist(), expected)
+
+    def test_countdown_timers(self):
+        for backend in ["dict", "array"]:
+            g = nx.erdos_renyi_graph(100, 0.1)
+            model = gc.CompositeModel(g)
+            model.add_status("Susceptible")
+            model.add_status("Infected")
+            model.add_rule(
+                "Susceptible",
+                "Infected",
+                cpm.NodeStochastic(1, composed=cpm.CountDown("time", iterations=3)),
+            )
+            model.set_backend(backend)
+            config = mc.Configuration()
+            config.add_model_initial_configuration("Infected", [0])
+            model.set_initial_status(config)
+
+            iterations = model.iteration_bunch(6)
+            # the timers are kept by the model, not in the graph
+            self.assertEqual(nx.get_node_attributes(g, "time"), {})
+            self.assertEqual(iterations[3]["node_count"][1], 1)
+            self.assertEqual(iterations[4]["node_count"][1], 100)
+
+            # timers restart with the simulation
+            model.reset()
+            self.assertEqual(model.iteration_bunch(6), iterations)
+
+        # composed under compartments forwarding the model parameters positionally
+        for rule in [
+            lambda: cpm.NodeThreshold(0.1, "Infected", composed=cpm.CountDown("t", 2)),
+            lambda: cpm.EdgeStochastic(1, "Infected", composed=cpm.CountDown("t", 2)),
+        ]:
+            for backend in ["dict", "array"]:
+                g = nx.path_graph(4)
+                model = gc.CompositeModel(g)
+                model.add_status("Susceptible")
+                model.add_status("Infected")
+                model.add_rule("Susceptible", "Infected", rule())
+                model.set_backend(backend)
+                config = mc.Configuration()
+                config.add_model_initial_configuration("Infected", [0])
+                model.set_initial_status(config)
+
+                iterations = model.iteration_bunch(5)
+                self.assertEqual(nx.get_node_attributes(g, "t"), {})
+                self.assertEqual(
+                    [it["node_count"][1] for it in iterations], [1, 1, 1, 2, 2]
+                )
+
+    def test_attributes_composed(self):
+        g = nx.karate_club_graph()
+        nx.set_node_attributes(
+            g, {n: {"even": n % 2, "parity": str(n % 2)} for n in g.nodes()}
+        )
+        nx.set_edge_attributes(
+            g,
+            {
+                (u, v): {"even": (u + v) % 2, "parity": str((u + v) % 2)}
+                for (u, v) in g.edges()
+            },
+        )
+
+        composed = [
+            lambda: cpm.NodeCategoricalAttribute("parity", "0", probability=1),
+            lambda: cpm.NodeNumericalAttribute("even", value=0, op="==", probability=1),
+            lambda: cpm.NodeNumericalVariable(
+                "even", var_type=NumericalType.ATTRIBUTE, value=0, op="=="
+            ),
+            lambda: cpm.EdgeCategoricalAttribute("parity", "0", probability=1),
+            lambda: cpm.EdgeNumericalAttribute("even", value=0, op="==", probability=1),
+        ]
+        # the model parameters are forwarded positionally by NodeThreshold and EdgeStochastic
+        wrappers = [
+            lambda c: cpm.NodeThreshold(0.1, "Infected", composed=c),
+            lambda c: cpm.EdgeStochastic(1, "Infected", composed=c),
+        ]
+        for build, wrap in itertools.product(composed, wrappers):
+            trends = []
+            for backend in ["dict", "array"]:
+                model = gc.CompositeModel(g)
+                model.add_status("Susceptible")
+                model.add_status("Infected")
+                model.add_rule("Susceptible", "Infected", wrap(build()))
+                model.set_backend(backend)
+                config = mc.Configuration()
+                config.add_model_initial_configuration("Infected", [0, 33])
+                model.set_initial_status(config)
+                trends.append(model.build_trends(model.iteration_bunch(5)))
+
+            self.assertEqual(trends[0], trends[1])
+            self.assertGreater(trends[0][0]["trends"]["node_count"][1][-1], 2)
+
+    def test_legacy_compartment(self):
+        class Always(Compartiment):
+            # execute signature predating the model keyword
+            def execute(self, node, graph, status, status_map, params):
+                return True
+
+        self.assertFalse(Compartiment.accepts_model(Always({})))
+        self.assertTrue(Compartiment.accepts_model(cpm.CountDown("time", 1)))
+        for backend in ["dict", "array"]:
+            model = gc.CompositeModel(nx.erdos_renyi_graph(100, 0.1))
+            model.add_status("Susceptible")
+            model.add_status("Infected")
+            model.add_rule("Susceptible", "Infected", Always({}))
+            model.set_backend(backend)
+            config = mc.Configuration()
+            config.add_model_parameter("fraction_infected", 0.1)
+            model.set_initial_status(config)
+
+            iterations = model.iteration_bunch(2)
+            self.assertEqual(iterations[1]["node_count"][1], 100)
+
+    def test_edge_attribute_index(self):
+        for directed in [False, True]:
+            g = nx.erdos_renyi_graph(100, 0.1, directed=directed)
+            values = {(u, v): u * 1000 + v for u, v in g.edges()}
+            nx.set_edge_attributes(g, values, "w")
+
+            model = gc.CompositeModel(g)
+            model.add_status("Susceptible")
+            model.add_status("Infected")
+            config = mc.Configuration()
+            config.add_model_parameter("fraction_infected", 0.1)
+            for u, v in g.edges():
+                config.add_edge_configuration("threshold", (u, v), values[(u, v)])
+            model.set_initial_status(config)
+
+            # built by set_initial_status and kept by the array backend
+            attributes = model.edge_attributes
+            self.assertIsNotNone(attributes)
+            model.set_backend("array")
+            self.assertIs(model.edge_attribute_index(), attributes)
+
+            index = model.node_index
+            nodes = np.arange(len(index))
+            for incoming in [True, False]:
+                rows, neighbors, entries = index.neighbor_entries(nodes, incoming)
+                src, dst = nodes[rows], neighbors
+                if incoming and directed:
+                    src, dst = dst, src
+                pairs = [(index.nodes[u], index.nodes[v]) for u, v in zip(src, dst)]
+                expected = [
+                    values[(u, v)] if (u, v) in values else values[(v, u)]
+                    for u, v in pairs
+                ]
+                self.assertEqual(
+                    attributes.parameter("threshold")[entries].tolist(), expected
+                )
+                self.assertEqual(attributes.attribute("w")[entries].tolist(), expected)
+
+    def test_common_neighbors(self):
+        for directed in [False, True]:
+            g = nx.erdos_renyi_graph(100, 0.1, directed=directed)
+            model = gc.CompositeModel(g)
+            model.add_status("Susceptible")
+            model.add_status("Infected")
+            config = mc.Configuration()
+            config.add_model_parameter("fraction_infected", 0.1)
+            model.set_initial_status(config)
+            model.set_backend("array")
+
+            index = model.node_index
+            nodes = np.arange(len(index))
+            rows, neighbors, _ = index.neighbor_entries(nodes, incoming=False)
+            mask = (rows + neighbors) % 2 == 0
+            adjacency = index.adjacency()
+            successors = [
+                set(adjacency.indices[adjacency.indptr[u] : adjacency.indptr[u + 1]])
+                for u in nodes
+            ]
+            for chunk_size in [3, 2**22]:
+                common = index.common_neighbors(mask, chunk_size)
+                for e, (u, v) in enumerate(zip(rows, neighbors)):
+                    expected = [
+                        w
+                        for w in successors[v] & successors[u]
+                        if mask[index.edge_entries([u], [w])[0]]
+                    ]
+                    self.assertEqual(common[e], len(expected))
+
+    def test_node_attribute_index(self):
+        g = nx.erdos_renyi_graph(100, 0.1)
+        nx.set_node_attributes(
+            g, {n: {"age": n % 50, "even": str(n % 2)} for n in g.nodes()}
+        )
+        model = gc.CompositeModel(g)
+        model.add_status("Susceptible")
+        model.add_status("Infected")
+        config = mc.Configuration()
+        config.add_model_parameter("fraction_infected", 0.1)
+        for n in g.nodes():
+            config.add_node_configuration("weight", n, n / 100.0)
+        model.set_initial_status(config)
+
+        attributes = model.node_attribute_index()
+        nodes = attributes.index.nodes
+        self.assertEqual(attributes.numeric("age").tolist(), [n % 50 for n in nodes])
+        self.assertEqual(
+            attributes.numeric("weight", parameter=True).tolist(),
+            [n / 100.0 for n in nodes],
+        )
+        self.assertIsNone(attributes.categories("age"))
+
+        # categorical values are stored as codes
+        codes = attributes.attribute("even")
+        self.assertEqual(codes.dtype.kind, "i")
+        categories = attributes.categories("even")
+        self.assertEqual(sorted(categories), ["0", "1"])
+        self.assertEqual([categories[c] for c in codes], [str(n % 2) for n in nodes])
+        self.assertEqual(attributes.code("even", "2"), -1)
+        self.assertRaises(ValueError, attributes.numeric, "even")
+
+        # columns are kept until the next configuration
+        model.set_backend("array")
+        self.assertIs(model.node_attribute_index(), attributes)
+        model.set_initial_status(config)
+        self.assertIsNot(model.node_attribute_index(), attributes)
+
+        # columns are snapshots, rebuilt once invalidated
+        attributes = model.node_attribute_index()
+        self.assertEqual(attributes.numeric("age")[0], nodes[0] % 50)
+        g.nodes[nodes[0]]["age"] = 99
+        self.assertEqual(attributes.numeric("age")[0], nodes[0] % 50)
+        attributes.invalidate("age")
+        self.assertEqual(attributes.numeric("age")[0], 99)
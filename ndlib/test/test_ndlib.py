@@ -1,7 +1,11 @@
 from __future__ import absolute_import
 
+import itertools
 import unittest
 import random
+from collections import Counter
+import shutil
+import tempfile
 import future.utils
 import networkx as nx
 import igraph as ig
@@ -11,6 +15,10 @@ import ndlib.models.ModelConfig as mc
 import ndlib.models.epidemics as epd
 import ndlib.models.opinions as opn
 import ndlib.utils as ut
+from ndlib.models.DistanceBiasedSampler import DistanceBiasedSampler
+from ndlib.models.LiveEdgeSampler import LiveEdgeSampler
+from ndlib.models.ReverseReachableIndex import ReverseReachableIndex
+from ndlib.models.StatusRecorder import StatusRecorder, StatusTrajectory
 
 __author__ = "Giulio Rossetti"
 __license__ = "BSD-2-Clause"
@@ -143,6 +151,36 @@ class NdlibTest(unittest.TestCase):
 
             _ = model.steady_state(max_iterations=100)
 
+    def test_distance_biased_sampler(self):
+        np.random.seed(0)
+        values = np.array([0.1, 0.5, 0.5, 0.50001, 0.9, 0.2])
+        sampler = DistanceBiasedSampler(values, 1)
+        weights = np.maximum(np.abs(values - values[1]), 0.00001) ** -1.0
+        weights[1] = 0
+        draws = np.bincount([sampler.sample(1) for _ in range(20000)], minlength=6)
+        self.assertEqual(draws[1], 0)
+        self.assertTrue(
+            np.allclose(draws / 20000.0, weights / weights.sum(), atol=0.02)
+        )
+
+        for agent in range(6):
+            sampler.update(agent, np.random.random_sample())
+        self.assertTrue(np.all(np.diff(sampler.sorted_values) >= 0))
+        self.assertTrue(
+            np.array_equal(sampler.values[sampler.sorted_agents], sampler.sorted_values)
+        )
+
+        g = nx.complete_graph(200)
+        model = opn.AlgorithmicBiasModel(g, seed=0)
+        config = mc.Configuration()
+        config.add_model_parameter("epsilon", 0.32)
+        config.add_model_parameter("gamma", 1)
+        model.set_initial_status(config)
+        iterations = model.iteration_bunch(5)
+        statuses = np.array([iterations[-1]["status"][n] for n in range(200)])
+        self.assertTrue(np.allclose(model.sts, statuses))
+        self.assertTrue(np.allclose(model.sampler.values, statuses))
+
     def test_voter_model(self):
         for g in get_graph():
             model = opn.VoterModel(g, seed=0)
@@ -154,6 +192,48 @@ class NdlibTest(unittest.TestCase):
             iterations = model.iteration_bunch(10, node_status=False)
             self.assertEqual(len(iterations), 10)
 
+    def test_random_sampling(self):
+        g = nx.DiGraph([(0, 1), (0, 2), (3, 0)])
+        g.add_node(4)
+        model = opn.VoterModel(g)
+
+        nodes = model.random_nodes(5000)
+        self.assertEqual(len(nodes), 5000)
+        for n in g.nodes():
+            self.assertAlmostEqual(nodes.count(n) / 5000.0, 0.2, delta=0.03)
+        self.assertIn(model.random_nodes(), g.nodes())
+
+        self.assertEqual(set(model.random_neighbors(0, 100)), {1, 2})
+        self.assertEqual(model.random_neighbors(0, incoming=True), 3)
+        self.assertIsNone(model.random_neighbors(4))
+        self.assertEqual(model.random_neighbors(4, 3), [])
+
+        # in-place mutations between iterations are seen by the sampling index
+        config = mc.Configuration()
+        config.add_model_parameter("fraction_infected", 0.4)
+        model.set_initial_status(config)
+        model.iteration()
+        g.add_edge(4, 5)
+        model.iteration()
+        self.assertIn(5, model.random_nodes(1000))
+        self.assertEqual(model.random_neighbors(4), 5)
+        # edges added between existing nodes require an explicit invalidation
+        g.add_edge(4, 1)
+        model.invalidate_sampling()
+        self.assertEqual(set(model.random_neighbors(4, 100)), {1, 5})
+
+        # isolated listeners keep their status
+        g = nx.Graph([(0, 1)])
+        g.add_nodes_from([2, 3])
+        for model in [opn.VoterModel(g), opn.QVoterModel(g)]:
+            config = mc.Configuration()
+            config.add_model_parameter("q", 2)
+            config.add_model_initial_configuration("Infected", [0, 2])
+            model.set_initial_status(config)
+            model.iteration_bunch(100)
+            self.assertEqual(model.status[2], 1)
+            self.assertEqual(model.status[3], 0)
+
     def test_sznajd_model(self):
         for g in get_graph():
             model = opn.SznajdModel(g)
@@ -251,6 +331,79 @@ class NdlibTest(unittest.TestCase):
             iterations = model.iteration_bunch(10, node_status=False)
             self.assertEqual(len(iterations), 10)
 
+    def test_synchronous_hk_model(self):
+        g = nx.erdos_renyi_graph(100, 0.1, seed=0)
+        model = opn.HKModel(g)
+        config = mc.Configuration()
+        config.add_model_parameter("epsilon", 0.32)
+        config.add_model_parameter("synchronous", 1)
+        model.set_initial_status(config)
+        model.iteration()
+
+        before = dict(model.status)
+        model.iteration()
+        for n in g.nodes:
+            neighbors = [m for m in g.neighbors(n) if abs(before[n] - before[m]) < 0.32]
+            expected = (
+                np.mean([before[m] for m in neighbors]) if neighbors else before[n]
+            )
+            self.assertAlmostEqual(model.status[n], expected)
+
+        for similarity in [0, 1]:
+            model = opn.WHKModel(g)
+            config = mc.Configuration()
+            config.add_model_parameter("epsilon", 0.32)
+            config.add_model_parameter("similarity", similarity)
+            config.add_model_parameter("synchronous", 1)
+            for e in g.edges:
+                config.add_edge_configuration("weight", e, 0.2)
+            model.set_initial_status(config)
+            iterations = model.iteration_bunch(3)
+            self.assertEqual(len(iterations), 3)
+            self.assertTrue(all(-1 <= s <= 1 for s in model.status.values()))
+
+        # one synchronous WHK step: weighted (and similarity scaled) mean of the neighbors within epsilon
+        g = nx.cycle_graph(6)
+        g.add_edge(0, 3)
+        weights = {e: 0.1 * (i + 1) for i, e in enumerate(g.edges)}
+        vectors = {n: [(n >> b) & 1 for b in range(3)] for n in g.nodes}
+        vectors[0] = [0, 0, 0]
+        for similarity in [0, 1]:
+            model = opn.WHKModel(g)
+            config = mc.Configuration()
+            config.add_model_parameter("epsilon", 0.5)
+            config.add_model_parameter("similarity", similarity)
+            config.add_model_parameter("synchronous", 1)
+            for e, w in weights.items():
+                config.add_edge_configuration("weight", e, w)
+            for n, v in vectors.items():
+                config.add_node_configuration("vector", n, v)
+            model.set_initial_status(config)
+            model.iteration()
+
+            before = dict(model.status)
+            model.iteration()
+            for n in g.nodes:
+                total, count = 0.0, 0
+                for m in g.neighbors(n):
+                    if abs(before[n] - before[m]) >= 0.5:
+                        continue
+                    w = weights[(n, m)] if (n, m) in weights else weights[(m, n)]
+                    if similarity:
+                        a = set(i for i, x in enumerate(vectors[n]) if x)
+                        b = set(i for i, x in enumerate(vectors[m]) if x)
+                        w *= len(a & b) / float(len(a | b)) if a | b else 0.0
+                    total += before[m] * w
+                    count += 1
+                expected = before[n]
+                if count > 0:
+                    mean = total / count
+                    if before[n] > 0:
+                        expected = before[n] + mean * (1 - before[n])
+                    else:
+                        expected = before[n] + mean * (1 + before[n])
+                self.assertAlmostEqual(model.status[n], expected)
+
     def test_arwhk_model(self):
         for g in get_graph():
             model = opn.ARWHKModel(g)
@@ -313,6 +466,249 @@ class NdlibTest(unittest.TestCase):
             iterations = model.iteration_bunch(10, node_status=False)
             self.assertEqual(len(iterations), 10)
 
+    def test_array_backend(self):
+        g = nx.erdos_renyi_graph(300, 0.05)
+        trends = []
+        for backend in ["dict", "array"]:
+            model = epd.SISModel(g, seed=0).set_backend(backend)
+            config = mc.Configuration()
+            config.add_model_parameter("beta", 0.05)
+            config.add_model_parameter("lambda", 0.1)
+            config.add_model_parameter("fraction_infected", 0.05)
+            model.set_initial_status(config)
+            iterations = model.iteration_bunch(10)
+            self.assertEqual(len(iterations), 10)
+            trends.append(model.build_trends(iterations))
+
+        self.assertEqual(trends[0], trends[1])
+        self.assertEqual(model.status_array.dtype, np.int8)
+        self.assertEqual(len(model.status.copy()), g.number_of_nodes())
+
+        model.reset()
+        self.assertEqual(dict(model.status), dict(model.initial_status))
+        model.set_backend("dict")
+        self.assertIsInstance(model.status, dict)
+
+        model = epd.SISModel(g).set_backend("array")
+        self.assertEqual(sum(model.initial_status.values()), 0)
+
+        with self.assertRaises(Exception) as raised:
+            opn.HKModel(g).set_backend("array")
+        self.assertIn("message", raised.exception.args[0])
+
+    def test_vectorized_epidemics(self):
+        g = nx.erdos_renyi_graph(200, 0.03)
+        for directed in [False, True]:
+            if directed:
+                g = g.to_directed()
+            prevalence = {}
+            for backend in ["dict", "array"]:
+                removed = []
+                for seed in range(30):
+                    model = epd.SIRModel(g, seed=seed).set_backend(backend)
+                    config = mc.Configuration()
+                    config.add_model_parameter("beta", 0.1)
+                    config.add_model_parameter("gamma", 0.1)
+                    config.add_model_initial_configuration("Infected", [0, 1, 2])
+                    model.set_initial_status(config)
+                    iterations = model.iteration_bunch(20, node_status=False)
+                    removed.append(iterations[-1]["node_count"][2])
+                prevalence[backend] = np.mean(removed)
+            self.assertAlmostEqual(
+                prevalence["dict"] / prevalence["array"], 1, delta=0.2
+            )
+
+        for model_class, rate in [
+            (epd.SIModel, None),
+            (epd.SISModel, "lambda"),
+            (epd.SEIRModel, "gamma"),
+        ]:
+            results = []
+            for backend in ["dict", "array"]:
+                model = model_class(g, seed=0).set_backend(backend)
+                config = mc.Configuration()
+                config.add_model_parameter("beta", 0.1)
+                config.add_model_parameter("alpha", 0.2)
+                if rate is not None:
+                    config.add_model_parameter(rate, 0.1)
+                config.add_model_parameter("fraction_infected", 0.05)
+                model.set_initial_status(config)
+                results.append(model.iteration_bunch(10))
+            self.assertEqual(results[0], results[1])
+
+    def test_incremental_status_delta(self):
+        g = nx.erdos_renyi_graph(200, 0.05)
+        for backend in ["dict", "array"]:
+            model = epd.SEIRModel(g, seed=0).set_backend(backend)
+            config = mc.Configuration()
+            config.add_model_parameter("beta", 0.1)
+            config.add_model_parameter("gamma", 0.1)
+            config.add_model_parameter("alpha", 0.2)
+            config.add_model_parameter("fraction_infected", 0.05)
+            model.set_initial_status(config)
+
+            status = {}
+            for _ in range(2):
+                for it in model.iteration_bunch(15):
+                    status.update(it["status"])
+                    for st in model.available_statuses.values():
+                        self.assertEqual(
+                            it["node_count"][st],
+                            len([n for n in status if status[n] == st]),
+                        )
+                model.reset()
+                status = {}
+
+    def test_frontier_iteration(self):
+        g = nx.erdos_renyi_graph(300, 0.02)
+        thresholds = {n: np.random.random_sample() * 0.3 for n in g.nodes}
+        for graph in [g, g.to_directed()]:
+            for model_class in [
+                epd.SIRModel,
+                epd.IndependentCascadesModel,
+                epd.ThresholdModel,
+            ]:
+                results = []
+                for frontier in [0, 1]:
+                    model = model_class(graph, seed=0)
+                    config = mc.Configuration()
+                    config.add_model_parameter("beta", 0.1)
+                    config.add_model_parameter("gamma", 0.1)
+                    config.add_model_parameter("frontier", frontier)
+                    config.add_model_parameter("fraction_infected", 0.05)
+                    config.add_node_set_configuration("threshold", thresholds)
+                    model.set_initial_status(config)
+                    iterations = model.iteration_bunch(10)
+                    model.reset()
+                    iterations += model.iteration_bunch(10, node_status=False)
+                    results.append(iterations)
+                self.assertEqual(results[0], results[1])
+
+            # deterministic dynamics: same cascades with and without frontier on both backends
+            results = []
+            for backend, frontier in itertools.product(["dict", "array"], [0, 1]):
+                model = epd.ThresholdModel(graph, seed=0).set_backend(backend)
+                config = mc.Configuration()
+                config.add_model_parameter("frontier", frontier)
+                config.add_model_initial_configuration("Infected", list(range(15)))
+                config.add_node_set_configuration("threshold", thresholds)
+                model.set_initial_status(config)
+                iterations = model.iteration_bunch(10)
+                results.append([it["node_count"] for it in iterations])
+                if frontier and backend == "array":
+                    self.assertIsInstance(model.frontier, np.ndarray)
+            self.assertEqual(len(set(map(str, results))), 1)
+
+            model = epd.SIRModel(graph, seed=0).set_backend("array")
+            config = mc.Configuration()
+            config.add_model_parameter("beta", 0.1)
+            config.add_model_parameter("gamma", 0.1)
+            config.add_model_parameter("frontier", 1)
+            config.add_model_parameter("fraction_infected", 0.05)
+            model.set_initial_status(config)
+            status = {}
+            for it in model.iteration_bunch(10):
+                status.update(it["status"])
+                self.assertEqual(
+                    it["node_count"][1], len([n for n in status if status[n] == 1])
+                )
+
+    def test_compact_trends(self):
+        g = nx.erdos_renyi_graph(300, 0.02)
+        for backend in ["dict", "array"]:
+            results = []
+            for compact in [False, True]:
+                model = epd.SEIRModel(g, seed=0).set_backend(backend)
+                config = mc.Configuration()
+                config.add_model_parameter("beta", 0.1)
+                config.add_model_parameter("gamma", 0.1)
+                config.add_model_parameter("alpha", 0.2)
+                config.add_model_parameter("fraction_infected", 0.05)
+                model.set_initial_status(config)
+                iterations = model.iteration_bunch(
+                    30, node_status=False, compact=compact
+                )
+                results.append(model.build_trends(iterations)[0]["trends"])
+
+            expected, trends = results
+            self.assertEqual(trends["node_count"].keys(), expected["node_count"].keys())
+            for st in expected["node_count"]:
+                self.assertIsInstance(trends["node_count"][st], np.ndarray)
+                self.assertEqual(
+                    trends["node_count"][st].tolist(), expected["node_count"][st]
+                )
+                self.assertEqual(
+                    trends["status_delta"][st].tolist(), expected["status_delta"][st]
+                )
+
+            # the counters kept by the compact bunch carry over to the next iterations
+            its = model.iteration_bunch(5, node_status=False)[-1]
+            counts = Counter(dict(model.status).values())
+            self.assertEqual(its["node_count"], {st: counts[st] for st in range(4)})
+
+    def test_status_recorder(self):
+        g = nx.erdos_renyi_graph(300, 0.02)
+        for backend in ["dict", "array"]:
+            model = epd.SIRModel(g, seed=0).set_backend(backend)
+            config = mc.Configuration()
+            config.add_model_parameter("beta", 0.1)
+            config.add_model_parameter("gamma", 0.1)
+            config.add_model_parameter("fraction_infected", 0.05)
+            model.set_initial_status(config)
+            initial_status = model.status.copy()
+
+            path = tempfile.mkdtemp()
+            try:
+                iterations = []
+                with StatusRecorder(model, path, chunk_size=7) as recorder:
+                    recorder.record_bunch(3)
+                    for _ in range(27):
+                        iterations.append(model.iteration())
+                        recorder.record(iterations[-1])
+                trajectory = StatusTrajectory(path)
+                self.assertEqual(len(trajectory), 30)
+                self.assertEqual(trajectory.iterations.tolist(), list(range(30)))
+
+                status = trajectory.status(2)
+                for t, it in enumerate(iterations, 3):
+                    status.update(it["status"])
+                    self.assertEqual(trajectory.status(t), status)
+                    positions, statuses = trajectory.changes(t)
+                    changed = {
+                        trajectory.nodes[i]: s
+                        for i, s in zip(positions.tolist(), statuses.tolist())
+                    }
+                    self.assertEqual(changed, it["status"])
+                self.assertEqual(trajectory.status(0), initial_status)
+                self.assertEqual(trajectory.status(-1), model.status.copy())
+            finally:
+                shutil.rmtree(path)
+
+    def test_iterate(self):
+        g = nx.erdos_renyi_graph(300, 0.02)
+        model = epd.SIRModel(g, seed=0)
+        config = mc.Configuration()
+        config.add_model_parameter("beta", 0.05)
+        config.add_model_parameter("gamma", 0.5)
+        config.add_model_parameter("fraction_infected", 0.01)
+        model.set_initial_status(config)
+
+        iterations = list(
+            model.iterate(stop=lambda it: it["node_count"][1] == 0, node_status=False)
+        )
+        self.assertEqual(iterations[-1]["node_count"][1], 0)
+        self.assertTrue(all(it["node_count"][1] > 0 for it in iterations[:-1]))
+        self.assertEqual(
+            [it["iteration"] for it in iterations], list(range(len(iterations)))
+        )
+
+        model.reset()
+        stream = model.iterate()
+        self.assertEqual(next(stream)["iteration"], 0)
+        self.assertEqual(model.actual_iteration, 1)
+        self.assertEqual(len(list(model.iterate(5))), 5)
+        self.assertEqual(model.actual_iteration, 6)
+
     def test_forest_fire_model(self):
         for g in get_graph(True):
             model = epd.ForestFireModel(g)
@@ -499,6 +895,55 @@ class NdlibTest(unittest.TestCase):
             iterations = model.iteration_bunch(10, node_status=False)
             self.assertEqual(len(iterations), 10)
 
+    def test_threshold_active_neighbors(self):
+        for directed in [False, True]:
+            g = nx.erdos_renyi_graph(200, 0.03, directed=directed)
+            config = mc.Configuration()
+            config.add_model_parameter("fraction_infected", 0.05)
+            config.add_node_set_configuration(
+                "threshold", {n: np.random.choice([0.05, 0.1, 0.2]) for n in g.nodes()}
+            )
+
+            executions = []
+            for backend in ["dict", "array"]:
+                model = epd.ThresholdModel(g)
+                model.set_initial_status(config)
+                model.reset(list(range(10)))
+                model.set_backend(backend)
+                executions.append(model.iteration_bunch(10))
+
+                # incremental counts agree with the neighborhoods
+                nodes = model.node_attribute_index().index.nodes
+                counts = model.active_neighbors(1)
+                for i, n in enumerate(nodes):
+                    neighbors = g.predecessors(n) if directed else g.neighbors(n)
+                    self.assertEqual(
+                        counts[i], len([v for v in neighbors if model.status[v] == 1])
+                    )
+
+            for dict_it, array_it in zip(*executions):
+                self.assertEqual(dict_it["status"], dict(array_it["status"]))
+                self.assertEqual(dict_it["node_count"], array_it["node_count"])
+
+    def test_spontaneous_adoptions(self):
+        g = nx.empty_graph(2000)
+        for model_class in [
+            epd.KerteszThresholdModel,
+            epd.ProfileModel,
+            epd.ProfileThresholdModel,
+        ]:
+            model = model_class(g)
+            config = mc.Configuration()
+            config.add_model_parameter("adopter_rate", 0.3)
+            config.add_model_parameter("percentage_blocked", 0)
+            model.set_initial_status(config)
+            model.reset([0])
+
+            iterations = model.iteration_bunch(2)
+            adopted = iterations[1]["status_delta"][1]
+            self.assertEqual(adopted, len(iterations[1]["status"]))
+            self.assertAlmostEqual(adopted / 1999.0, 0.3, delta=0.05)
+
     def test_generalisedthreshold_model(self):
         for g in get_graph(True):
             model = epd.GeneralisedThresholdModel(g)
@@ -727,6 +1172,159 @@ class NdlibTest(unittest.TestCase):
             iterations = model.iteration_bunch(10, node_status=False)
             self.assertEqual(len(iterations), 10)
 
+    def test_cascade_activation(self):
+        for directed in [False, True]:
+            g = nx.erdos_renyi_graph(200, 0.05, directed=directed)
+            com = {n: n % 2 for n in g.nodes()}
+            thresholds = {e: np.random.random_sample() for e in g.edges()}
+            config = mc.Configuration()
+            config.add_model_parameter("fraction_infected", 0.1)
+            config.add_model_parameter("permeability", 0.5)
+            config.add_node_set_configuration("com", com)
+            config.add_edge_set_configuration("threshold", thresholds)
+
+            for model_class in [
+                epd.IndependentCascadesModel,
+                epd.ICPModel,
+                epd.ICEModel,
+                epd.ICEPModel,
+            ]:
+                model = model_class(g)
+                model.set_initial_status(config)
+                activation = model.activation_probabilities()
+                for u in [0, 1, 2]:
+                    for v, p in model.activation_attempts(u, activation):
+                        self.assertTrue(g.has_edge(u, v))
+                        threshold = thresholds.get((u, v), thresholds.get((v, u)))
+                        if model_class == epd.IndependentCascadesModel:
+                            self.assertAlmostEqual(p, threshold)
+                        elif model_class == epd.ICPModel:
+                            scale = 1 if com[u] == com[v] else 0.5
+                            self.assertAlmostEqual(p, threshold * scale)
+                        self.assertTrue(0 <= p <= 1)
+
+                # vectorized cascade step
+                model.set_backend("array")
+                status = dict(model.status)
+                for it in model.iteration_bunch(10):
+                    status.update(it["status"])
+                    self.assertEqual(
+                        it["node_count"][2], len([n for n in status if status[n] == 2])
+                    )
+                self.assertEqual(
+                    len([n for n in status if status[n] == 1]), it["node_count"][1]
+                )
+
+    def test_live_edge_sampler(self):
+        for directed in [False, True]:
+            g = nx.erdos_renyi_graph(300, 0.02, directed=directed)
+            seeds = [0, 1, 2, 3, 4]
+
+            for threshold in [0, 1]:
+                config = mc.Configuration()
+                config.add_model_parameter("fraction_infected", 0.1)
+                config.add_edge_set_configuration(
+                    "threshold", {e: threshold for e in g.edges()}
+                )
+                model = epd.IndependentCascadesModel(g)
+                model.set_initial_status(config)
+                sampler = LiveEdgeSampler(model, samples=5)
+
+                reached = set(seeds)
+                if threshold == 1:
+                    for s in seeds:
+                        reached |= nx.descendants(g, s)
+                spread, (low, high) = sampler.expected_spread(seeds)
+                self.assertEqual(spread, len(reached))
+                self.assertAlmostEqual(low, high)
+                self.assertEqual(
+                    set(sampler.index.nodes[p] for p in sampler.reachable(seeds, 4)),
+                    reached,
+                )
+
+            # the estimate agrees with the simulated cascades
+            config = mc.Configuration()
+            config.add_edge_set_configuration("threshold", {e: 0.2 for e in g.edges()})
+            model = epd.IndependentCascadesModel(g)
+            model.set_initial_status(config)
+            spread, (low, high) = LiveEdgeSampler(model, samples=300).expected_spread(
+                seeds
+            )
+            self.assertTrue(low <= spread <= high)
+
+            model.set_backend("array")
+            simulated = []
+            for _ in range(300):
+                model.reset(seeds)
+                its = model.iteration_bunch(100, node_status=False)
+                simulated.append(its[-1]["node_count"][2])
+            self.assertAlmostEqual(np.mean(simulated), spread, delta=0.15 * spread)
+
+    def test_reverse_reachable_index(self):
+        for directed in [False, True]:
+            g = nx.erdos_renyi_graph(300, 0.02, directed=directed)
+            config = mc.Configuration()
+            config.add_edge_set_configuration("threshold", {e: 1 for e in g.edges()})
+            model = epd.IndependentCascadesModel(g)
+            model.set_initial_status(config)
+            index = ReverseReachableIndex(model, sets=200, nprocesses=2, chunk_size=50)
+            self.assertEqual(len(index), 200)
+
+            # with certain activations an RR set lists a node and all its ancestors
+            reverse = g.reverse() if directed else g
+            for i in range(len(index)):
+                rr_set = set(index.index.nodes[p] for p in index.rr_set(i))
+                self.assertTrue(
+                    any(rr_set == nx.descendants(reverse, v) | {v} for v in rr_set)
+                )
+
+            config = mc.Configuration()
+            config.add_edge_set_configuration("threshold", {e: 0.2 for e in g.edges()})
+            config.add_model_parameter("permeability", 0.5)
+            config.add_node_set_configuration("com", {n: n % 2 for n in g.nodes()})
+            model = epd.ICPModel(g)
+            model.set_initial_status(config)
+            seeds = [0, 1, 2, 3, 4]
+            spread, (low, high) = ReverseReachableIndex(
+                model, sets=5000
+            ).expected_spread(seeds)
+            self.assertTrue(low <= spread <= high)
+            sampled, _ = LiveEdgeSampler(model, samples=300).expected_spread(seeds)
+            self.assertAlmostEqual(sampled, spread, delta=0.15 * spread)
+
+        # asymmetric activations on an undirected star (1 / degree of the source)
+        g = nx.star_graph(10)
+        model = epd.IndependentCascadesModel(g)
+        config = mc.Configuration()
+        config.add_model_initial_configuration("Infected", [0])
+        model.set_initial_status(config)
+        degree = np.diff(model.edge_attribute_index().index.adjacency().indptr)
+        model.activation_probabilities = lambda: np.repeat(1.0 / degree, degree)
+        index = ReverseReachableIndex(model, sets=20000)
+        sampler = LiveEdgeSampler(model, samples=2000)
+        for seeds, expected in [([0], 2.0), ([1], 2.9)]:
+            spread, _ = index.expected_spread(seeds)
+            self.assertAlmostEqual(spread, expected, delta=0.15)
+            self.assertAlmostEqual(spread, sampler.expected_spread(seeds)[0], delta=0.2)
+
+        # models without edge activation probabilities are rejected
+        for sampler_class in [ReverseReachableIndex, LiveEdgeSampler]:
+            with self.assertRaises(Exception) as raised:
+                sampler_class(epd.SIRModel(g))
+            self.assertIn("message", raised.exception.args[0])
+
+        # greedy selection: the hub of a directed star comes first
+        g = nx.DiGraph([(0, v) for v in range(1, 50)] + [(50, 51)])
+        config = mc.Configuration()
+        config.add_edge_set_configuration("threshold", {e: 0.5 for e in g.edges()})
+        model = epd.IndependentCascadesModel(g)
+        model.set_initial_status(config)
+        index = ReverseReachableIndex(model, sets=2000)
+        seeds, spread = index.select_seeds(3)
+        self.assertEqual(seeds[0], 0)
+        self.assertEqual(len(set(seeds)), 3)
+        self.assertAlmostEqual(spread, index.expected_spread(seeds)[0])
+
     def test_kertesz_model_predefined_blocked(self):
         for g in get_graph(True):
             model = epd.KerteszThresholdModel(g)
@@ -912,3 +1510,40 @@ class NdlibTest(unittest.TestCase):
             self.assertEqual(len(iterations), 10)
 
             _ = model.steady_state(max_iterations=100)
+
+    def test_algorithmic_bias_media_sampler(self):
+        for g in [nx.complete_graph(100), nx.erdos_renyi_graph(100, 0.1, seed=0)]:
+            model = opn.AlgorithmicBiasMediaModel(g, seed=0)
+            config = mc.Configuration()
+            config.add_model_parameter("epsilon", 1)
+            config.add_model_parameter("gamma", 1)
+            config.add_model_parameter("k", 1)
+            config.add_model_parameter("p", 1)
+            config.add_model_parameter("gamma_media", 1)
+            model.set_initial_status(config)
+            model.set_media_opinions([0.5])
+            iterations = model.iteration_bunch(30)
+
+            statuses = np.array([iterations[-1]["status"][n] for n in range(100)])
+            self.assertTrue(np.allclose(model.sts, statuses))
+            self.assertTrue(np.allclose(statuses, 0.5, atol=0.001))
+
+    def test_algorithmic_bias_clustered_media(self):
+        np.random.seed(0)
+        media = np.array([0.05, 0.1, 0.15])
+        sampler = DistanceBiasedSampler(media, 8)
+        weights = np.abs(media - 0.9) ** -8.0
+        draws = np.bincount([sampler.sample_opinion(0.9) for _ in range(5000)])
+        self.assertTrue(np.allclose(draws / 5000.0, weights / weights.sum(), atol=0.03))
+
+        model = opn.AlgorithmicBiasMediaModel(nx.complete_graph(50), seed=0)
+        config = mc.Configuration()
+        config.add_model_parameter("epsilon", 0.3)
+        config.add_model_parameter("gamma", 1)
+        config.add_model_parameter("gamma_media", 10)
+        config.add_model_parameter("p", 0.5)
+        config.add_model_parameter("k", 3)
+        model.set_initial_status(config)
+        model.set_media_opinions(list(media))
+        iterations = model.iteration_bunch(3)
+        self.assertEqual(len(iterations), 3)
@@ -1,8 +1,15 @@
+import copy
 import unittest
 import networkx as nx
+import numpy as np
 import ndlib.models.ModelConfig as mc
 import ndlib.models.epidemics as epd
-from ndlib.utils import multi_runs
+from ndlib.utils import (
+    multi_runs,
+    multi_runs_iter,
+    ensemble_runs,
+    InitializationException,
+)
 
 __author__ = "Giulio Rossetti"
 __license__ = "BSD-2-Clause"
@@ -64,6 +71,156 @@ class ParallelTest(unittest.TestCase):
         )
         self.assertIsNotNone(trends)
 
+    def test_multi_shared_graph(self):
+        # Network topology
+        g = nx.erdos_renyi_graph(500, 0.02, seed=3)
+
+        # Model selection
+        model1 = epd.IndependentCascadesModel(g)
+
+        # Model Configuration
+        config = mc.Configuration()
+        config.add_model_initial_configuration("Infected", [1, 2, 3])
+        for e in g.edges():
+            config.add_edge_configuration("threshold", e, 0.2)
+        model1.set_initial_status(config)
+
+        # Simulation multiple execution: shared and copied graphs give the same trends
+        # (shared graphs are simulated on the array backend)
+        infection_sets = [(1, 2, 3), (4, 5), (6,), (7, 8, 9)]
+        np.random.seed(7)
+        trends = multi_runs(
+            model1,
+            execution_number=4,
+            iteration_number=10,
+            infection_sets=infection_sets,
+            nprocesses=2,
+            shared_graph=True,
+        )
+        np.random.seed(7)
+        expected = multi_runs(
+            copy.deepcopy(model1).set_backend("array"),
+            execution_number=4,
+            iteration_number=10,
+            infection_sets=infection_sets,
+            nprocesses=2,
+        )
+        self.assertEqual(trends, expected)
+        self.assertIsNone(model1.node_index)
+        self.assertEqual(len(model1.params["edges"]["threshold"]), g.number_of_edges())
+
+        # SIR runs on the array backend
+        model2 = epd.SIRModel(g)
+        config = mc.Configuration()
+        config.add_model_parameter("beta", 0.01)
+        config.add_model_parameter("gamma", 0.01)
+        config.add_model_parameter("fraction_infected", 0.05)
+        model2.set_initial_status(config)
+        trends = multi_runs(
+            model2,
+            execution_number=4,
+            iteration_number=20,
+            nprocesses=2,
+            shared_graph=True,
+        )
+        self.assertEqual(len(trends), 4)
+        for trend in trends:
+            counts = trend["trends"]["node_count"]
+            self.assertEqual(counts[1][0], 25)
+            self.assertEqual(counts[0][-1] + counts[1][-1] + counts[2][-1], 500)
+
+    def test_multi_iter(self):
+        # Network topology
+        g = nx.erdos_renyi_graph(500, 0.02, seed=5)
+
+        # Model selection
+        model1 = epd.SISModel(g)
+
+        # Model Configuration
+        config = mc.Configuration()
+        config.add_model_parameter("beta", 0.01)
+        config.add_model_parameter("lambda", 0.05)
+        config.add_model_parameter("fraction_infected", 0.05)
+        model1.set_initial_status(config)
+
+        # Streamed executions are the ones collected by multi_runs, in completion order
+        np.random.seed(11)
+        expected = multi_runs(
+            model1, execution_number=6, iteration_number=20, nprocesses=2
+        )
+        for max_pending in [1, 4]:
+            np.random.seed(11)
+            trends = list(
+                multi_runs_iter(
+                    model1,
+                    execution_number=6,
+                    iteration_number=20,
+                    nprocesses=2,
+                    max_pending=max_pending,
+                )
+            )
+            self.assertEqual(len(trends), 6)
+            for trend in trends:
+                self.assertIn(trend, expected)
+
+    def test_ensemble(self):
+        # Network topology
+        g = nx.erdos_renyi_graph(1000, 0.005, seed=2)
+
+        # Model selection
+        model1 = epd.SIRModel(g)
+
+        # Model Configuration
+        config = mc.Configuration()
+        config.add_model_parameter("beta", 0.1)
+        config.add_model_parameter("gamma", 0.1)
+        config.add_model_parameter("fraction_infected", 0.02)
+        model1.set_initial_status(config)
+
+        # Simulation ensemble execution
+        np.random.seed(4)
+        trends = ensemble_runs(
+            model1, execution_number=60, iteration_number=40, batch_size=25
+        )
+        self.assertEqual(len(trends), 60)
+        for trend in trends:
+            counts = trend["trends"]["node_count"]
+            deltas = trend["trends"]["status_delta"]
+            self.assertEqual(counts[1][0], 20)
+            self.assertEqual(deltas[1][0], 0)
+            for st in [0, 1, 2]:
+                self.assertEqual(len(counts[st]), 40)
+                self.assertEqual(counts[st][-1], counts[st][0] + sum(deltas[st]))
+            self.assertEqual(counts[0][-1] + counts[1][-1] + counts[2][-1], 1000)
+        self.assertIsNone(model1.node_index)
+
+        # same dynamics of independent executions
+        removed = []
+        for _ in range(60):
+            model1.reset()
+            iterations = model1.iteration_bunch(40, node_status=False)
+            removed.append(
+                model1.build_trends(iterations)[0]["trends"]["node_count"][2][-1]
+            )
+        ensemble_removed = [t["trends"]["node_count"][2][-1] for t in trends]
+        self.assertAlmostEqual(
+            np.mean(ensemble_removed) / 1000, np.mean(removed) / 1000, delta=0.1
+        )
+
+        # predefined infection sets
+        infection_sets = [(1, 2, 3), (4, 5)]
+        trends = ensemble_runs(
+            model1,
+            execution_number=2,
+            iteration_number=5,
+            infection_sets=infection_sets,
+        )
+        self.assertEqual(trends[0]["trends"]["node_count"][1][0], 3)
+        self.assertEqual(trends[1]["trends"]["node_count"][1][0], 2)
+
+        with self.assertRaises(InitializationException):
+            ensemble_runs(epd.SISModel(g), execution_number=2)
+
 
 if __name__ == "__main__":
     unittest.main()
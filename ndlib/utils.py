@@ -1,8 +1,16 @@
 import numpy as np
 import multiprocessing
-from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import copy
+import itertools
+import os
+import pickle
+import shutil
+import tempfile
 import past
+from ndlib.models.GraphIndex import GraphIndex
+from ndlib.models.SharedGraph import SharedGraph
+from ndlib.models.ParameterView import NodeParameterView, EdgeParameterView
 
 __author__ = "Giulio Rossetti"
 __license__ = "BSD-2-Clause"
@@ -19,6 +27,7 @@ def multi_runs(
     iteration_number=50,
     infection_sets=None,
     nprocesses=multiprocessing.cpu_count(),
+    shared_graph=False,
 ):
     """
     Multiple executions of a given model varying the initial set of infected nodes
@@ -28,15 +37,178 @@ def multi_runs(
     :param iteration_number: number of iterations per execution
     :param infection_sets: predefined set of infected nodes sets
     :param nprocesses: number of processes. Default values cpu number.
+    :param shared_graph: if True the graph (as CSR arrays) and the numeric node/edge parameters are written once
+                         to memory-mapped files that the worker processes attach to read-only, instead of sending a
+                         copy of the model to each execution; executions only receive a seed and an initial
+                         infected set and run on the array backend. Graph node/edge attributes are not shared.
+                         Default False.
     :return: resulting trends for all the executions
     """
 
-    if nprocesses > multiprocessing.cpu_count():
-        nprocesses = multiprocessing.cpu_count()
+    __check_runs(execution_number, infection_sets)
+    seeds = np.around(np.random.rand(execution_number) * 2**32).astype(int)
+    nprocesses = min(nprocesses, multiprocessing.cpu_count())
 
-    executions = []
+    executions = [None] * execution_number
+    for i, trends in __runs(
+        model,
+        seeds,
+        iteration_number,
+        infection_sets,
+        nprocesses,
+        2 * nprocesses,
+        shared_graph,
+    ):
+        executions[i] = trends
+
+    return executions
+
+
+def multi_runs_iter(
+    model,
+    execution_number=1,
+    iteration_number=50,
+    infection_sets=None,
+    nprocesses=multiprocessing.cpu_count(),
+    max_pending=None,
+    shared_graph=False,
+):
+    """
+    Multiple executions of a given model, scheduled on a single pool of processes, whose trends are yielded
+    as soon as they are available (i.e., in completion order)
+
+    :param model: a configured diffusion model
+    :param execution_number: number of instantiations
+    :param iteration_number: number of iterations per execution
+    :param infection_sets: predefined set of infected nodes sets
+    :param nprocesses: number of processes. Default values cpu number.
+    :param max_pending: maximum number of executions submitted and not yet consumed. Default twice the number
+                        of processes.
+    :param shared_graph: whether to share the graph among the processes (see multi_runs). Default False.
+    :return: an iterator over the resulting trends of the executions
+    """
+    __check_runs(execution_number, infection_sets)
     seeds = np.around(np.random.rand(execution_number) * 2**32).astype(int)
+    nprocesses = min(nprocesses, multiprocessing.cpu_count())
+    if max_pending is None:
+        max_pending = 2 * nprocesses
+
+    return (
+        trends
+        for _, trends in __runs(
+            model,
+            seeds,
+            iteration_number,
+            infection_sets,
+            nprocesses,
+            max(1, max_pending),
+            shared_graph,
+        )
+    )
 
+
+def ensemble_runs(
+    model, execution_number=1, iteration_number=50, infection_sets=None, batch_size=None
+):
+    """
+    Multiple executions of a given model advanced together, in a single process, as the rows of an
+    (executions x nodes) status matrix updated by batched array operations.
+
+    Only models providing an ensemble kernel (i.e., an ``ensemble_iteration`` method, e.g. SIRModel) are
+    supported. Executions follow the same dynamics of the array backend, but they are not the ones multi_runs
+    would produce for the same random seed.
+
+    :param model: a configured diffusion model
+    :param execution_number: number of instantiations
+    :param iteration_number: number of iterations per execution
+    :param infection_sets: predefined set of infected nodes sets
+    :param batch_size: number of executions advanced together (bounds the memory footprint). Default all.
+    :return: resulting trends for all the executions (as multi_runs)
+    """
+    if not hasattr(model, "ensemble_iteration"):
+        raise InitializationException(
+            {"message": "The model does not support ensemble executions"}
+        )
+    __check_runs(execution_number, infection_sets)
+
+    # the original model is left untouched
+    model = copy.copy(model).set_backend("array")
+    statuses = sorted(model.available_statuses.values())
+    if batch_size is None:
+        batch_size = execution_number
+
+    executions = []
+    for start in past.builtins.xrange(0, execution_number, max(1, batch_size)):
+        replicas = past.builtins.xrange(
+            start, min(start + max(1, batch_size), execution_number)
+        )
+        ensemble = np.stack(
+            [
+                __ensemble_status(
+                    model, None if infection_sets is None else infection_sets[i]
+                )
+                for i in replicas
+            ]
+        )
+        ensemble[~np.isin(ensemble, statuses)] = 0
+
+        node_count = np.zeros(
+            (len(statuses), iteration_number, len(replicas)), dtype=np.int64
+        )
+        for it in past.builtins.xrange(iteration_number):
+            if it > 0:
+                model.ensemble_iteration(ensemble)
+            for s, st in enumerate(statuses):
+                node_count[s, it] = np.count_nonzero(ensemble == st, axis=1)
+
+        status_delta = np.diff(node_count, axis=1, prepend=node_count[:, :1])
+        for r in past.builtins.xrange(len(replicas)):
+            executions.append(
+                {
+                    "trends": {
+                        "node_count": {
+                            st: node_count[s, :, r].tolist()
+                            for s, st in enumerate(statuses)
+                        },
+                        "status_delta": {
+                            st: status_delta[s, :, r].tolist()
+                            for s, st in enumerate(statuses)
+                        },
+                    }
+                }
+            )
+
+    return executions
+
+
+def __ensemble_status(model, infected_nodes):
+    """
+    Initial status array of an ensemble execution (same rules of DiffusionModel.reset)
+
+    :param model: a diffusion model on the array backend
+    :param infected_nodes: the initial set of infected nodes (None to use the model configuration)
+    :return: a NumPy status array
+    """
+    if infected_nodes is None:
+        fraction = model.params["model"].get(
+            "percentage_infected", model.params["model"].get("fraction_infected")
+        )
+        if fraction is None:
+            return model.initial_status_array.copy()
+        n = len(model.node_index)
+        infected_nodes = np.random.choice(n, int(n * float(fraction)), replace=False)
+    else:
+        infected_nodes = model.node_index.positions(infected_nodes)
+
+    status = np.zeros_like(model.initial_status_array)
+    status[infected_nodes] = model.available_statuses["Infected"]
+    return status
+
+
+def __check_runs(execution_number, infection_sets):
+    """
+    Validate the executions to run
+    """
     if infection_sets is not None:
         if len(infection_sets) != execution_number:
             raise InitializationException(
@@ -45,43 +217,68 @@ def multi_runs(
                 }
             )
 
-        for x in past.builtins.xrange(0, execution_number, nprocesses):
-
-            with closing(
-                multiprocessing.Pool(processes=nprocesses, maxtasksperchild=10)
-            ) as pool:
-                tasks = [
-                    (seeds[i], copy.deepcopy(model).reset(infection_sets[i]))
-                    for i in past.builtins.xrange(
-                        x, min(x + nprocesses, execution_number)
-                    )
-                ]
-                results = [
-                    pool.apply_async(__execute, (*t, iteration_number)) for t in tasks
-                ]
-
-            for result in results:
-                executions.append(result.get())
-    else:
-        for x in past.builtins.xrange(0, execution_number, nprocesses):
-            with closing(
-                multiprocessing.Pool(processes=nprocesses, maxtasksperchild=10)
-            ) as pool:
-
-                tasks = [
-                    (seeds[i], copy.deepcopy(model).reset())
-                    for i in past.builtins.xrange(
-                        x, min(x + nprocesses, execution_number)
-                    )
-                ]
-                results = [
-                    pool.apply_async(__execute, (*t, iteration_number)) for t in tasks
-                ]
-
-            for result in results:
-                executions.append(result.get())
 
-    return executions
+def __runs(
+    model,
+    seeds,
+    iteration_number,
+    infection_sets,
+    nprocesses,
+    max_pending,
+    shared_graph,
+):
+    """
+    Schedule the executions on a persistent pool of processes, keeping at most max_pending of them in flight
+
+    :return: an iterator over pairs (execution id, trends), in completion order
+    """
+    path = None
+    if shared_graph:
+        path = tempfile.mkdtemp(prefix="ndlib_")
+
+    try:
+        if shared_graph:
+            __share_model(model, path)
+
+        # workers are kept for the whole run (no recycling) and attach to a shared model on their first task
+        with ProcessPoolExecutor(max_workers=nprocesses) as executor:
+            executions = iter(past.builtins.xrange(len(seeds)))
+            pending = {}
+            try:
+                while True:
+                    for i in itertools.islice(executions, max_pending - len(pending)):
+                        infected_nodes = (
+                            None if infection_sets is None else infection_sets[i]
+                        )
+                        if shared_graph:
+                            future = executor.submit(
+                                __execute_shared,
+                                path,
+                                seeds[i],
+                                infected_nodes,
+                                iteration_number,
+                            )
+                        else:
+                            future = executor.submit(
+                                __execute,
+                                seeds[i],
+                                copy.deepcopy(model).reset(infected_nodes),
+                                iteration_number,
+                            )
+                        pending[future] = i
+
+                    if len(pending) == 0:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+    finally:
+        if path is not None:
+            shutil.rmtree(path, ignore_errors=True)
 
 
 def __execute(seed, model, iteration_number):
@@ -98,3 +295,84 @@ def __execute(seed, model, iteration_number):
     del iterations
     del model
     return trends
+
+
+# model attached by the worker processes of a shared graph execution, and its directory (see __attach_model)
+__shared_model = None
+__shared_path = None
+
+
+def __share_model(model, path):
+    """
+    Write the graph and the numeric node/edge parameters of a model to memory-mapped files, along with
+    a lightweight copy of the model that does not hold them.
+
+    :param model: a configured diffusion model
+    :param path: an existing directory
+    """
+    shared = copy.copy(model)
+    shared.params = dict(model.params, nodes={}, edges={})
+    shared.set_backend("array")
+    index = shared.node_index
+    SharedGraph.dump(index, path)
+
+    shared_params = {"nodes": [], "edges": []}
+    for kind in ["nodes", "edges"]:
+        for param, values in model.params[kind].items():
+            if kind == "nodes":
+                array = np.asarray([values[n] for n in index.nodes])
+            else:
+                array = index.edge_array(values)
+            if array.dtype.kind in "biufU":
+                np.save(os.path.join(path, "%s_%s.npy" % (kind, param)), array)
+                shared_params[kind].append(param)
+            else:
+                shared.params[kind][param] = values
+
+    shared.graph, shared.node_index = None, None
+    shared.node_attributes, shared.edge_attributes = None, None
+    with open(os.path.join(path, "model.pkl"), "wb") as f:
+        pickle.dump((shared, shared_params), f)
+
+
+def __attach_model(path):
+    """
+    Load, in a worker process, the lightweight model copy and attach it to the shared graph and parameters
+
+    :param path: the directory written by __share_model
+    """
+    global __shared_model, __shared_path
+    with open(os.path.join(path, "model.pkl"), "rb") as f:
+        model, shared_params = pickle.load(f)
+
+    model.graph = SharedGraph(path)
+    model.node_index = GraphIndex(model.graph)
+    views = {"nodes": NodeParameterView, "edges": EdgeParameterView}
+    for kind, params in shared_params.items():
+        for param in params:
+            array = np.load(
+                os.path.join(path, "%s_%s.npy" % (kind, param)), mmap_mode="r"
+            )
+            model.params[kind][param] = views[kind](model.node_index, array)
+
+    __shared_model, __shared_path = model, path
+
+
+def __execute_shared(path, seed, infected_nodes, iteration_number):
+    """
+    Execute a simulation of the model attached by the worker process (attached on its first execution)
+
+    :param path: the directory written by __share_model
+    :param seed: the random seed of the execution
+    :param infected_nodes: the initial set of infected nodes (None to reset to the model initial status)
+    :param iteration_number: number of iterations
+    :return: computed trends
+    """
+    if __shared_path != path:
+        __attach_model(path)
+    np.random.seed(seed)
+    model = __shared_model.reset(infected_nodes)
+    iterations = model.iteration_bunch(iteration_number, False)
+    trends = model.build_trends(iterations)[0]
+    del iterations
+    return trends